@@ -10,8 +10,10 @@ from app.db.base import Base
 from app.models import (  # noqa: F401
     AlocacaoColaborador,
     AlocacaoDiaria,
+    ControleRollup,
     Diaria,
     Empresa,
+    FatoDiariaDia,
     Inscricao,
     Perfil,
     Permissao,
@@ -19,6 +21,7 @@ from app.models import (  # noqa: F401
     PontoOnibus,
     PontoParada,
     RegistroPresenca,
+    RelatorioJob,
     Rota,
     Turno,
     Veiculo,
@@ -0,0 +1,54 @@
+"""Add denormalized counters to diarias
+
+Revision ID: 20261017_0005
+Revises: 20260716_0004
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0005"
+down_revision: Union[str, None] = "20260716_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUNAS = ("total_inscritos", "total_confirmados", "total_presencas")
+
+
+def upgrade() -> None:
+    for coluna in COLUNAS:
+        op.add_column(
+            "diarias",
+            sa.Column(coluna, sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # Carga inicial a partir dos dados existentes
+    op.execute(
+        """
+        UPDATE diarias SET
+            total_inscritos = (
+                SELECT COUNT(*) FROM inscricoes i
+                WHERE i.diaria_id = diarias.id
+                  AND i.status IN ('pendente', 'confirmada')
+            ),
+            total_confirmados = (
+                SELECT COUNT(*) FROM inscricoes i
+                WHERE i.diaria_id = diarias.id
+                  AND i.status = 'confirmada'
+            ),
+            total_presencas = (
+                SELECT COUNT(*) FROM registros_presenca r
+                JOIN inscricoes i ON i.id = r.inscricao_id
+                WHERE i.diaria_id = diarias.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    for coluna in reversed(COLUNAS):
+        op.drop_column("diarias", coluna)
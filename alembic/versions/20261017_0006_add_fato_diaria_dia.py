@@ -0,0 +1,47 @@
+"""Add fato_diaria_dia rollup and controle_rollup
+
+Revision ID: 20261017_0006
+Revises: 20261017_0005
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0006"
+down_revision: Union[str, None] = "20261017_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fato_diaria_dia",
+        sa.Column("data", sa.Date(), nullable=False),
+        sa.Column("empresa_id", sa.Integer(), nullable=False),
+        sa.Column("total_diarias", sa.Integer(), nullable=False),
+        sa.Column("total_vagas", sa.Integer(), nullable=False),
+        sa.Column("inscricoes_confirmadas", sa.Integer(), nullable=False),
+        sa.Column("inscricoes_efetivas", sa.Integer(), nullable=False),
+        sa.Column("total_presencas", sa.Integer(), nullable=False),
+        sa.Column("valor_total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("calculado_em", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["empresa_id"], ["empresas.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("data", "empresa_id"),
+    )
+    op.create_table(
+        "controle_rollup",
+        sa.Column("nome", sa.String(length=50), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=True),
+        sa.Column("cobertura", sa.Date(), nullable=True),
+        sa.Column("congelado_ate", sa.Date(), nullable=True),
+        sa.Column("atualizado_em", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("nome"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("controle_rollup")
+    op.drop_table("fato_diaria_dia")
@@ -0,0 +1,33 @@
+"""Add indexes used by the report cache and rollup watermarks
+
+Revision ID: 20261017_0007
+Revises: 20261017_0006
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0007"
+down_revision: Union[str, None] = "20261017_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDICES = (
+    ("ix_diarias_atualizado_em", "diarias", "atualizado_em"),
+    ("ix_inscricoes_atualizado_em", "inscricoes", "atualizado_em"),
+    ("ix_registros_presenca_criado_em", "registros_presenca", "criado_em"),
+    ("ix_pessoas_atualizado_em", "pessoas", "atualizado_em"),
+)
+
+
+def upgrade() -> None:
+    for nome, tabela, coluna in INDICES:
+        op.create_index(nome, tabela, [coluna], unique=False)
+
+
+def downgrade() -> None:
+    for nome, tabela, _ in reversed(INDICES):
+        op.drop_index(nome, table_name=tabela)
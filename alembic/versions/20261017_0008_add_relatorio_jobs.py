@@ -0,0 +1,57 @@
+"""Add relatorio_jobs table
+
+Revision ID: 20261017_0008
+Revises: 20261017_0007
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0008"
+down_revision: Union[str, None] = "20261017_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+status_relatorio_job_enum = sa.Enum(
+    "pendente",
+    "executando",
+    "concluido",
+    "erro",
+    "cancelado",
+    name="statusrelatoriojob",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "relatorio_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("tipo", sa.String(length=50), nullable=False),
+        sa.Column("parametros", sa.JSON(), nullable=False),
+        sa.Column("formato", sa.String(length=10), nullable=False),
+        sa.Column("status", status_relatorio_job_enum, nullable=False),
+        sa.Column("progresso", sa.Integer(), nullable=False),
+        sa.Column("cancelamento_solicitado", sa.Boolean(), nullable=False),
+        sa.Column("erro", sa.Text(), nullable=True),
+        sa.Column("arquivo", sa.String(length=500), nullable=True),
+        sa.Column("tamanho_bytes", sa.Integer(), nullable=True),
+        sa.Column("criado_em", sa.DateTime(), nullable=True),
+        sa.Column("iniciado_em", sa.DateTime(), nullable=True),
+        sa.Column("concluido_em", sa.DateTime(), nullable=True),
+        sa.Column("solicitado_por_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["solicitado_por_id"], ["pessoas.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_relatorio_jobs_status", "relatorio_jobs", ["status"], unique=False)
+    op.create_index("ix_relatorio_jobs_criado_em", "relatorio_jobs", ["criado_em"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_relatorio_jobs_criado_em", table_name="relatorio_jobs")
+    op.drop_index("ix_relatorio_jobs_status", table_name="relatorio_jobs")
+    op.drop_table("relatorio_jobs")
+    status_relatorio_job_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,27 @@
+"""Add pessoas.auth_version for the JWT fast path
+
+Revision ID: 20261017_0009
+Revises: 20261017_0008
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20261017_0009"
+down_revision: Union[str, None] = "20261017_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "pessoas",
+        sa.Column("auth_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("pessoas", "auth_version")
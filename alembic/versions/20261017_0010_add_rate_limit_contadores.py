@@ -0,0 +1,34 @@
+"""Add rate_limit_contadores for the shared rate limiter backend
+
+Revision ID: 20261017_0010
+Revises: 20261017_0009
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20261017_0010"
+down_revision: Union[str, None] = "20261017_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_contadores",
+        sa.Column("chave", sa.String(length=200), nullable=False),
+        sa.Column("janela", sa.BigInteger(), nullable=False),
+        sa.Column("atual", sa.Integer(), nullable=False),
+        sa.Column("anterior", sa.Integer(), nullable=False),
+        sa.Column("expira_em", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("chave"),
+    )
+    op.create_index("ix_rate_limit_contadores_expira_em", "rate_limit_contadores", ["expira_em"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_contadores_expira_em", table_name="rate_limit_contadores")
+    op.drop_table("rate_limit_contadores")
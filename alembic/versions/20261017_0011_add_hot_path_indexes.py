@@ -0,0 +1,41 @@
+"""Add composite/FK indexes for the hot query paths
+
+Revision ID: 20261017_0011
+Revises: 20261017_0010
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0011"
+down_revision: Union[str, None] = "20261017_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDICES = (
+    ("ix_inscricoes_diaria_id_status", "inscricoes", ["diaria_id", "status"]),
+    ("ix_inscricoes_pessoa_id_status", "inscricoes", ["pessoa_id", "status"]),
+    ("ix_registros_presenca_inscricao_id", "registros_presenca", ["inscricao_id"]),
+    ("ix_alocacoes_diarias_diaria_id", "alocacoes_diarias", ["diaria_id"]),
+    ("ix_alocacoes_colaboradores_inscricao_id", "alocacoes_colaboradores", ["inscricao_id"]),
+    ("ix_alocacoes_colaboradores_alocacao_diaria_id", "alocacoes_colaboradores", ["alocacao_diaria_id"]),
+    ("ix_pessoas_ponto_parada_id_tipo_pessoa_ativo", "pessoas", ["ponto_parada_id", "tipo_pessoa", "ativo"]),
+    ("ix_diarias_status_data", "diarias", ["status", "data"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não bloqueia escrita durante o deploy, mas não roda dentro de transação.
+    # Se um build falhar o índice fica INVALID: DROP INDEX CONCURRENTLY e rode de novo.
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
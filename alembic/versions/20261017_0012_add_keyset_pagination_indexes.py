@@ -0,0 +1,50 @@
+"""Add indexes backing the keyset (cursor) paginated listings; inscricoes.criado_em NOT NULL
+
+Revision ID: 20261017_0012
+Revises: 20261017_0011
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0012"
+down_revision: Union[str, None] = "20261017_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDICES = (
+    ("ix_pessoas_nome_id", "pessoas", ["nome", "id"]),
+    ("ix_diarias_data_id", "diarias", ["data", "id"]),
+    ("ix_inscricoes_pessoa_id_criado_em_id", "inscricoes", ["pessoa_id", "criado_em", "id"]),
+    ("ix_alocacoes_diarias_veiculo_id", "alocacoes_diarias", ["veiculo_id"]),
+)
+
+
+def upgrade() -> None:
+    # inscricoes.criado_em é chave do cursor: (NULL, id) < (cursor) é NULL e a linha sumiria da paginação
+    op.execute("UPDATE inscricoes SET criado_em = COALESCE(atualizado_em, now()) WHERE criado_em IS NULL")
+
+    # Mesmo procedimento da 20261017_0011: fora de transação, cada comando segura o lock só o necessário
+    with op.get_context().autocommit_block():
+        # CHECK NOT VALID + VALIDATE: o SET NOT NULL reaproveita a constraint e não varre a tabela
+        # sob ACCESS EXCLUSIVE (PostgreSQL 12+)
+        op.execute(
+            "ALTER TABLE inscricoes ADD CONSTRAINT ck_inscricoes_criado_em_not_null "
+            "CHECK (criado_em IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE inscricoes VALIDATE CONSTRAINT ck_inscricoes_criado_em_not_null")
+        op.alter_column("inscricoes", "criado_em", nullable=False)
+        op.drop_constraint("ck_inscricoes_criado_em_not_null", "inscricoes", type_="check")
+
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
+    op.alter_column("inscricoes", "criado_em", nullable=True)
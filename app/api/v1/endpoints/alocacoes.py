@@ -1,15 +1,19 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db
+from app.core.concurrency import limitar_concorrencia
+from app.core.deadline import prazo
+from app.core.deps import get_async_db, get_db
 from app.core.permissions import require_admin, require_authenticated
 from app.models.pessoa import Pessoa
 from app.schemas.alocacao import (
     GerarAlocacaoRequest, GerarAlocacaoResponse,
     AlocacaoDiariaResponse, MinhaAlocacaoResponse,
 )
+from app.repositories.leitura_async_repository import LeituraAsyncRepository
 from app.services.alocacao_service import AlocacaoService
 
 router = APIRouter()
@@ -18,6 +22,7 @@ router = APIRouter()
 @router.post(
     "/diarias/{diaria_id}/gerar-alocacao",
     response_model=GerarAlocacaoResponse,
+    dependencies=[prazo("alocacao"), Depends(limitar_concorrencia("alocacao"))],
 )
 def gerar_alocacao(
     diaria_id: int,
@@ -51,13 +56,13 @@ def get_alocacao(
     "/minhas-alocacoes",
     response_model=List[MinhaAlocacaoResponse],
 )
-def minhas_alocacoes(
-    db: Session = Depends(get_db),
+async def minhas_alocacoes(
+    db: AsyncSession = Depends(get_async_db),
     current_user: Pessoa = Depends(require_authenticated()),
 ):
     """
     Retorna as alocações do colaborador logado.
     Mostra veículo, motorista e horário estimado de passagem.
     """
-    service = AlocacaoService(db)
-    return service.get_minhas_alocacoes(current_user.id)
+    alocacoes = await LeituraAsyncRepository(db).get_alocacoes_pessoa(current_user.id)
+    return [AlocacaoService.montar_minha_alocacao(aloc) for aloc in alocacoes]
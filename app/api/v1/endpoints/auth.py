@@ -1,14 +1,17 @@
 from datetime import timedelta, datetime
+from typing import Optional
 import secrets
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.deps import get_db
 from app.core.rate_limit import rate_limit_auth
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.password_hasher import password_hasher
+from app.core.security import create_access_token, get_password_hash, verificar_senha
 from app.core.user_checks import assert_user_not_blocked
 from app.repositories.pessoa_repository import PessoaRepository
 from app.repositories.rota_repository import PontoParadaRepository
@@ -131,14 +134,19 @@ def upload_foto_registro(
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
     _: None = Depends(rate_limit_auth),
 ):
-    """Realiza login e retorna token de acesso."""
+    """
+    Realiza login e retorna token de acesso.
+
+    A rota é async para que a espera pelo bcrypt (no pool de hashing de
+    senhas) não ocupe uma thread do threadpool; o acesso ao banco roda no threadpool.
+    """
     repository = PessoaRepository(db)
-    user = repository.get_by_email(form_data.username)
+    user = await run_in_threadpool(repository.get_by_email, form_data.username)
 
     if not user or not user.senha_hash:
         raise HTTPException(
@@ -147,13 +155,20 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(form_data.password, user.senha_hash):
+    senha_valida, novo_hash = await verificar_senha(form_data.password, user.senha_hash)
+
+    if not senha_valida:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    return await run_in_threadpool(_emitir_token, repository, user, novo_hash)
+
+
+def _emitir_token(repository: PessoaRepository, user, novo_hash: Optional[str]) -> Token:
+    """Valida o estado do usuário, regrava o hash se o custo mudou e gera o token."""
     if not user.ativo:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -162,6 +177,10 @@ def login(
 
     assert_user_not_blocked(user)
 
+    # Custo do bcrypt mudou (BCRYPT_ROUNDS): regrava o hash com a senha já verificada
+    if novo_hash and repository.atualizar_hash_senha(user.id, user.senha_hash, novo_hash):
+        password_hasher.registrar_rehash()
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     # Inclui perfis do usuário no token
@@ -180,6 +199,7 @@ def login(
             "nome": user.nome,
             "tipo_pessoa": user.tipo_pessoa.value,
             "perfis": perfis_data,
+            "av": user.auth_version or 0,
         },
         expires_delta=access_token_expires,
     )
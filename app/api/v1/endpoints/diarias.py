@@ -1,9 +1,10 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_async_db, get_db, get_current_user, get_read_db
 from app.core.permissions import require_admin, require_authenticated
 from app.models.pessoa import Pessoa
 from app.models.enums import StatusDiaria, StatusInscricao
@@ -11,6 +12,8 @@ from app.schemas.diaria import (
     DiariaCreate, DiariaUpdate, DiariaResponse, DiariaList, DiariaComInscricoes,
     InscricaoCreate, InscricaoResponse, InscricaoComPessoa, MinhaInscricao, InscricaoManual,
 )
+from app.repositories.leitura_async_repository import LeituraAsyncRepository
+from app.repositories.paginacao import Contagem
 from app.services.diaria_service import DiariaService, InscricaoService
 
 router = APIRouter()
@@ -21,15 +24,19 @@ router = APIRouter()
 @router.get("/", response_model=DiariaList)
 def list_diarias(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    contagem: Optional[Contagem] = Query(None, description="Total: exata, estimada ou nenhuma (padrão: exata só na 1ª página)"),
     status_filter: Optional[StatusDiaria] = None,
     empresa_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
-    """Lista todas as diárias com filtros (admin)."""
+    """Lista todas as diárias com filtros (admin), paginadas por cursor (data, id)."""
     service = DiariaService(db)
-    return service.list_diarias(skip=skip, limit=limit, status=status_filter, empresa_id=empresa_id)
+    return service.list_diarias(
+        skip=skip, limit=limit, status=status_filter, empresa_id=empresa_id, cursor=cursor, contagem=contagem,
+    )
 
 
 @router.post("/", response_model=DiariaResponse, status_code=status.HTTP_201_CREATED)
@@ -44,24 +51,34 @@ def create_diaria(
 
 
 @router.get("/disponiveis", response_model=DiariaList)
-def list_disponiveis(
+async def list_disponiveis(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Lista diárias disponíveis para inscrição (público)."""
-    service = DiariaService(db)
-    return service.list_disponiveis(skip=skip, limit=limit)
+    diarias = await LeituraAsyncRepository(db).get_diarias_disponiveis(skip=skip, limit=limit)
+    return DiariaList(total=len(diarias), diarias=diarias)
 
 
 @router.get("/minhas-inscricoes", response_model=List[MinhaInscricao])
-def minhas_inscricoes(
-    db: Session = Depends(get_db),
+async def minhas_inscricoes(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor da página anterior"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Pessoa = Depends(require_authenticated()),
 ):
-    """Lista minhas inscrições em diárias."""
-    service = InscricaoService(db)
-    return service.minhas_inscricoes(current_user.id)
+    """
+    Lista minhas inscrições em diárias, paginadas por cursor (criado_em, id).
+    O corpo continua sendo a lista; o cursor da próxima página vem no header X-Next-Cursor.
+    """
+    inscricoes, proximo = await LeituraAsyncRepository(db).get_inscricoes_pessoa(
+        current_user.id, cursor=cursor, limit=limit,
+    )
+    if proximo:
+        response.headers["X-Next-Cursor"] = proximo
+    return inscricoes
 
 
 @router.post("/inscrever", response_model=InscricaoResponse, status_code=status.HTTP_201_CREATED)
@@ -1,12 +1,16 @@
 from typing import Optional, List
 from fastapi import APIRouter, BackgroundTasks, Depends, status, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db
+from app.core.deps import get_async_db, get_db, get_read_db
 from app.core.permissions import require_authenticated, require_admin, user_is_admin
 from app.models.pessoa import Pessoa
-from app.models.diaria import Inscricao, Diaria
 from app.models.enums import TipoPessoa
+from app.repositories.diaria_repository import InscricaoRepository
+from app.repositories.leitura_async_repository import LeituraAsyncRepository
+from app.repositories.paginacao import Contagem
+from app.repositories.pessoa_repository import PessoaRepository
 from app.schemas.pessoa import PessoaCreate, PessoaUpdate, PessoaResponse, PessoaList, PerfilUpdate, BloquearPessoa
 from app.services.pessoa_service import PessoaService
 from app.services.whatsapp_jid_sync import sync_whatsapp_jid_background
@@ -17,11 +21,16 @@ router = APIRouter()
 # ========== Endpoints de Perfil do Usuário Logado ==========
 
 @router.get("/me", response_model=PessoaResponse)
-def get_meu_perfil(
+async def get_meu_perfil(
+    db: AsyncSession = Depends(get_async_db),
     current_user: Pessoa = Depends(require_authenticated()),
 ):
     """Retorna os dados do usuário logado."""
-    return current_user
+    # Lê pela sessão async: o usuário do fast path só traz as claims do token
+    pessoa = await LeituraAsyncRepository(db).get_pessoa(current_user.id)
+    if not pessoa:
+        raise HTTPException(status_code=404, detail="Pessoa não encontrada")
+    return pessoa
 
 
 @router.put("/me", response_model=PessoaResponse)
@@ -89,33 +98,27 @@ def upload_foto_perfil(
 @router.get("/", response_model=PessoaList)
 def list_pessoas(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    contagem: Optional[Contagem] = Query(None, description="Total: exata, estimada ou nenhuma (padrão: exata só na 1ª página)"),
     tipo: Optional[str] = Query(None, description="Filtrar por tipo (colaborador, supervisor, admin)"),
     ativo: Optional[bool] = Query(None, description="Filtrar por status ativo"),
     bloqueado: Optional[bool] = Query(None, description="Filtrar por bloqueio"),
     search: Optional[str] = Query(None, description="Buscar por nome ou email"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
-    """Lista todas as pessoas cadastradas com filtros."""
-    query = db.query(Pessoa)
-    
-    if tipo:
-        query = query.filter(Pessoa.tipo_pessoa == tipo)
-    if ativo is not None:
-        query = query.filter(Pessoa.ativo == ativo)
-    if bloqueado is not None:
-        query = query.filter(Pessoa.bloqueado == bloqueado)
-    if search:
-        query = query.filter(
-            (Pessoa.nome.ilike(f"%{search}%")) | 
-            (Pessoa.email.ilike(f"%{search}%"))
-        )
-    
-    total = query.count()
-    pessoas = query.order_by(Pessoa.nome).offset(skip).limit(limit).all()
-    
-    return PessoaList(total=total, pessoas=pessoas)
+    """Lista todas as pessoas cadastradas com filtros, paginadas por cursor (nome, id)."""
+    pagina = PessoaRepository(db).listar(
+        tipo=tipo, ativo=ativo, bloqueado=bloqueado, search=search,
+        cursor=cursor, limit=limit, skip=skip, contagem=contagem,
+    )
+    return PessoaList(
+        total=pagina.total,
+        total_estimado=pagina.total_estimado,
+        next_cursor=pagina.next_cursor,
+        pessoas=pagina.itens,
+    )
 
 
 @router.get("/{pessoa_id}", response_model=PessoaResponse)
@@ -230,20 +233,21 @@ def desbloquear_pessoa(
 @router.get("/{pessoa_id}/diarias")
 def listar_diarias_pessoa(
     pessoa_id: int,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    contagem: Optional[Contagem] = Query(None, description="Total: exata, estimada ou nenhuma (padrão: exata só na 1ª página)"),
     db: Session = Depends(get_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
-    """Lista todas as diárias de uma pessoa."""
+    """Lista as diárias de uma pessoa, paginadas por cursor (criado_em, id)."""
     pessoa = db.query(Pessoa).filter(Pessoa.id == pessoa_id).first()
     if not pessoa:
         raise HTTPException(status_code=404, detail="Pessoa não encontrada")
     
-    inscricoes = db.query(Inscricao).filter(
-        Inscricao.pessoa_id == pessoa_id
-    ).order_by(Inscricao.criado_em.desc()).all()
+    pagina = InscricaoRepository(db).listar_por_pessoa(pessoa_id, cursor=cursor, limit=limit, contagem=contagem)
     
     result = []
-    for inscricao in inscricoes:
+    for inscricao in pagina.itens:
         diaria = inscricao.diaria
         result.append({
             "inscricao_id": inscricao.id,
@@ -259,7 +263,9 @@ def listar_diarias_pessoa(
     return {
         "pessoa_id": pessoa_id,
         "nome": pessoa.nome,
-        "total_diarias": len(result),
+        "total_diarias": pagina.total,
+        "total_estimado": pagina.total_estimado,
+        "next_cursor": pagina.next_cursor,
         "diarias": result,
     }
 
@@ -1,6 +1,7 @@
 """Endpoints para Registro de Presença."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, datetime, timezone
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
@@ -9,7 +10,10 @@ from app.core.permissions import require_authenticated, require_admin, user_is_a
 from app.models.pessoa import Pessoa
 from app.models.diaria import Diaria, Inscricao
 from app.models.presenca import RegistroPresenca
+from app.repositories.diaria_repository import DiariaRepository
+from app.repositories.presenca_repository import PresencaRepository
 from app.schemas.presenca import (
+    InscritoPresenca,
     RegistroPresencaCreate,
     RegistroPresencaResponse,
     PresencaDiariaResponse,
@@ -142,6 +146,13 @@ def registrar_presenca(
 @router.get("/diaria/{diaria_id}", response_model=PresencaDiariaResponse)
 def listar_presencas_diaria(
     diaria_id: int,
+    since: Optional[datetime] = Query(
+        None,
+        description=(
+            "Modo incremental: presenças registradas após este instante (use o sincronizado_em da resposta "
+            "anterior). A janela é relida com margem; mescle os inscritos por inscricao_id"
+        ),
+    ),
     db: Session = Depends(get_db),
     current_user: Pessoa = Depends(require_authenticated()),
 ):
@@ -164,29 +175,24 @@ def listar_presencas_diaria(
             detail="Sem permissão para ver presenças desta diária"
         )
     
-    # Busca inscrições confirmadas
-    inscricoes = db.query(Inscricao).filter(
-        Inscricao.diaria_id == diaria_id,
-        Inscricao.status.in_(['confirmada', 'pendente'])
-    ).all()
+    # Horários são gravados em UTC sem timezone
+    if since and since.tzinfo:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
     
-    # Monta lista de inscritos com status de presença
-    from app.schemas.presenca import InscritoPresenca
+    # Inscrições ativas + pessoa + presença em uma única consulta
+    sincronizado_em = datetime.utcnow()
+    linhas = PresencaRepository(db).get_lista_diaria(diaria_id, since=since)
     
     inscritos = []
     presencas = []
     
-    for inscricao in inscricoes:
-        registro = db.query(RegistroPresenca).filter(
-            RegistroPresenca.inscricao_id == inscricao.id
-        ).first()
-        
+    for inscricao, pessoa, registro in linhas:
         # Adiciona à lista de inscritos
         inscritos.append(InscritoPresenca(
             inscricao_id=inscricao.id,
             pessoa_id=inscricao.pessoa_id,
-            pessoa_nome=inscricao.pessoa.nome if inscricao.pessoa else "N/A",
-            pessoa_telefone=inscricao.pessoa.telefone if inscricao.pessoa else None,
+            pessoa_nome=pessoa.nome,
+            pessoa_telefone=pessoa.telefone,
             status_inscricao=inscricao.status.value,
             presenca_registrada=registro is not None,
             horario_registro=registro.horario_registro if registro else None,
@@ -205,50 +211,59 @@ def listar_presencas_diaria(
                 registrado_por_id=registro.registrado_por_id,
                 horario_registro=registro.horario_registro,
                 criado_em=registro.criado_em,
-                pessoa_nome=inscricao.pessoa.nome,
+                pessoa_nome=pessoa.nome,
                 pessoa_id=inscricao.pessoa_id,
             ))
     
+    # Mesma definição nos dois modos: inscrições ativas e as que têm presença
+    if since:
+        total_inscritos, total_presentes = PresencaRepository(db).contar_lista_diaria(diaria_id)
+    else:
+        total_inscritos, total_presentes = len(inscritos), len(presencas)
+
     return PresencaDiariaResponse(
         diaria_id=diaria.id,
         diaria_titulo=diaria.titulo,
         diaria_local=diaria.local,
         diaria_data=diaria.data.isoformat() if diaria.data else None,
-        total_inscritos=len(inscricoes),
-        total_presentes=len(presencas),
+        total_inscritos=total_inscritos,
+        total_presentes=total_presentes,
         inscritos=inscritos,
         presencas=presencas,
+        sincronizado_em=sincronizado_em,
     )
 
 
 @router.get("/minhas-diarias", response_model=List[dict])
 def minhas_diarias_supervisor(
+    data_inicio: Optional[date] = Query(None, description="Data inicial"),
+    data_fim: Optional[date] = Query(None, description="Data final"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: Pessoa = Depends(require_authenticated()),
 ):
-    """Lista diárias onde o usuário é supervisor."""
-    
-    diarias = db.query(Diaria).filter(
-        Diaria.supervisor_id == current_user.id
-    ).order_by(Diaria.data.desc()).all()
-    
-    result = []
-    for diaria in diarias:
-        inscricoes_confirmadas = [i for i in diaria.inscricoes if i.status.value in ['confirmada', 'pendente']]
-        presencas_registradas = db.query(RegistroPresenca).join(Inscricao).filter(
-            Inscricao.diaria_id == diaria.id
-        ).count()
-        
-        result.append({
-            "id": diaria.id,
-            "titulo": diaria.titulo,
-            "data": str(diaria.data),
-            "horario_inicio": str(diaria.horario_inicio) if diaria.horario_inicio else None,
-            "local": diaria.local,
-            "status": diaria.status.value,
-            "total_inscritos": len(inscricoes_confirmadas),
-            "total_presentes": presencas_registradas,
-            "empresa_nome": diaria.empresa.nome,
-        })
-    
-    return result
+    """Lista diárias onde o usuário é supervisor (mais recentes primeiro)."""
+    
+    linhas = DiariaRepository(db).listar_com_contagens(
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        supervisor_id=current_user.id,
+        skip=skip,
+        limit=limit,
+    )
+    
+    return [
+        {
+            "id": linha["diaria"].id,
+            "titulo": linha["diaria"].titulo,
+            "data": str(linha["diaria"].data),
+            "horario_inicio": str(linha["diaria"].horario_inicio) if linha["diaria"].horario_inicio else None,
+            "local": linha["diaria"].local,
+            "status": linha["diaria"].status.value,
+            "total_inscritos": linha["ativas"],
+            "total_presentes": linha["presencas"],
+            "empresa_nome": linha["empresa_nome"],
+        }
+        for linha in linhas
+    ]
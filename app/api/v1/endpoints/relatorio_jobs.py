@@ -0,0 +1,181 @@
+"""Endpoints para execução assíncrona de relatórios (jobs com polling)."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import relatorios, relatorios_extras
+from app.core.deps import get_db
+from app.core.permissions import require_admin
+from app.models.enums import StatusRelatorioJob
+from app.models.pessoa import Pessoa
+from app.models.relatorio_job import RelatorioJob
+from app.schemas.relatorio_job import RelatorioJobCreate, RelatorioJobResponse
+from app.services.relatorio_export_service import iter_presencas_csv, iter_presencas_ndjson
+from app.services.relatorio_job_service import (
+    CONTENT_TYPES,
+    STATUS_FINAIS,
+    FilaRelatoriosCheia,
+    preparar_parametros,
+    relatorio_job_service,
+)
+
+router = APIRouter()
+
+# Relatórios disponíveis em background (resultado JSON)
+RELATORIOS = {
+    "diarias": relatorios.relatorio_diarias,
+    "presencas": relatorios.relatorio_presencas,
+    "empresas": relatorios.relatorio_por_empresa,
+    "frequencia-colaborador": relatorios_extras.relatorio_frequencia_colaborador,
+    "ranking-desempenho": relatorios_extras.relatorio_ranking_desempenho,
+    "historico-penalidades": relatorios_extras.relatorio_historico_penalidades,
+    "demanda-oferta": relatorios_extras.relatorio_demanda_oferta,
+    "uso-fretado": relatorios_extras.relatorio_uso_fretado,
+}
+
+# Exportações em streaming (csv/ndjson), com progresso por bloco de linhas
+EXPORTACOES = {
+    "presencas": {"csv": iter_presencas_csv, "ndjson": iter_presencas_ndjson},
+}
+
+
+def _executor_relatorio(funcao, kwargs):
+    """Executa o endpoint do relatório e retorna o JSON."""
+    def executar(db, progresso, usuario):
+        progresso(10)
+        return funcao(db=db, current_user=usuario, **kwargs)
+    return executar
+
+
+def _executor_exportacao(gerador, kwargs):
+    """Gera a exportação em blocos, reportando o progresso."""
+    filtros = {k: v for k, v in kwargs.items() if k in ("data_inicio", "data_fim", "empresa_id")}
+
+    def executar(db, progresso, usuario):
+        return gerador(db, progresso=progresso, **filtros)
+    return executar
+
+
+def _get_job(db: Session, job_id: str, current_user: Pessoa) -> RelatorioJob:
+    job = db.query(RelatorioJob).filter(
+        RelatorioJob.id == job_id,
+        RelatorioJob.solicitado_por_id == current_user.id,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado")
+    return job
+
+
+@router.post("", response_model=RelatorioJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def criar_job(
+    job_in: RelatorioJobCreate,
+    db: Session = Depends(get_db),
+    current_user: Pessoa = Depends(require_admin()),
+):
+    """
+    Enfileira um relatório para execução em background.
+
+    Acompanhe por GET /relatorios/jobs/{id} e baixe em /download quando concluído.
+    """
+    funcao = RELATORIOS.get(job_in.tipo)
+    if funcao is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Relatório desconhecido. Disponíveis: {', '.join(RELATORIOS)}",
+        )
+    if "format" in job_in.parametros:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use o campo 'formato' do job")
+
+    try:
+        kwargs = preparar_parametros(funcao, job_in.parametros)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if job_in.formato == "json":
+        # O endpoint é chamado direto: sem valor explícito, `format` ficaria com o Query(...) do default
+        if "format" in kwargs:
+            kwargs["format"] = None
+        executar = _executor_relatorio(funcao, kwargs)
+    else:
+        gerador = EXPORTACOES.get(job_in.tipo, {}).get(job_in.formato)
+        if gerador is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Formato '{job_in.formato}' não disponível para o relatório '{job_in.tipo}'",
+            )
+        executar = _executor_exportacao(gerador, kwargs)
+
+    try:
+        return relatorio_job_service.submeter(
+            db, job_in.tipo, job_in.parametros, job_in.formato, current_user.id, executar
+        )
+    except FilaRelatoriosCheia as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc))
+
+
+@router.get("", response_model=List[RelatorioJobResponse])
+def listar_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: Pessoa = Depends(require_admin()),
+):
+    """Lista os jobs de relatório do usuário, mais recentes primeiro."""
+    return (
+        db.query(RelatorioJob)
+        .filter(RelatorioJob.solicitado_por_id == current_user.id)
+        .order_by(RelatorioJob.criado_em.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/{job_id}", response_model=RelatorioJobResponse)
+def obter_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: Pessoa = Depends(require_admin()),
+):
+    """Status e progresso do job (polling)."""
+    return _get_job(db, job_id, current_user)
+
+
+@router.post("/{job_id}/cancelar", response_model=RelatorioJobResponse)
+def cancelar_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: Pessoa = Depends(require_admin()),
+):
+    """Cancela um job pendente ou em execução."""
+    job = _get_job(db, job_id, current_user)
+    if job.status in STATUS_FINAIS:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job já finalizado")
+    return relatorio_job_service.cancelar(db, job)
+
+
+@router.get("/{job_id}/download")
+def baixar_resultado(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: Pessoa = Depends(require_admin()),
+):
+    """Baixa o resultado do job (compactado em gzip, via Content-Encoding)."""
+    job = _get_job(db, job_id, current_user)
+    if job.status != StatusRelatorioJob.CONCLUIDO:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Resultado ainda não disponível")
+
+    headers = {
+        "Content-Encoding": "gzip",
+        "Content-Disposition": f'attachment; filename="relatorio_{job.tipo}.{job.formato}"',
+    }
+    if job.tamanho_bytes is not None:
+        headers["Content-Length"] = str(job.tamanho_bytes)
+
+    return StreamingResponse(
+        relatorio_job_service.abrir_resultado(job),
+        media_type=CONTENT_TYPES[job.formato],
+        headers=headers,
+    )
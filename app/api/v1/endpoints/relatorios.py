@@ -4,78 +4,64 @@ from typing import Optional, List
 from decimal import Decimal
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.core.deps import get_db
+from app.core.deps import get_read_db
 from app.core.permissions import require_admin
 from app.models.pessoa import Pessoa
 from app.models.diaria import Diaria, Inscricao
 from app.models.empresa import Empresa
 from app.models.presenca import RegistroPresenca
-from app.models.enums import StatusInscricao, StatusDiaria
+from app.models.enums import StatusDiaria
+from app.repositories.relatorio_repository import RelatorioRepository
+from app.services.relatorio_export_service import MEDIA_TYPES, iter_presencas_csv, iter_presencas_ndjson
+from app.services.report_cache_service import cached_report
 
 router = APIRouter()
 
 
 @router.get("/diarias")
+@cached_report("relatorios.diarias")
 def relatorio_diarias(
     data_inicio: Optional[date] = Query(None, description="Data inicial"),
     data_fim: Optional[date] = Query(None, description="Data final"),
     empresa_id: Optional[int] = Query(None, description="Filtrar por empresa"),
     status: Optional[str] = Query(None, description="Filtrar por status"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Relatório de diárias com totais financeiros."""
     
-    query = db.query(Diaria)
-    
-    if data_inicio:
-        query = query.filter(Diaria.data >= data_inicio)
-    if data_fim:
-        query = query.filter(Diaria.data <= data_fim)
-    if empresa_id:
-        query = query.filter(Diaria.empresa_id == empresa_id)
-    if status:
-        query = query.filter(Diaria.status == status)
-    
-    diarias = query.order_by(Diaria.data.desc()).all()
+    linhas = RelatorioRepository(db).diarias_com_totais(
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        empresa_id=empresa_id,
+        status=status,
+    )
     
     # Calcula totais
-    total_diarias = len(diarias)
-    total_vagas = sum(d.vagas for d in diarias)
+    total_diarias = len(linhas)
+    total_vagas = 0
     total_inscricoes = 0
     total_presencas = 0
     total_valor = Decimal('0.00')
     
     result_diarias = []
     
-    for diaria in diarias:
-        # Conta inscrições confirmadas
-        inscricoes = db.query(Inscricao).filter(
-            Inscricao.diaria_id == diaria.id,
-            Inscricao.status == StatusInscricao.CONFIRMADA
-        ).count()
-        
-        # Conta presenças
-        presencas = db.query(RegistroPresenca).join(Inscricao).filter(
-            Inscricao.diaria_id == diaria.id
-        ).count()
+    for linha in linhas:
+        diaria = linha["diaria"]
+        inscricoes = linha["inscricoes"]
+        presencas = linha["presencas"]
         
+        total_vagas += diaria.vagas
         total_inscricoes += inscricoes
         total_presencas += presencas
         
-        # Calcula valor apenas para quem teve presença registrada
-        if diaria.valor:
-            valor_diaria = diaria.valor
-            # Verifica se é domingo (6 = Domingo) - DSR (Descanso Semanal Remunerado)
-            # Trabalhar em domingo = recebe dobro
-            if diaria.data.weekday() == 6:
-                valor_diaria = valor_diaria * 2
-            total_valor += valor_diaria * presencas
-        
-        # Calcula valor considerando DSR
+        # Calcula valor apenas para quem teve presença registrada, considerando DSR
+        # Verifica se é domingo (6 = Domingo) - DSR (Descanso Semanal Remunerado)
+        # Trabalhar em domingo = recebe dobro
         valor_unitario = diaria.valor if diaria.valor else None
         valor_total_diaria = 0
         eh_dsr = diaria.data.weekday() == 6
@@ -84,6 +70,7 @@ def relatorio_diarias(
             valor_para_calculo = diaria.valor
             if eh_dsr:  # Domingo = DSR (dobro)
                 valor_para_calculo = valor_para_calculo * 2
+            total_valor += valor_para_calculo * presencas
             valor_total_diaria = float(valor_para_calculo * presencas)
         
         result_diarias.append({
@@ -91,7 +78,7 @@ def relatorio_diarias(
             "titulo": diaria.titulo,
             "data": str(diaria.data),
             "horario_inicio": str(diaria.horario_inicio) if diaria.horario_inicio else None,
-            "empresa": diaria.empresa.nome,
+            "empresa": linha["empresa_nome"],
             "status": diaria.status.value,
             "vagas": diaria.vagas,
             "inscricoes": inscricoes,
@@ -99,7 +86,7 @@ def relatorio_diarias(
             "valor_unitario": float(valor_unitario) if valor_unitario else None,
             "valor_total": valor_total_diaria,
             "eh_dsr": eh_dsr,
-            "supervisor": diaria.supervisor.nome if diaria.supervisor else None,
+            "supervisor": linha["supervisor_nome"],
         })
     
     return {
@@ -116,24 +103,42 @@ def relatorio_diarias(
 
 
 @router.get("/presencas")
+@cached_report("relatorios.presencas", ignorar_se=lambda params: bool(params.get("format")))
 def relatorio_presencas(
     data_inicio: Optional[date] = Query(None),
     data_fim: Optional[date] = Query(None),
     empresa_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    format: Optional[str] = Query(
+        None,
+        pattern="^(csv|ndjson)$",
+        description="Exporta em streaming (csv ou ndjson) em vez do JSON agrupado",
+    ),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Relatório de presenças por colaborador."""
     
+    if format:
+        filtros = {"data_inicio": data_inicio, "data_fim": data_fim, "empresa_id": empresa_id}
+        gerador = iter_presencas_csv if format == "csv" else iter_presencas_ndjson
+        return StreamingResponse(
+            gerador(db, **filtros),
+            media_type=MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="relatorio_presencas.{format}"'},
+        )
+    
     query = db.query(
         RegistroPresenca,
         Inscricao,
         Diaria,
-        Pessoa
+        Pessoa,
+        Empresa.nome,
     ).join(
         Inscricao, RegistroPresenca.inscricao_id == Inscricao.id
     ).join(
         Diaria, Inscricao.diaria_id == Diaria.id
+    ).join(
+        Empresa, Diaria.empresa_id == Empresa.id
     ).join(
         Pessoa, Inscricao.pessoa_id == Pessoa.id
     )
@@ -149,7 +154,7 @@ def relatorio_presencas(
     
     # Agrupar por pessoa
     pessoas_presencas = {}
-    for registro, inscricao, diaria, pessoa in records:
+    for registro, inscricao, diaria, pessoa, empresa_nome in records:
         if pessoa.id not in pessoas_presencas:
             pessoas_presencas[pessoa.id] = {
                 "pessoa_id": pessoa.id,
@@ -176,7 +181,7 @@ def relatorio_presencas(
             "diaria_id": diaria.id,
             "titulo": diaria.titulo,
             "data": str(diaria.data),
-            "empresa": diaria.empresa.nome,
+            "empresa": empresa_nome,
             "valor": float(valor_pagamento) if valor_pagamento else None,
             "eh_dsr": eh_dsr,
             "horario_registro": registro.horario_registro.isoformat(),
@@ -195,64 +200,17 @@ def relatorio_presencas(
 
 
 @router.get("/empresas")
+@cached_report("relatorios.empresas")
 def relatorio_por_empresa(
     data_inicio: Optional[date] = Query(None),
     data_fim: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Relatório consolidado por empresa."""
     
-    query = db.query(Diaria)
-    
-    if data_inicio:
-        query = query.filter(Diaria.data >= data_inicio)
-    if data_fim:
-        query = query.filter(Diaria.data <= data_fim)
-    
-    diarias = query.all()
-    
-    empresas_stats = {}
-    
-    for diaria in diarias:
-        emp_id = diaria.empresa_id
-        if emp_id not in empresas_stats:
-            empresas_stats[emp_id] = {
-                "empresa_id": emp_id,
-                "nome": diaria.empresa.nome,
-                "total_diarias": 0,
-                "total_vagas": 0,
-                "total_inscricoes": 0,
-                "total_presencas": 0,
-                "valor_total": Decimal('0.00'),
-            }
-        
-        empresas_stats[emp_id]["total_diarias"] += 1
-        empresas_stats[emp_id]["total_vagas"] += diaria.vagas
-        
-        inscricoes = db.query(Inscricao).filter(
-            Inscricao.diaria_id == diaria.id,
-            Inscricao.status == StatusInscricao.CONFIRMADA
-        ).count()
-        
-        presencas = db.query(RegistroPresenca).join(Inscricao).filter(
-            Inscricao.diaria_id == diaria.id
-        ).count()
-        
-        empresas_stats[emp_id]["total_inscricoes"] += inscricoes
-        empresas_stats[emp_id]["total_presencas"] += presencas
-        
-        # Valor total apenas para quem teve presença (considerando DSR)
-        if diaria.valor:
-            valor_diaria = diaria.valor
-            # Verifica se é domingo (6 = Domingo) - DSR
-            if diaria.data.weekday() == 6:
-                valor_diaria = valor_diaria * 2
-            empresas_stats[emp_id]["valor_total"] += valor_diaria * presencas
-    
-    result = list(empresas_stats.values())
+    result = RelatorioRepository(db).totais_por_empresa(data_inicio, data_fim)
     for r in result:
-        r["valor_total"] = float(r["valor_total"])
         r["taxa_presenca"] = round(r["total_presencas"] / r["total_inscricoes"] * 100, 1) if r["total_inscricoes"] > 0 else 0
     
     return {
@@ -3,98 +3,75 @@ from datetime import date
 from typing import Optional
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.core.deps import get_db
+from app.core.deps import get_read_db
 from app.core.permissions import require_admin
 from app.models.pessoa import Pessoa
 from app.models.diaria import Diaria, Inscricao
 from app.models.presenca import RegistroPresenca
-from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.enums import TipoPessoa
+from app.repositories.relatorio_repository import (
+    CLASSIFICACOES_FREQUENCIA,
+    ORDENACOES_FREQUENCIA,
+    RelatorioRepository,
+)
+from app.services.report_cache_service import cached_report
 
 router = APIRouter()
 
 
 @router.get("/frequencia-colaborador")
+@cached_report("relatorios.frequencia_colaborador")
 def relatorio_frequencia_colaborador(
     data_inicio: Optional[date] = Query(None),
     data_fim: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    classificacao: Optional[str] = Query(
+        None,
+        description=f"Filtrar por classificação ({', '.join(CLASSIFICACOES_FREQUENCIA)})",
+    ),
+    ordenar_por: str = Query("taxa", description=f"Ordenação ({', '.join(ORDENACOES_FREQUENCIA)})"),
+    ordem: str = Query("desc", pattern="^(asc|desc)$"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamanho da página (vazio = todos)"),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Relatório de frequência por colaborador - presenças, faltas e taxa de comparecimento."""
     
-    colaboradores = db.query(Pessoa).filter(
-        Pessoa.tipo_pessoa == TipoPessoa.COLABORADOR,
-        Pessoa.ativo == True
-    ).all()
-    
-    result = []
+    if classificacao and classificacao not in CLASSIFICACOES_FREQUENCIA:
+        raise HTTPException(status_code=400, detail="Classificação inválida")
+    if ordenar_por not in ORDENACOES_FREQUENCIA:
+        raise HTTPException(status_code=400, detail="Ordenação inválida")
     
-    for colab in colaboradores:
-        # Query base de inscrições
-        query = db.query(Inscricao).filter(Inscricao.pessoa_id == colab.id)
-        
-        if data_inicio or data_fim:
-            query = query.join(Diaria)
-            if data_inicio:
-                query = query.filter(Diaria.data >= data_inicio)
-            if data_fim:
-                query = query.filter(Diaria.data <= data_fim)
-        
-        # Total de inscrições confirmadas
-        total_confirmadas = query.filter(
-            Inscricao.status.in_([StatusInscricao.CONFIRMADA, StatusInscricao.CONCLUIDA])
-        ).count()
-        
-        # Total de presenças
-        presencas = db.query(RegistroPresenca).join(Inscricao).filter(
-            Inscricao.pessoa_id == colab.id
-        )
-        if data_inicio or data_fim:
-            presencas = presencas.join(Diaria)
-            if data_inicio:
-                presencas = presencas.filter(Diaria.data >= data_inicio)
-            if data_fim:
-                presencas = presencas.filter(Diaria.data <= data_fim)
-        total_presencas = presencas.count()
-        
-        # Faltas
-        total_faltas = max(0, total_confirmadas - total_presencas)
-        
-        # Taxa de comparecimento
-        taxa = round((total_presencas / total_confirmadas) * 100, 1) if total_confirmadas > 0 else 0
-        
-        if total_confirmadas > 0:  # Só mostra quem teve inscrições
-            result.append({
-                "colaborador_id": colab.id,
-                "nome": colab.nome,
-                "email": colab.email,
-                "telefone": colab.telefone,
-                "total_confirmadas": total_confirmadas,
-                "total_presencas": total_presencas,
-                "total_faltas": total_faltas,
-                "taxa_comparecimento": taxa,
-                "classificacao": "Excelente" if taxa >= 90 else ("Bom" if taxa >= 70 else ("Regular" if taxa >= 50 else "Crítico")),
-            })
-    
-    result = sorted(result, key=lambda x: x["taxa_comparecimento"], reverse=True)
+    result, total, media = RelatorioRepository(db).frequencia_por_colaborador(
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        classificacao=classificacao,
+        ordenar_por=ordenar_por,
+        decrescente=ordem == "desc",
+        skip=skip,
+        limit=limit,
+    )
     
     return {
-        "total_colaboradores": len(result),
-        "media_taxa": round(sum(r["taxa_comparecimento"] for r in result) / len(result), 1) if result else 0,
+        "total_colaboradores": total,
+        "media_taxa": round(media, 1),
+        "skip": skip,
+        "limit": limit,
         "colaboradores": result,
     }
 
 
 @router.get("/ranking-desempenho")
+@cached_report("relatorios.ranking_desempenho")
 def relatorio_ranking_desempenho(
     data_inicio: Optional[date] = Query(None),
     data_fim: Optional[date] = Query(None),
     limite: int = Query(20, description="Número de colaboradores no ranking"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Ranking de desempenho - Top colaboradores por diárias concluídas."""
@@ -146,7 +123,7 @@ def relatorio_ranking_desempenho(
 @router.get("/historico-penalidades")
 def relatorio_historico_penalidades(
     apenas_ativos: bool = Query(False, description="Mostrar apenas bloqueios ativos"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Histórico de penalidades/bloqueios aplicados a colaboradores."""
@@ -189,119 +166,80 @@ def relatorio_historico_penalidades(
 
 
 @router.get("/demanda-oferta")
+@cached_report("relatorios.demanda_oferta")
 def relatorio_demanda_oferta(
     data_inicio: Optional[date] = Query(None),
     data_fim: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Relatório de demanda vs oferta - vagas abertas vs inscrições."""
     
-    query = db.query(Diaria)
-    
-    if data_inicio:
-        query = query.filter(Diaria.data >= data_inicio)
-    if data_fim:
-        query = query.filter(Diaria.data <= data_fim)
-    
-    diarias = query.order_by(Diaria.data.desc()).all()
+    repo = RelatorioRepository(db)
+    totais = repo.demanda_oferta(data_inicio, data_fim)
     
-    total_vagas = 0
-    total_inscricoes = 0
-    vagas_nao_preenchidas = 0
-    diarias_lotadas = 0
-    
-    por_empresa = {}
     dias_nomes = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
-    por_dia_semana = {i: {"dia": dias_nomes[i], "vagas": 0, "inscricoes": 0} for i in range(7)}
+    por_dia_semana = []
+    for i in range(7):
+        # weekday() do Python começa na segunda; dow do SQL começa no domingo
+        valores = totais["por_dow"].get((i + 1) % 7, {"vagas": 0, "inscricoes": 0})
+        por_dia_semana.append({"dia": dias_nomes[i], **valores})
     
     result_diarias = []
-    
-    for diaria in diarias:
-        inscricoes = db.query(Inscricao).filter(
-            Inscricao.diaria_id == diaria.id,
-            Inscricao.status.in_([StatusInscricao.CONFIRMADA, StatusInscricao.PENDENTE])
-        ).count()
-        
-        total_vagas += diaria.vagas
-        total_inscricoes += inscricoes
-        
+    for linha in repo.diarias_com_totais(data_inicio=data_inicio, data_fim=data_fim, limit=50):
+        diaria = linha["diaria"]
+        inscricoes = linha["inscricoes_ativas"]
         vagas_restantes = diaria.vagas - inscricoes
-        if vagas_restantes > 0:
-            vagas_nao_preenchidas += vagas_restantes
-        if vagas_restantes <= 0:
-            diarias_lotadas += 1
-        
-        emp_nome = diaria.empresa.nome
-        if emp_nome not in por_empresa:
-            por_empresa[emp_nome] = {"vagas": 0, "inscricoes": 0}
-        por_empresa[emp_nome]["vagas"] += diaria.vagas
-        por_empresa[emp_nome]["inscricoes"] += inscricoes
-        
-        dia_semana = diaria.data.weekday()
-        por_dia_semana[dia_semana]["vagas"] += diaria.vagas
-        por_dia_semana[dia_semana]["inscricoes"] += inscricoes
         
         result_diarias.append({
             "id": diaria.id,
             "titulo": diaria.titulo,
             "data": str(diaria.data),
-            "empresa": emp_nome,
+            "empresa": linha["empresa_nome"],
             "vagas": diaria.vagas,
             "inscricoes": inscricoes,
             "vagas_restantes": max(0, vagas_restantes),
             "status": "🔴 Lotada" if vagas_restantes <= 0 else ("🟡 Parcial" if inscricoes > 0 else "🟢 Vazia"),
         })
     
+    total_vagas = totais["total_vagas"]
+    total_inscricoes = totais["total_inscricoes"]
+    
     return {
         "resumo": {
             "total_vagas": total_vagas,
             "total_inscricoes": total_inscricoes,
             "taxa_preenchimento": round((total_inscricoes / total_vagas) * 100, 1) if total_vagas > 0 else 0,
-            "vagas_nao_preenchidas": vagas_nao_preenchidas,
-            "diarias_lotadas": diarias_lotadas,
-            "total_diarias": len(diarias),
+            "vagas_nao_preenchidas": totais["vagas_nao_preenchidas"],
+            "diarias_lotadas": totais["diarias_lotadas"],
+            "total_diarias": totais["total_diarias"],
         },
-        "por_empresa": [{"empresa": k, **v} for k, v in sorted(por_empresa.items(), key=lambda x: x[1]["vagas"], reverse=True)],
-        "por_dia_semana": list(por_dia_semana.values()),
-        "diarias": result_diarias[:50],
+        "por_empresa": sorted(totais["por_empresa"], key=lambda x: x["vagas"], reverse=True),
+        "por_dia_semana": por_dia_semana,
+        "diarias": result_diarias,
     }
 
 
 @router.get("/uso-fretado")
 def relatorio_uso_fretado(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
     """Relatório de uso do transporte fretado por rota."""
-    from app.models.rota import Rota, PontoParada
+    from app.models.rota import Rota
     
     rotas = db.query(Rota).filter(Rota.ativo == True).all()
     
+    pontos_por_rota = {}
+    for ponto in RelatorioRepository(db).colaboradores_por_ponto():
+        pontos_por_rota.setdefault(ponto.pop("rota_id"), []).append(ponto)
+    
     result = []
     total_colaboradores = 0
     
     for rota in rotas:
-        pontos = db.query(PontoParada).filter(PontoParada.rota_id == rota.id).all()
-        
-        colaboradores_rota = 0
-        pontos_info = []
-        
-        for ponto in pontos:
-            qtd = db.query(Pessoa).filter(
-                Pessoa.ponto_parada_id == ponto.id,
-                Pessoa.tipo_pessoa == TipoPessoa.COLABORADOR,
-                Pessoa.ativo == True
-            ).count()
-            
-            colaboradores_rota += qtd
-            pontos_info.append({
-                "ponto_id": ponto.id,
-                "nome": ponto.nome,
-                "endereco": ponto.endereco,
-                "colaboradores": qtd,
-            })
-        
+        pontos_info = pontos_por_rota.get(rota.id, [])
+        colaboradores_rota = sum(p["colaboradores"] for p in pontos_info)
         total_colaboradores += colaboradores_rota
         
         result.append({
@@ -310,7 +248,7 @@ def relatorio_uso_fretado(
             "descricao": rota.descricao,
             "horario_ida": str(rota.horario_ida) if rota.horario_ida else None,
             "horario_volta": str(rota.horario_volta) if rota.horario_volta else None,
-            "total_pontos": len(pontos),
+            "total_pontos": len(pontos_info),
             "total_colaboradores": colaboradores_rota,
             "pontos": sorted(pontos_info, key=lambda x: x["colaboradores"], reverse=True),
         })
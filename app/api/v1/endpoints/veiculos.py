@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
 from app.core.permissions import require_admin
 from app.models.pessoa import Pessoa
+from app.repositories.paginacao import Contagem
+from app.repositories.veiculo_repository import VeiculoRepository
 from app.schemas.veiculo import VeiculoCreate, VeiculoUpdate, VeiculoResponse, VeiculoList
 from app.services.veiculo_service import VeiculoService
 
@@ -50,23 +54,17 @@ def calcular_veiculos(
 @router.get("/{veiculo_id}/alocacoes")
 def listar_alocacoes_veiculo(
     veiculo_id: int,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    contagem: Optional[Contagem] = Query(None, description="Total: exata, estimada ou nenhuma (padrão: exata só na 1ª página)"),
     db: Session = Depends(get_db),
     current_user: Pessoa = Depends(require_admin()),
 ):
-    """Lista todas as diárias em que o veículo foi/está alocado."""
-    from app.models.alocacao import AlocacaoDiaria
-    from app.models.diaria import Diaria
-    
-    alocacoes = (
-        db.query(AlocacaoDiaria)
-        .join(Diaria, AlocacaoDiaria.diaria_id == Diaria.id)
-        .filter(AlocacaoDiaria.veiculo_id == veiculo_id)
-        .order_by(Diaria.data.desc())
-        .all()
-    )
+    """Histórico de diárias em que o veículo foi/está alocado, paginado por cursor (data, id)."""
+    pagina = VeiculoRepository(db).listar_alocacoes(veiculo_id, cursor=cursor, limit=limit, contagem=contagem)
     
     result = []
-    for aloc in alocacoes:
+    for aloc in pagina.itens:
         diaria = aloc.diaria
         result.append({
             "alocacao_id": aloc.id,
@@ -81,7 +79,9 @@ def listar_alocacoes_veiculo(
     
     return {
         "veiculo_id": veiculo_id,
-        "total_alocacoes": len(result),
+        "total_alocacoes": pagina.total,
+        "total_estimado": pagina.total_estimado,
+        "next_cursor": pagina.next_cursor,
         "alocacoes": result,
     }
 
@@ -1,8 +1,19 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1.endpoints import pessoas, auth, rotas, empresas, diarias, veiculos, alocacoes, presencas, relatorios, pontos_onibus, relatorios_extras, dashboard, pagamentos, perfis, whatsapp
+from app.api.v1.endpoints import pessoas, auth, rotas, empresas, diarias, veiculos, alocacoes, presencas, relatorios, pontos_onibus, relatorios_extras, dashboard, pagamentos, perfis, whatsapp, relatorio_jobs
+from app.core.concurrency import limitar_concorrencia
+from app.core.deadline import prazo
+from app.core.deps import usar_pool
+from app.db.session import POOL_ANALITICO
 
-api_router = APIRouter()
+# Toda rota da API tem um prazo (REQUEST_DEADLINES["padrao"]); grupos abaixo podem ampliar
+api_router = APIRouter(dependencies=[prazo("padrao")])
+
+# Rotas analíticas usam o pool "analitico" (tamanho e statement_timeout próprios);
+# as demais ficam no pool transacional padrão
+analitico = [Depends(usar_pool(POOL_ANALITICO))]
+# Relatórios também passam pelo limite de concorrência do grupo "relatorios" (CONCURRENCY_LIMITS)
+relatorios_limitados = [prazo("relatorios"), *analitico, Depends(limitar_concorrencia("relatorios"))]
 
 api_router.include_router(auth.router, prefix="/auth", tags=["Autenticação"])
 api_router.include_router(pessoas.router, prefix="/pessoas", tags=["Pessoas"])
@@ -12,9 +23,10 @@ api_router.include_router(diarias.router, prefix="/diarias", tags=["Diárias"])
 api_router.include_router(veiculos.router, prefix="/veiculos", tags=["Veículos"])
 api_router.include_router(alocacoes.router, prefix="/alocacoes", tags=["Alocações"])
 api_router.include_router(presencas.router, prefix="/presencas", tags=["Presenças"])
-api_router.include_router(relatorios.router, prefix="/relatorios", tags=["Relatórios"])
-api_router.include_router(relatorios_extras.router, prefix="/relatorios", tags=["Relatórios Extras"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+api_router.include_router(relatorio_jobs.router, prefix="/relatorios/jobs", tags=["Jobs de Relatórios"])
+api_router.include_router(relatorios.router, prefix="/relatorios", tags=["Relatórios"], dependencies=relatorios_limitados)
+api_router.include_router(relatorios_extras.router, prefix="/relatorios", tags=["Relatórios Extras"], dependencies=relatorios_limitados)
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"], dependencies=analitico)
 api_router.include_router(pontos_onibus.router, prefix="/pontos-onibus", tags=["Pontos de Ônibus"])
 api_router.include_router(pagamentos.router, prefix="/pagamentos", tags=["Pagamentos"])
 api_router.include_router(perfis.router, prefix="/perfis", tags=["Perfis e Permissões"])
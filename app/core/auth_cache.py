@@ -0,0 +1,136 @@
+"""
+Fast path de autenticação por JWT.
+
+O token carrega id, nome, tipo_pessoa, perfis e a auth_version do usuário.
+Um cache em memória (user_id -> auth_version, ativo, bloqueio) com TTL curto
+evita consultar `pessoas` a cada requisição; bloqueios e desativações passam
+a valer em no máximo AUTH_CACHE_TTL_SECONDS nos demais workers (no worker que
+fez a alteração, imediatamente).
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.enums import TipoPessoa
+from app.models.pessoa import Pessoa
+
+
+@dataclass(frozen=True)
+class EstadoAutenticacao:
+    """Estado de acesso do usuário (mesmos atributos usados por user_checks)."""
+
+    auth_version: int
+    ativo: bool
+    bloqueado: bool
+    bloqueado_ate: Optional[date]
+    motivo_bloqueio: Optional[str]
+
+
+class AuthStateCache:
+    """Cache com TTL do estado de autenticação por usuário."""
+
+    def __init__(self, ttl_segundos: Optional[int] = None, max_entradas: int = 10000):
+        self.ttl_segundos = ttl_segundos if ttl_segundos is not None else settings.AUTH_CACHE_TTL_SECONDS
+        self.max_entradas = max_entradas
+        self._entradas: Dict[int, Tuple[float, EstadoAutenticacao]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> Optional[EstadoAutenticacao]:
+        """Estado do usuário (None se não existe), consultando o banco só quando expirado."""
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(user_id)
+            if entrada and entrada[0] > agora:
+                return entrada[1]
+
+        linha = (
+            db.query(
+                Pessoa.auth_version,
+                Pessoa.ativo,
+                Pessoa.bloqueado,
+                Pessoa.bloqueado_ate,
+                Pessoa.motivo_bloqueio,
+            )
+            .filter(Pessoa.id == user_id)
+            .first()
+        )
+        if linha is None:
+            return None
+
+        estado = EstadoAutenticacao(
+            auth_version=linha.auth_version or 0,
+            ativo=bool(linha.ativo),
+            bloqueado=bool(linha.bloqueado),
+            bloqueado_ate=linha.bloqueado_ate,
+            motivo_bloqueio=linha.motivo_bloqueio,
+        )
+        with self._lock:
+            if len(self._entradas) >= self.max_entradas:
+                self._entradas.clear()
+            self._entradas[user_id] = (agora + self.ttl_segundos, estado)
+        return estado
+
+    def invalidar(self, user_id: Optional[int] = None) -> None:
+        """Descarta o estado de um usuário (ou de todos)."""
+        with self._lock:
+            if user_id is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(user_id, None)
+
+
+auth_state_cache = AuthStateCache()
+
+
+@event.listens_for(Pessoa, "after_update")
+@event.listens_for(Pessoa, "after_delete")
+def _invalidar_estado(mapper, connection, target):
+    auth_state_cache.invalidar(target.id)
+    # Invalida de novo após o commit: outra requisição pode ter lido o estado antigo nesse meio tempo
+    sessao = object_session(target)
+    if sessao is not None:
+        sessao.info.setdefault("auth_invalidar", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_apos_commit(sessao):
+    for user_id in sessao.info.pop("auth_invalidar", ()):
+        auth_state_cache.invalidar(user_id)
+
+
+class UsuarioAutenticado:
+    """
+    Usuário montado a partir das claims do token (fast path).
+
+    Expõe id, nome, tipo_pessoa e auth_version sem consultar o banco; qualquer
+    outro atributo carrega a Pessoa completa na sessão da requisição.
+    """
+
+    def __init__(self, db: Session, id: int, nome: Optional[str], tipo_pessoa: TipoPessoa, auth_version: int):
+        object.__setattr__(self, "db", db)
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "nome", nome)
+        object.__setattr__(self, "tipo_pessoa", tipo_pessoa)
+        object.__setattr__(self, "auth_version", auth_version)
+        object.__setattr__(self, "_pessoa", None)
+
+    def carregar(self) -> Pessoa:
+        """Pessoa completa (uma consulta, apenas na primeira vez)."""
+        if self._pessoa is None:
+            object.__setattr__(self, "_pessoa", self.db.get(Pessoa, self.id))
+        return self._pessoa
+
+    def __getattr__(self, nome: str):
+        return getattr(self.carregar(), nome)
+
+    def __setattr__(self, nome: str, valor) -> None:
+        setattr(self.carregar(), nome, valor)
+
+    def __repr__(self) -> str:
+        return f"<UsuarioAutenticado {self.id}>"
@@ -0,0 +1,164 @@
+"""
+Controle de admissão: limite de concorrência por grupo de rotas.
+
+Rotas caras (relatórios, geração de alocação) entram num grupo com no máximo
+CONCURRENCY_LIMITS[grupo] requisições em execução. As demais esperam numa
+fila limitada (CONCURRENCY_MAX_QUEUE[grupo]) por até
+CONCURRENCY_QUEUE_TIMEOUT_SECONDS; com a fila cheia ou o tempo esgotado a
+requisição recebe 503 com Retry-After na hora, em vez de ocupar threads e
+conexões até esgotar os pools. Grupos sem limite configurado não são
+controlados.
+"""
+import asyncio
+import statistics
+import threading
+import time
+from collections import deque
+from typing import AsyncGenerator, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class GrupoSobrecarregado(RuntimeError):
+    """Fila do grupo cheia ou espera acima do limite."""
+
+
+class LimiteConcorrencia:
+    """Semáforo com fila FIFO limitada e métricas, para um grupo de rotas."""
+
+    def __init__(self, nome: str, max_concorrentes: int, max_fila: int, timeout_fila: float):
+        self.nome = nome
+        self.max_concorrentes = max_concorrentes
+        self.max_fila = max_fila
+        self.timeout_fila = timeout_fila
+        self._lock = threading.Lock()
+        self._fila: deque = deque()  # (loop, future) aguardando vaga
+        self._em_execucao = 0
+        self._pico_fila = 0
+        self._admitidas = 0
+        self._rejeitadas = 0
+        self._timeouts = 0
+        self._espera_ms: deque = deque(maxlen=200)
+
+    async def adquirir(self) -> None:
+        """Ocupa uma vaga; levanta GrupoSobrecarregado com a fila cheia ou após timeout_fila."""
+        inicio = time.perf_counter()
+        with self._lock:
+            if self._em_execucao < self.max_concorrentes and not self._fila:
+                self._em_execucao += 1
+                self._admitidas += 1
+                self._espera_ms.append(0.0)
+                return
+            if len(self._fila) >= self.max_fila:
+                self._rejeitadas += 1
+                raise GrupoSobrecarregado(f"Fila do grupo {self.nome} cheia ({len(self._fila)} aguardando)")
+            loop = asyncio.get_running_loop()
+            entrada = (loop, loop.create_future())
+            self._fila.append(entrada)
+            self._pico_fila = max(self._pico_fila, len(self._fila))
+
+        try:
+            await asyncio.wait_for(entrada[1], self.timeout_fila)
+        except BaseException as exc:
+            with self._lock:
+                ainda_na_fila = entrada in self._fila
+                if ainda_na_fila:
+                    self._fila.remove(entrada)
+                if isinstance(exc, asyncio.TimeoutError):
+                    self._timeouts += 1
+            if not ainda_na_fila:
+                # A vaga foi repassada enquanto a espera era cancelada: devolve
+                self.liberar()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise GrupoSobrecarregado(f"Espera pelo grupo {self.nome} excedeu {self.timeout_fila}s") from None
+            raise
+
+        with self._lock:
+            self._admitidas += 1
+            self._espera_ms.append((time.perf_counter() - inicio) * 1000)
+
+    def liberar(self) -> None:
+        """Devolve a vaga, repassando-a ao primeiro da fila se houver."""
+        with self._lock:
+            while self._fila:
+                loop, futuro = self._fila.popleft()
+                if not futuro.done():
+                    # A vaga passa direto para quem espera (em_execucao não muda)
+                    loop.call_soon_threadsafe(_conceder, futuro)
+                    return
+            self._em_execucao -= 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            espera = list(self._espera_ms)
+            return {
+                "max_concorrentes": self.max_concorrentes,
+                "max_fila": self.max_fila,
+                "em_execucao": self._em_execucao,
+                "na_fila": len(self._fila),
+                "pico_fila": self._pico_fila,
+                "admitidas": self._admitidas,
+                "rejeitadas": self._rejeitadas,
+                "timeouts": self._timeouts,
+                "avg_espera_ms": round(statistics.mean(espera), 2) if espera else 0,
+                "max_espera_ms": round(max(espera), 2) if espera else 0,
+            }
+
+
+def _conceder(futuro: asyncio.Future) -> None:
+    if not futuro.done():
+        futuro.set_result(None)
+
+
+class ControleAdmissao:
+    """Limites por grupo, criados a partir de Settings na primeira requisição."""
+
+    def __init__(self):
+        self._grupos: Dict[str, LimiteConcorrencia] = {}
+        self._lock = threading.Lock()
+
+    def grupo(self, nome: str) -> Optional[LimiteConcorrencia]:
+        limite = settings.CONCURRENCY_LIMITS.get(nome)
+        if not limite:
+            return None
+        with self._lock:
+            if nome not in self._grupos:
+                self._grupos[nome] = LimiteConcorrencia(
+                    nome,
+                    max_concorrentes=limite,
+                    max_fila=settings.CONCURRENCY_MAX_QUEUE.get(nome, 0),
+                    timeout_fila=settings.CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+                )
+            return self._grupos[nome]
+
+    def estatisticas(self) -> Dict[str, dict]:
+        with self._lock:
+            grupos = dict(self._grupos)
+        return {nome: limite.estatisticas() for nome, limite in grupos.items()}
+
+
+controle_admissao = ControleAdmissao()
+
+
+def limitar_concorrencia(grupo: str) -> Callable:
+    """Dependency de rota/router: a requisição só executa com uma vaga livre no grupo."""
+    async def ocupar_vaga() -> AsyncGenerator[None, None]:
+        limite = controle_admissao.grupo(grupo)
+        if limite is None:
+            yield
+            return
+        try:
+            await limite.adquirir()
+        except GrupoSobrecarregado:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado com requisições semelhantes. Tente novamente em instantes.",
+                headers={"Retry-After": "5"},
+            )
+        try:
+            yield
+        finally:
+            limite.liberar()
+    return ocupar_vaga
@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
 from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
+from sqlalchemy.engine import make_url
 
 load_dotenv()
 
@@ -12,6 +13,12 @@ INSECURE_SECRET_KEYS = {
     "troque-esta-chave-em-producao",
 }
 
+# Driver assíncrono usado por ASYNC_DATABASE_URL para cada banco
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
 
 class Settings(BaseSettings):
     """Configuracoes da aplicacao."""
@@ -28,6 +35,28 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
 
+    # Pool de conexões (vale para a engine síncrona e para a assíncrona, cada uma com o seu)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Segundos esperando uma conexão livre antes de erro
+    DB_POOL_RECYCLE: int = 1800  # Recria conexões mais velhas que isso (-1 desativa)
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 10000  # statement_timeout do PostgreSQL na API transacional (0 desativa)
+
+    # Pool separado para o tráfego analítico (relatórios e dashboard), para não disputar
+    # conexões com login e inscrições
+    ANALYTICS_DB_POOL_SIZE: int = 3
+    ANALYTICS_DB_MAX_OVERFLOW: int = 2
+    ANALYTICS_STATEMENT_TIMEOUT_MS: int = 60000
+
+    # Engine do scheduler (rollup, reconciliação, faltas): uma conexão, sem o timeout da API
+    SCHEDULER_STATEMENT_TIMEOUT_MS: int = 0  # 0 desativa
+
+    # Réplica de leitura (opcional): relatórios, dashboards e listagens leem dela
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 30  # Acima disso as leituras voltam para a primária
+    REPLICA_LAG_CHECK_SECONDS: float = 5  # Intervalo entre medições do atraso
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -60,6 +89,52 @@ class Settings(BaseSettings):
     # Monitoramento
     METRICS_API_KEY: Optional[str] = None
 
+    # SQL por requisição: consultas lentas (com EXPLAIN opcional) e detecção de N+1 (dev/testes)
+    SLOW_QUERY_MS: float = 200
+    SLOW_QUERY_EXPLAIN: bool = False  # EXPLAIN ANALYZE executa a consulta de novo
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SQL_N_PLUS_ONE_DETECTION: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Rollups (fato_diaria_dia): dias após a data em que o dia ainda é recalculado
+    ROLLUP_DIAS_CARENCIA: int = 3
+
+    # Cache de relatórios (invalidado pelo watermark dos dados; TTL como limite)
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_TTL_SECONDS: int = 300
+
+    # Fast path do JWT: autentica pelas claims do token com estado de acesso em cache
+    AUTH_FAST_PATH_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 30
+
+    # Rate limiting: "memory" (por processo) ou "database" (compartilhado entre workers)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+
+    # Hashing de senhas (bcrypt) num pool dedicado; mudar BCRYPT_ROUNDS refaz o hash no próximo login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 100
+
+    # Limite de concorrência por grupo de rotas (grupo ausente = sem limite)
+    CONCURRENCY_LIMITS: Dict[str, int] = {"relatorios": 2, "alocacao": 1}
+    CONCURRENCY_MAX_QUEUE: Dict[str, int] = {"relatorios": 10, "alocacao": 5}  # Além disso: 503 imediato
+    CONCURRENCY_QUEUE_TIMEOUT_SECONDS: float = 15  # Espera máxima na fila antes de 503
+
+    # Prazo (segundos) por grupo de rotas; esgotado, a requisição é abortada com 504
+    REQUEST_DEADLINES: Dict[str, float] = {"padrao": 30, "relatorios": 60, "alocacao": 120}
+
+    # Cache de perfis/permissões compilados por usuário (invalidado por versão)
+    PERMISSIONS_CACHE_TTL_SECONDS: int = 300
+
+    # Jobs assíncronos de relatório
+    REPORT_JOBS_STORAGE: str = "local"  # local ou minio
+    REPORT_JOBS_LOCAL_DIR: str = ""  # vazio = diretório temporário do sistema
+    REPORT_JOBS_MAX_WORKERS: int = 2
+    REPORT_JOBS_MAX_PENDING: int = 20
+    REPORT_JOBS_RETENTION_HOURS: int = 24
+    REPORT_JOBS_STALE_MINUTES: int = 60  # Pendente/executando há mais que isso: worker morreu, vira erro
+
     # WhatsApp (serviço Baileys)
     WHATSAPP_ENABLED: bool = False
     WHATSAPP_SERVICE_URL: str = "http://127.0.0.1:3100"
@@ -93,6 +168,15 @@ class Settings(BaseSettings):
         database = quote_plus(self.POSTGRES_DB)
         return f"postgresql://{user}:{password}@{host}:{port}/{database}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """DATABASE_URL com o driver assíncrono (asyncpg / aiosqlite)."""
+        url = make_url(self.DATABASE_URL)
+        driver = ASYNC_DRIVERS.get(url.get_backend_name())
+        if driver is None:
+            return url.render_as_string(hide_password=False)
+        return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
     class Config:
         env_file = ".env"
         case_sensitive = True
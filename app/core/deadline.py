@@ -0,0 +1,86 @@
+"""
+Prazo (time budget) por requisição.
+
+Cada grupo de rotas tem um orçamento em REQUEST_DEADLINES (declarado por
+router em app/api/v1/router.py). O instante-limite fica num contextvar da
+requisição e é consultado por quem faz I/O demorado:
+
+- sessões do banco aplicam `SET LOCAL statement_timeout` com o tempo restante
+  a cada transação (PostgreSQL);
+- clientes HTTP externos (Google Maps, WhatsApp) limitam o timeout ao tempo
+  restante.
+
+Esgotado o prazo, o trabalho é interrompido com PrazoEsgotado, respondido
+como 504 pelo handler registrado em app.main.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Optional
+
+from fastapi import Depends
+
+from app.core.config import settings
+
+
+class PrazoEsgotado(RuntimeError):
+    """Orçamento de tempo da requisição esgotado."""
+
+
+class Prazo:
+    """Instante-limite de uma requisição; encerrado quando a rota termina."""
+
+    __slots__ = ("limite", "ativo")
+
+    def __init__(self, segundos: float):
+        self.limite = time.monotonic() + segundos
+        self.ativo = True
+
+    def encerrar(self) -> None:
+        # Mutável de propósito: cópias do contexto (threadpool, background tasks) também enxergam
+        self.ativo = False
+
+
+_prazo: ContextVar[Optional[Prazo]] = ContextVar("prazo_requisicao", default=None)
+
+
+def definir_prazo(segundos: Optional[float]) -> Optional[Prazo]:
+    """Define o prazo do contexto atual (None/0 remove)."""
+    atual = Prazo(segundos) if segundos else None
+    _prazo.set(atual)
+    return atual
+
+
+def tempo_restante() -> Optional[float]:
+    """Segundos até o prazo (None sem prazo; pode ser negativo)."""
+    atual = _prazo.get()
+    if atual is None or not atual.ativo:
+        return None
+    return atual.limite - time.monotonic()
+
+
+def prazo_esgotado() -> bool:
+    restante = tempo_restante()
+    return restante is not None and restante <= 0
+
+
+def limitar_timeout(timeout: float) -> float:
+    """Timeout de uma operação limitado ao tempo restante da requisição."""
+    restante = tempo_restante()
+    if restante is None:
+        return timeout
+    if restante <= 0:
+        raise PrazoEsgotado("Prazo da requisição esgotado")
+    return min(timeout, restante)
+
+
+def prazo(grupo: str) -> Any:
+    """Dependency de router/rota com o orçamento REQUEST_DEADLINES[grupo] (já envolvida em Depends)."""
+    async def aplicar_prazo() -> AsyncGenerator[None, None]:
+        atual = definir_prazo(settings.REQUEST_DEADLINES.get(grupo))
+        try:
+            yield
+        finally:
+            if atual is not None:
+                atual.encerrar()
+    # scope="function": encerra ao fim da rota, antes das background tasks
+    return Depends(aplicar_prazo, scope="function")
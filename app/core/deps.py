@@ -1,29 +1,58 @@
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from jwt.exceptions import PyJWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import UsuarioAutenticado, auth_state_cache
 from app.core.config import settings
 from app.core.user_checks import assert_user_can_access
-from app.db.session import SessionLocal
+from app.db.session import POOL_TRANSACIONAL, AsyncSessionLocal, replica_router, sessoes_por_pool
+from app.models.enums import TipoPessoa
 from app.models.pessoa import Pessoa
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_db() -> Generator:
-    """Dependency para obter sessão do banco de dados."""
-    db = SessionLocal()
+def usar_pool(nome: str) -> Callable:
+    """Dependency de router: as sessões das rotas incluídas vêm do pool `nome`."""
+    async def marcar_pool(request: Request) -> None:
+        request.state.pool_db = nome
+    return marcar_pool
+
+
+def _sessoes_da_rota(request: Request):
+    return sessoes_por_pool[getattr(request.state, "pool_db", POOL_TRANSACIONAL)]
+
+
+def get_db(request: Request) -> Generator:
+    """Dependency para obter sessão do banco de dados (pool definido pelo router)."""
+    db = _sessoes_da_rota(request)()
     try:
         yield db
     finally:
         db.close()
 
 
-async def get_current_user(
+def get_read_db(request: Request) -> Generator:
+    """Dependency de sessão somente leitura: réplica quando saudável, senão o pool da rota na primária."""
+    db = replica_router.sessao(primaria=_sessoes_da_rota(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency para obter sessão assíncrona do banco (endpoints async)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme),
 ) -> Pessoa:
@@ -38,10 +67,24 @@ async def get_current_user(
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-    except PyJWTError:
+        user_id = int(user_id)
+    except (PyJWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(Pessoa).filter(Pessoa.id == int(user_id)).first()
+    # Fast path: claims do token + estado de acesso em cache, sem ler a Pessoa
+    if settings.AUTH_FAST_PATH_ENABLED and "av" in payload:
+        estado = auth_state_cache.get(db, user_id)
+        if estado is None:
+            raise credentials_exception
+        if estado.auth_version == payload["av"]:
+            assert_user_can_access(estado)
+            try:
+                tipo_pessoa = TipoPessoa(payload.get("tipo_pessoa"))
+            except ValueError:
+                raise credentials_exception
+            return UsuarioAutenticado(db, user_id, payload.get("nome"), tipo_pessoa, estado.auth_version)
+
+    user = db.query(Pessoa).filter(Pessoa.id == user_id).first()
     if user is None:
         raise credentials_exception
 
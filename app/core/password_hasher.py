@@ -0,0 +1,123 @@
+"""
+Pool dedicado e limitado para hashing/verificação de senhas (bcrypt).
+
+Cada operação bcrypt custa centenas de ms de CPU. Em vez de rodar inline na
+thread da requisição, as operações vão para um pool com poucos workers
+(PASSWORD_HASH_WORKERS) e uma fila limitada (PASSWORD_HASH_MAX_PENDING):
+num pico de logins o bcrypt ocupa no máximo esses workers e o restante da
+API continua respondendo. Com a fila cheia a operação é recusada na hora
+(FilaSenhasCheia) em vez de acumular requisições.
+
+Threads bastam: o bcrypt libera o GIL durante o cálculo do hash.
+"""
+import asyncio
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+
+class FilaSenhasCheia(RuntimeError):
+    """Fila de hashing de senhas no limite."""
+
+
+class PasswordHasherPool:
+    """Executa funções de hashing num ThreadPoolExecutor com fila limitada e métricas."""
+
+    def __init__(self, max_workers: Optional[int] = None, max_pendentes: Optional[int] = None):
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self.max_pendentes = max_pendentes or settings.PASSWORD_HASH_MAX_PENDING
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pendentes = 0  # na fila, ainda não iniciadas
+        self._em_execucao = 0
+        self._pico_pendentes = 0
+        self._concluidas = 0
+        self._rejeitadas = 0
+        self._rehashes = 0
+        self._espera_ms: deque = deque(maxlen=200)
+        self._execucao_ms: deque = deque(maxlen=200)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="senha")
+            return self._executor
+
+    def submeter(self, funcao: Callable, *args) -> Future:
+        """Enfileira a operação; levanta FilaSenhasCheia se a fila estiver no limite."""
+        executor = self._get_executor()
+        with self._lock:
+            if self._pendentes >= self.max_pendentes:
+                self._rejeitadas += 1
+                raise FilaSenhasCheia(
+                    f"Fila de hashing de senhas cheia ({self._pendentes} operações aguardando)"
+                )
+            self._pendentes += 1
+            self._pico_pendentes = max(self._pico_pendentes, self._pendentes)
+
+        try:
+            return executor.submit(self._executar, funcao, args, time.perf_counter())
+        except Exception:
+            with self._lock:
+                self._pendentes -= 1
+            raise
+
+    def _executar(self, funcao: Callable, args: tuple, enfileirada_em: float):
+        inicio = time.perf_counter()
+        with self._lock:
+            self._pendentes -= 1
+            self._em_execucao += 1
+            self._espera_ms.append((inicio - enfileirada_em) * 1000)
+        try:
+            return funcao(*args)
+        finally:
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            with self._lock:
+                self._em_execucao -= 1
+                self._concluidas += 1
+                self._execucao_ms.append(duracao_ms)
+
+    def executar(self, funcao: Callable, *args):
+        """Executa no pool e bloqueia a thread atual até o resultado (chamadores síncronos)."""
+        return self.submeter(funcao, *args).result()
+
+    async def executar_async(self, funcao: Callable, *args):
+        """Executa no pool sem bloquear o event loop."""
+        return await asyncio.wrap_future(self.submeter(funcao, *args))
+
+    def registrar_rehash(self) -> None:
+        with self._lock:
+            self._rehashes += 1
+
+    def estatisticas(self) -> dict:
+        """Profundidade da fila, contadores e tempos recentes de espera/execução."""
+        with self._lock:
+            espera = list(self._espera_ms)
+            execucao = list(self._execucao_ms)
+            return {
+                "workers": self.max_workers,
+                "max_pendentes": self.max_pendentes,
+                "pendentes": self._pendentes,
+                "em_execucao": self._em_execucao,
+                "pico_pendentes": self._pico_pendentes,
+                "concluidas": self._concluidas,
+                "rejeitadas": self._rejeitadas,
+                "rehashes": self._rehashes,
+                "avg_espera_ms": round(statistics.mean(espera), 2) if espera else 0,
+                "max_espera_ms": round(max(espera), 2) if espera else 0,
+                "avg_execucao_ms": round(statistics.mean(execucao), 2) if execucao else 0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasherPool()
@@ -0,0 +1,129 @@
+"""
+Conjuntos compilados de perfis e permissões por usuário.
+
+Os códigos de perfis e permissões ativos de cada usuário são carregados em uma
+única consulta e guardados como frozensets, de modo que as verificações de
+permissão são lookups O(1) sem consultas extras.
+
+As entradas são chaveadas pela `pessoas.auth_version` do usuário, que o
+PerfilRepository incrementa (no banco) para todos os afetados por qualquer
+alteração de perfil, permissão ou atribuição: todos os workers passam a
+recompilar assim que enxergam a nova versão (no fast path do token, em até
+AUTH_CACHE_TTL_SECONDS, o mesmo prazo de bloqueios e desativações). A versão
+global local ao processo só antecipa a invalidação no worker que fez a alteração.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import object_session
+
+from app.core.config import settings
+from app.models.perfil import Perfil, Permissao, perfil_permissao, pessoa_perfil
+from app.models.pessoa import Pessoa
+
+
+@dataclass(frozen=True)
+class PermissoesUsuario:
+    """Perfis (códigos em minúsculas) e permissões ativas de um usuário."""
+
+    perfis: FrozenSet[str]
+    permissoes: FrozenSet[str]
+
+    def tem_perfil(self, codigo: str) -> bool:
+        return codigo.lower() in self.perfis
+
+    def tem_algum_perfil(self, codigos: FrozenSet[str]) -> bool:
+        return not self.perfis.isdisjoint(codigos)
+
+    def tem_permissao(self, codigo: str) -> bool:
+        return codigo in self.permissoes
+
+    def tem_alguma_permissao(self, codigos) -> bool:
+        return not self.permissoes.isdisjoint(codigos)
+
+
+def compilar_permissoes(user: Pessoa) -> PermissoesUsuario:
+    """Carrega perfis e permissões ativos do usuário em uma única consulta."""
+    # UsuarioAutenticado (fast path do token) traz a sessão da requisição
+    db = object_session(user) if isinstance(user, Pessoa) else user.db
+    if db is None:
+        # Objeto fora de sessão: usa os relacionamentos já carregados
+        perfis = [p for p in user.perfis if p.ativo]
+        return PermissoesUsuario(
+            perfis=frozenset(p.codigo.lower() for p in perfis),
+            permissoes=frozenset(pm.codigo for p in perfis for pm in p.permissoes if pm.ativo),
+        )
+
+    linhas = db.execute(
+        select(Perfil.codigo, Permissao.codigo)
+        .select_from(pessoa_perfil)
+        .join(Perfil, Perfil.id == pessoa_perfil.c.perfil_id)
+        .outerjoin(perfil_permissao, perfil_permissao.c.perfil_id == Perfil.id)
+        .outerjoin(
+            Permissao,
+            and_(Permissao.id == perfil_permissao.c.permissao_id, Permissao.ativo.is_(True)),
+        )
+        .where(pessoa_perfil.c.pessoa_id == user.id, Perfil.ativo.is_(True))
+    ).all()
+
+    return PermissoesUsuario(
+        perfis=frozenset(perfil.lower() for perfil, _ in linhas),
+        permissoes=frozenset(permissao for _, permissao in linhas if permissao),
+    )
+
+
+class PermissionCache:
+    """Cache LRU de PermissoesUsuario por usuário, invalidado pela auth_version do usuário."""
+
+    def __init__(self, max_entradas: int = 10000, ttl_segundos: Optional[int] = None):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos if ttl_segundos is not None else settings.PERMISSIONS_CACHE_TTL_SECONDS
+        self.versao = 0
+        # user_id -> (versão global, auth_version, expira em, permissões)
+        self._entradas: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def incrementar_versao(self) -> int:
+        """Invalida todas as entradas (perfis, permissões ou atribuições mudaram)."""
+        with self._lock:
+            self.versao += 1
+            self._entradas.clear()
+            return self.versao
+
+    def get(self, user: Pessoa) -> PermissoesUsuario:
+        """Permissões compiladas do usuário (compila e guarda se necessário)."""
+        agora = time.monotonic()
+        auth_version = user.auth_version or 0
+        with self._lock:
+            versao = self.versao
+            entrada = self._entradas.get(user.id)
+            if entrada and entrada[:2] == (versao, auth_version) and entrada[2] > agora:
+                self._entradas.move_to_end(user.id)
+                return entrada[3]
+
+        compiladas = compilar_permissoes(user)
+
+        with self._lock:
+            # Se a versão mudou durante a compilação, o resultado não é guardado
+            if self.versao == versao:
+                self._entradas[user.id] = (versao, auth_version, agora + self.ttl_segundos, compiladas)
+                self._entradas.move_to_end(user.id)
+                while len(self._entradas) > self.max_entradas:
+                    self._entradas.popitem(last=False)
+        return compiladas
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+
+permission_cache = PermissionCache()
+
+
+def get_permissoes_usuario(user: Pessoa) -> PermissoesUsuario:
+    """Atalho para o cache global de permissões."""
+    return permission_cache.get(user)
@@ -3,9 +3,19 @@ from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 
 from app.core.deps import get_current_user
+from app.core.permission_cache import get_permissoes_usuario
 from app.models.pessoa import Pessoa
 from app.models.enums import TipoPessoa
 
+# Mapeia tipos de pessoa para os códigos de perfil que os satisfazem
+PERFIS_POR_TIPO = {
+    TipoPessoa.ADMIN: ('ADMINISTRADOR',),
+    TipoPessoa.SUPERVISOR: ('SUPERVISOR', 'GESTOR_OPERACIONAL', 'ADMINISTRADOR'),
+    TipoPessoa.COLABORADOR: ('COLABORADOR', 'SUPERVISOR', 'GESTOR_OPERACIONAL', 'ADMINISTRADOR'),
+}
+
+PERFIS_GESTAO = frozenset({'administrador', 'gestor_operacional', 'supervisor'})
+
 
 def require_roles(allowed_roles: List[TipoPessoa]):
     """
@@ -17,35 +27,18 @@ def require_roles(allowed_roles: List[TipoPessoa]):
         def admin_route(user: Pessoa = Depends(require_roles([TipoPessoa.ADMIN]))):
             ...
     """
-    async def role_checker(current_user: Pessoa = Depends(get_current_user)) -> Pessoa:
-        # Mapeia tipos de pessoa para códigos de perfil
-        perfil_map = {
-            TipoPessoa.ADMIN: 'ADMINISTRADOR',
-            TipoPessoa.SUPERVISOR: ['SUPERVISOR', 'GESTOR_OPERACIONAL', 'ADMINISTRADOR'],
-            TipoPessoa.COLABORADOR: ['COLABORADOR', 'SUPERVISOR', 'GESTOR_OPERACIONAL', 'ADMINISTRADOR']
-        }
-        
-        # Verifica por perfis primeiro
-        tem_permissao = False
-        for role in allowed_roles:
-            codigos_perfil = perfil_map.get(role, [])
-            if isinstance(codigos_perfil, str):
-                codigos_perfil = [codigos_perfil]
-            
-            for codigo in codigos_perfil:
-                if user_has_perfil(current_user, codigo):
-                    tem_permissao = True
-                    break
-            if tem_permissao:
-                break
-        
-        # Fallback para tipo_pessoa se não encontrou perfil
-        if not tem_permissao:
-            user_role = current_user.tipo_pessoa.value if hasattr(current_user.tipo_pessoa, 'value') else current_user.tipo_pessoa
-            allowed_values = [r.value for r in allowed_roles]
-            
-            if user_role in allowed_values:
-                tem_permissao = True
+    # Códigos de perfil (minúsculos) e valores de tipo_pessoa aceitos, calculados uma vez
+    perfis_aceitos = frozenset(
+        codigo.lower() for role in allowed_roles for codigo in PERFIS_POR_TIPO.get(role, ())
+    )
+    tipos_aceitos = frozenset(r.value for r in allowed_roles)
+
+    def role_checker(current_user: Pessoa = Depends(get_current_user)) -> Pessoa:
+        # Verifica por perfis primeiro, com fallback para tipo_pessoa
+        tem_permissao = (
+            get_permissoes_usuario(current_user).tem_algum_perfil(perfis_aceitos)
+            or _tipo_pessoa(current_user) in tipos_aceitos
+        )
         
         if not tem_permissao:
             raise HTTPException(
@@ -67,22 +60,13 @@ def require_permission(permission_code: str):
         def criar_diaria(user: Pessoa = Depends(require_permission("diarias.create"))):
             ...
     """
-    async def permission_checker(current_user: Pessoa = Depends(get_current_user)) -> Pessoa:
+    def permission_checker(current_user: Pessoa = Depends(get_current_user)) -> Pessoa:
         # Admin sempre tem todas as permissões
-        user_role = current_user.tipo_pessoa.value if hasattr(current_user.tipo_pessoa, 'value') else current_user.tipo_pessoa
-        if user_role == TipoPessoa.ADMIN.value:
+        if _tipo_pessoa(current_user) == TipoPessoa.ADMIN.value:
             return current_user
         
         # Verifica se o usuário tem a permissão através dos perfis
-        tem_permissao = False
-        for perfil in current_user.perfis:
-            if perfil.ativo:
-                for permissao in perfil.permissoes:
-                    if permissao.ativo and permissao.codigo == permission_code:
-                        tem_permissao = True
-                        break
-            if tem_permissao:
-                break
+        tem_permissao = get_permissoes_usuario(current_user).tem_permissao(permission_code)
         
         if not tem_permissao:
             raise HTTPException(
@@ -103,22 +87,15 @@ def require_any_permission(permission_codes: List[str]):
         def relatorios(user: Pessoa = Depends(require_any_permission(["relatorios.read", "relatorios.manage"]))):
             ...
     """
-    async def permission_checker(current_user: Pessoa = Depends(get_current_user)) -> Pessoa:
+    codigos = frozenset(permission_codes)
+
+    def permission_checker(current_user: Pessoa = Depends(get_current_user)) -> Pessoa:
         # Admin sempre tem todas as permissões
-        user_role = current_user.tipo_pessoa.value if hasattr(current_user.tipo_pessoa, 'value') else current_user.tipo_pessoa
-        if user_role == TipoPessoa.ADMIN.value:
+        if _tipo_pessoa(current_user) == TipoPessoa.ADMIN.value:
             return current_user
         
         # Verifica se o usuário tem pelo menos uma das permissões
-        tem_permissao = False
-        for perfil in current_user.perfis:
-            if perfil.ativo:
-                for permissao in perfil.permissoes:
-                    if permissao.ativo and permissao.codigo in permission_codes:
-                        tem_permissao = True
-                        break
-            if tem_permissao:
-                break
+        tem_permissao = get_permissoes_usuario(current_user).tem_alguma_permissao(codigos)
         
         if not tem_permissao:
             raise HTTPException(
@@ -132,33 +109,30 @@ def require_any_permission(permission_codes: List[str]):
 
 # ========== Funções Helper para Verificação de Perfis/Permissões ==========
 
+def _tipo_pessoa(user: Pessoa) -> str:
+    return user.tipo_pessoa.value if hasattr(user.tipo_pessoa, 'value') else user.tipo_pessoa
+
+
 def user_has_perfil(user: Pessoa, codigo_perfil: str) -> bool:
     """Verifica se usuário tem um perfil específico (por código)."""
-    for perfil in user.perfis:
-        if perfil.ativo and perfil.codigo.lower() == codigo_perfil.lower():
-            return True
-    return False
+    return get_permissoes_usuario(user).tem_perfil(codigo_perfil)
 
 
 def user_has_permission(user: Pessoa, codigo_permissao: str) -> bool:
     """Verifica se usuário tem uma permissão específica através de seus perfis."""
     # Admin sempre tem todas as permissões (fallback para tipo_pessoa)
-    user_role = user.tipo_pessoa.value if hasattr(user.tipo_pessoa, 'value') else user.tipo_pessoa
-    if user_role == TipoPessoa.ADMIN.value:
+    if _tipo_pessoa(user) == TipoPessoa.ADMIN.value:
         return True
     
     # Verifica através dos perfis
-    for perfil in user.perfis:
-        if perfil.ativo:
-            for permissao in perfil.permissoes:
-                if permissao.ativo and permissao.codigo == codigo_permissao:
-                    return True
-    return False
+    return get_permissoes_usuario(user).tem_permissao(codigo_permissao)
 
 
 def user_has_any_permission(user: Pessoa, codigos_permissoes: List[str]) -> bool:
     """Verifica se usuário tem pelo menos uma das permissões."""
-    return any(user_has_permission(user, codigo) for codigo in codigos_permissoes)
+    if _tipo_pessoa(user) == TipoPessoa.ADMIN.value:
+        return True
+    return get_permissoes_usuario(user).tem_alguma_permissao(codigos_permissoes)
 
 
 def user_is_admin(user: Pessoa) -> bool:
@@ -166,12 +140,7 @@ def user_is_admin(user: Pessoa) -> bool:
     if user_has_perfil(user, "ADMINISTRADOR"):
         return True
 
-    user_role = (
-        user.tipo_pessoa.value
-        if hasattr(user.tipo_pessoa, "value")
-        else user.tipo_pessoa
-    )
-    return user_role == TipoPessoa.ADMIN.value
+    return _tipo_pessoa(user) == TipoPessoa.ADMIN.value
 
 
 def user_is_admin_or_supervisor(user: Pessoa) -> bool:
@@ -180,12 +149,11 @@ def user_is_admin_or_supervisor(user: Pessoa) -> bool:
     Prioriza verificação por perfil, com fallback para tipo_pessoa.
     """
     # Verifica por perfis
-    if user_has_perfil(user, 'ADMINISTRADOR') or user_has_perfil(user, 'GESTOR_OPERACIONAL') or user_has_perfil(user, 'SUPERVISOR'):
+    if get_permissoes_usuario(user).tem_algum_perfil(PERFIS_GESTAO):
         return True
     
     # Fallback para tipo_pessoa
-    user_role = user.tipo_pessoa.value if hasattr(user.tipo_pessoa, 'value') else user.tipo_pessoa
-    return user_role in ['admin', 'supervisor']
+    return _tipo_pessoa(user) in ['admin', 'supervisor']
 
 
 # ========== Atalhos para verificação de permissões ==========
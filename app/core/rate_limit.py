@@ -1,29 +1,175 @@
-"""Rate limiting simples em memória para rotas sensíveis."""
+"""Rate limiting para rotas sensíveis (janela deslizante aproximada).
 
-from collections import defaultdict
+Cada chave guarda só dois contadores: o da janela fixa atual e o da anterior.
+A contagem na janela deslizante é estimada como
+`anterior * (fração restante da janela anterior) + atual`, com custo O(1) e
+memória fixa por chave. Requisições negadas não são contadas.
+
+Backends:
+- "memory": contadores no processo, com LRU limitado (RATE_LIMIT_MAX_KEYS) e
+  remoção das chaves sem acesso na janela atual nem na anterior.
+- "database": contadores na tabela rate_limit_contadores, compartilhados por
+  todos os workers; um único UPSERT condicional decide e incrementa.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from time import time
+from typing import Callable, Tuple
 
 from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.rate_limit import RateLimitContador
+from app.services.metrics_service import metrics_service
+
+
+def _janelas(agora: float, window_seconds: int) -> Tuple[int, float]:
+  """Índice da janela atual e peso da janela anterior na estimativa."""
+  janela = int(agora // window_seconds)
+  return janela, 1 - (agora % window_seconds) / window_seconds
+
+
+class RateLimitBackend(ABC):
+  """Interface: decide atomicamente se a requisição cabe no limite e a contabiliza."""
+
+  # Backends que fazem I/O bloqueante rodam no threadpool
+  bloqueante = False
+
+  @abstractmethod
+  def consumir(self, chave: str, limite: int, window_seconds: int, agora: float) -> bool:
+    """True se a requisição cabe no limite (e foi contada); False se deve ser negada."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+  """Contadores no processo, com número máximo de chaves (LRU) e expiração de ociosas."""
+
+  def __init__(self, max_chaves: int = 100_000):
+    self.max_chaves = max_chaves
+    # chave -> [janela, atual, anterior], em ordem de último acesso
+    self._contadores: "OrderedDict[str, list]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def consumir(self, chave: str, limite: int, window_seconds: int, agora: float) -> bool:
+    janela, peso_anterior = _janelas(agora, window_seconds)
+    with self._lock:
+      self._remover_ociosas(janela)
+
+      contador = self._contadores.get(chave)
+      if contador is None:
+        contador = self._contadores[chave] = [janela, 0, 0]
+        if len(self._contadores) > self.max_chaves:
+          self._contadores.popitem(last=False)
+      else:
+        self._contadores.move_to_end(chave)
+        if contador[0] != janela:
+          contador[2] = contador[1] if contador[0] == janela - 1 else 0
+          contador[0], contador[1] = janela, 0
+
+      if contador[2] * peso_anterior + contador[1] >= limite:
+        return False
+      contador[1] += 1
+      return True
+
+  def _remover_ociosas(self, janela: int) -> None:
+    # A chave menos recente fica no início: remove enquanto estiver ociosa há mais de uma janela
+    while self._contadores:
+      chave, contador = next(iter(self._contadores.items()))
+      if contador[0] >= janela - 1:
+        break
+      del self._contadores[chave]
+
+  def __len__(self) -> int:
+    return len(self._contadores)
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+  """Contadores compartilhados na tabela rate_limit_contadores (PostgreSQL ou SQLite)."""
+
+  bloqueante = True
+
+  def __init__(self, session_factory: Callable[[], Session], limpar_a_cada: int = 1000):
+    self.session_factory = session_factory
+    self.limpar_a_cada = limpar_a_cada
+    self._chamadas = 0
+    self._lock = threading.Lock()
+
+  def consumir(self, chave: str, limite: int, window_seconds: int, agora: float) -> bool:
+    janela, peso_anterior = _janelas(agora, window_seconds)
+    tabela = RateLimitContador.__table__
+
+    with self.session_factory() as db:
+      dialeto = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+      insert = dialeto.insert(tabela).values(
+        chave=chave, janela=janela, atual=1, anterior=0, expira_em=agora + 2 * window_seconds,
+      )
+      # Contadores da linha existente trazidos para a janela atual
+      atual = case((tabela.c.janela == janela, tabela.c.atual), else_=0)
+      anterior = case(
+        (tabela.c.janela == janela, tabela.c.anterior),
+        (tabela.c.janela == janela - 1, tabela.c.atual),
+        else_=0,
+      )
+      upsert = insert.on_conflict_do_update(
+        index_elements=[tabela.c.chave],
+        set_={
+          "janela": janela,
+          "atual": atual + 1,
+          "anterior": anterior,
+          "expira_em": insert.excluded.expira_em,
+        },
+        where=anterior * peso_anterior + atual < limite,
+      ).returning(tabela.c.atual)
+
+      permitido = db.execute(upsert).first() is not None
+      if self._deve_limpar():
+        db.execute(delete(tabela).where(tabela.c.expira_em < agora))
+      db.commit()
+    return permitido
+
+  def _deve_limpar(self) -> bool:
+    with self._lock:
+      self._chamadas += 1
+      return self._chamadas % self.limpar_a_cada == 0
+
+
+def criar_backend() -> RateLimitBackend:
+  """Backend configurado em RATE_LIMIT_BACKEND."""
+  if settings.RATE_LIMIT_BACKEND == "database":
+    from app.db.session import SessionLocal
+
+    return DatabaseRateLimitBackend(SessionLocal)
+  return MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
 
 
 class RateLimiter:
-  def __init__(self, max_requests: int, window_seconds: int):
+  def __init__(self, max_requests: int, window_seconds: int, nome: str = "default", backend: RateLimitBackend = None):
     self.max_requests = max_requests
     self.window_seconds = window_seconds
-    self._requests: dict[str, list[float]] = defaultdict(list)
+    self.nome = nome
+    self.backend = backend or MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
 
   def check(self, key: str) -> None:
-    now = time()
-    window_start = now - self.window_seconds
-    self._requests[key] = [t for t in self._requests[key] if t > window_start]
+    permitido = self.backend.consumir(f"{self.nome}:{key}", self.max_requests, self.window_seconds, time())
+    metrics_service.record_rate_limit(self.nome, permitido)
 
-    if len(self._requests[key]) >= self.max_requests:
+    if not permitido:
       raise HTTPException(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         detail="Muitas tentativas. Aguarde alguns minutos e tente novamente.",
       )
 
-    self._requests[key].append(now)
+  async def check_async(self, key: str) -> None:
+    """check() sem bloquear o event loop quando o backend faz I/O."""
+    if self.backend.bloqueante:
+      await run_in_threadpool(self.check, key)
+    else:
+      self.check(key)
 
 
 def client_ip(request: Request) -> str:
@@ -35,8 +181,8 @@ def client_ip(request: Request) -> str:
   return "unknown"
 
 
-auth_rate_limiter = RateLimiter(max_requests=10, window_seconds=60)
+auth_rate_limiter = RateLimiter(max_requests=10, window_seconds=60, nome="auth", backend=criar_backend())
 
 
 async def rate_limit_auth(request: Request) -> None:
-  auth_rate_limiter.check(client_ip(request))
+  await auth_rate_limiter.check_async(client_ip(request))
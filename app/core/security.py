@@ -1,22 +1,33 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.password_hasher import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica se a senha está correta."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verifica se a senha está correta (no pool de hashing)."""
+    return password_hasher.executar(pwd_context.verify, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Gera hash da senha."""
-    return pwd_context.hash(password)
+    """Gera hash da senha (no pool de hashing)."""
+    return password_hasher.executar(pwd_context.hash, password)
+
+
+async def verificar_senha(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha sem bloquear o event loop.
+
+    Retorna (válida, novo_hash); novo_hash vem preenchido quando o hash
+    armazenado usa um custo diferente de BCRYPT_ROUNDS e deve ser regravado.
+    """
+    return await password_hasher.executar_async(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
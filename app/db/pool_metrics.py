@@ -0,0 +1,169 @@
+"""
+Instrumentação dos pools de conexão.
+
+As engines usam subclasses dos pools do SQLAlchemy que medem o tempo de
+espera no checkout (inclusive os que estouram pool_timeout). Listeners de
+eventos do pool registram quanto tempo cada conexão fica emprestada e o
+tempo de vida das conexões fechadas. O estado instantâneo (emprestadas,
+overflow) vem do próprio pool.
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """Contadores e tempos recentes de um pool."""
+
+    def __init__(self, nome: str, pool: Pool):
+        self.nome = nome
+        self.pool = pool
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.conexoes_abertas = 0
+        self.conexoes_fechadas = 0
+        self.pico_emprestadas = 0
+        self.pico_overflow = 0
+        self.espera_ms: deque = deque(maxlen=500)
+        self.uso_ms: deque = deque(maxlen=500)
+        self.vida_s: deque = deque(maxlen=200)
+
+    def registrar_espera(self, espera_ms: float, timeout: bool = False) -> None:
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+            self.espera_ms.append(espera_ms)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        connection_record.info["pool_criada_em"] = time.monotonic()
+        with self._lock:
+            self.conexoes_abertas += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["pool_checkout_em"] = time.monotonic()
+        emprestadas = self.pool.checkedout() if isinstance(self.pool, QueuePool) else 0
+        overflow = max(0, self.pool.overflow()) if isinstance(self.pool, QueuePool) else 0
+        with self._lock:
+            self.checkouts += 1
+            self.pico_emprestadas = max(self.pico_emprestadas, emprestadas)
+            self.pico_overflow = max(self.pico_overflow, overflow)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        inicio = connection_record.info.pop("pool_checkout_em", None)
+        if inicio is not None:
+            with self._lock:
+                self.uso_ms.append((time.monotonic() - inicio) * 1000)
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        criada_em = connection_record.info.pop("pool_criada_em", None)
+        with self._lock:
+            self.conexoes_fechadas += 1
+            if criada_em is not None:
+                self.vida_s.append(time.monotonic() - criada_em)
+
+    def _on_close_detached(self, dbapi_connection) -> None:
+        with self._lock:
+            self.conexoes_fechadas += 1
+
+    def escutar(self) -> None:
+        event.listen(self.pool, "connect", self._on_connect)
+        event.listen(self.pool, "checkout", self._on_checkout)
+        event.listen(self.pool, "checkin", self._on_checkin)
+        event.listen(self.pool, "close", self._on_close)
+        event.listen(self.pool, "close_detached", self._on_close_detached)
+
+    def estatisticas(self) -> dict:
+        estado = {}
+        if isinstance(self.pool, QueuePool):
+            estado = {
+                "tamanho": self.pool.size(),
+                "emprestadas": self.pool.checkedout(),
+                "ociosas": self.pool.checkedin(),
+                "overflow": max(0, self.pool.overflow()),
+                "max_overflow": self.pool._max_overflow,
+                # Fração da capacidade (pool_size + max_overflow) emprestada agora
+                "saturacao": round(self.pool.checkedout() / max(1, self.pool.size() + self.pool._max_overflow), 2),
+            }
+        with self._lock:
+            espera = sorted(self.espera_ms)
+            uso = list(self.uso_ms)
+            vida = list(self.vida_s)
+            return {
+                **estado,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "conexoes_abertas": self.conexoes_abertas,
+                "conexoes_fechadas": self.conexoes_fechadas,
+                "pico_emprestadas": self.pico_emprestadas,
+                "pico_overflow": self.pico_overflow,
+                "avg_espera_ms": round(statistics.mean(espera), 2) if espera else 0,
+                "p95_espera_ms": round(espera[int(len(espera) * 0.95)], 2) if espera else 0,
+                "max_espera_ms": round(espera[-1], 2) if espera else 0,
+                "avg_uso_ms": round(statistics.mean(uso), 2) if uso else 0,
+                "avg_vida_s": round(statistics.mean(vida), 1) if vida else 0,
+            }
+
+
+class _EsperaCheckoutMixin:
+    """Mede quanto o checkout esperou por uma conexão livre."""
+
+    metricas: "PoolMetrics" = None
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeoutError:
+            if self.metricas:
+                self.metricas.registrar_espera((time.perf_counter() - inicio) * 1000, timeout=True)
+            raise
+        if self.metricas:
+            self.metricas.registrar_espera((time.perf_counter() - inicio) * 1000)
+        return conexao
+
+    def recreate(self):
+        # dispose() cria um pool novo (os listeners são copiados junto): aponta as métricas para ele
+        novo = super().recreate()
+        if self.metricas:
+            self.metricas.pool = novo
+            novo.metricas = self.metricas
+        return novo
+
+
+class QueuePoolInstrumentado(_EsperaCheckoutMixin, QueuePool):
+    pass
+
+
+class AsyncAdaptedQueuePoolInstrumentado(_EsperaCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolMonitor:
+    """Registro das métricas de todos os pools, por nome."""
+
+    def __init__(self):
+        self._pools: Dict[str, PoolMetrics] = {}
+
+    def registrar(self, nome: str, pool: Pool) -> PoolMetrics:
+        metricas = PoolMetrics(nome, pool)
+        metricas.escutar()
+        if isinstance(pool, _EsperaCheckoutMixin):
+            pool.metricas = metricas
+        self._pools[nome] = metricas
+        return metricas
+
+    def get(self, nome: str) -> PoolMetrics:
+        return self._pools[nome]
+
+    def estatisticas(self) -> Dict[str, dict]:
+        return {nome: metricas.estatisticas() for nome, metricas in self._pools.items()}
+
+
+pool_monitor = PoolMonitor()
@@ -0,0 +1,114 @@
+"""
+Roteamento de leituras para a réplica (DATABASE_REPLICA_URL).
+
+Relatórios, dashboards e listagens usam `get_read_db`, que entrega uma
+sessão na réplica quando ela está acessível e com atraso de replicação até
+REPLICA_MAX_LAG_SECONDS; caso contrário, na primária. O atraso é medido no
+máximo a cada REPLICA_LAG_CHECK_SECONDS e o resultado fica em cache.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Segundos de atraso da réplica; zero quando não há WAL pendente (primária ociosa não conta como atraso)
+SQL_ATRASO_POSTGRES = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def medir_atraso(conexao: Connection) -> float:
+    """Atraso de replicação em segundos (bancos sem replicação física contam como 0)."""
+    if conexao.dialect.name != "postgresql":
+        return 0.0
+    return float(conexao.execute(SQL_ATRASO_POSTGRES).scalar() or 0)
+
+
+class ReplicaRouter:
+    """Escolhe a sessão de leitura: réplica saudável ou primária."""
+
+    def __init__(
+        self,
+        primaria: Callable[[], Session],
+        replica_engine: Optional[Engine],
+        max_atraso_segundos: Optional[float] = None,
+        intervalo_verificacao: Optional[float] = None,
+    ):
+        self.primaria = primaria
+        self.replica_engine = replica_engine
+        self.replica = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+        self.max_atraso_segundos = (
+            max_atraso_segundos if max_atraso_segundos is not None else settings.REPLICA_MAX_LAG_SECONDS
+        )
+        self.intervalo_verificacao = (
+            intervalo_verificacao if intervalo_verificacao is not None else settings.REPLICA_LAG_CHECK_SECONDS
+        )
+        self.medir_atraso = medir_atraso
+        self._lock = threading.Lock()
+        self._verificado_em: Optional[float] = None
+        self._saudavel = False
+        self.ultimo_atraso: Optional[float] = None
+        self.ultimo_erro: Optional[str] = None
+        self.leituras_replica = 0
+        self.leituras_primaria = 0
+
+    def replica_disponivel(self) -> bool:
+        """Réplica acessível e dentro do atraso máximo (verificação em cache)."""
+        if self.replica_engine is None:
+            return False
+        agora = time.monotonic()
+        with self._lock:
+            if self._verificado_em is not None and agora - self._verificado_em < self.intervalo_verificacao:
+                return self._saudavel
+            # Marca antes de medir: requisições concorrentes usam o resultado anterior
+            self._verificado_em = agora
+
+        try:
+            with self.replica_engine.connect() as conexao:
+                atraso = self.medir_atraso(conexao)
+            saudavel, erro = atraso <= self.max_atraso_segundos, None
+            if not saudavel:
+                logger.warning("Réplica com atraso de %.1fs; leituras vão para a primária", atraso)
+        except Exception as exc:
+            atraso, saudavel, erro = None, False, str(exc)
+            logger.warning("Réplica indisponível (%s); leituras vão para a primária", exc)
+
+        with self._lock:
+            self._saudavel, self.ultimo_atraso, self.ultimo_erro = saudavel, atraso, erro
+        return saudavel
+
+    def sessao(self, primaria: Optional[Callable[[], Session]] = None) -> Session:
+        """Sessão para leituras: réplica se disponível, senão primária (ou a fábrica `primaria` informada)."""
+        usar_replica = self.replica_disponivel()
+        with self._lock:
+            if usar_replica:
+                self.leituras_replica += 1
+            else:
+                self.leituras_primaria += 1
+        return self.replica() if usar_replica else (primaria or self.primaria)()
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "configurada": self.replica_engine is not None,
+                "saudavel": self._saudavel,
+                "atraso_segundos": self.ultimo_atraso,
+                "max_atraso_segundos": self.max_atraso_segundos,
+                "ultimo_erro": self.ultimo_erro,
+                "leituras_replica": self.leituras_replica,
+                "leituras_primaria": self.leituras_primaria,
+            }
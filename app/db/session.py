@@ -1,13 +1,124 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Callable, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.deadline import PrazoEsgotado, tempo_restante
+from app.db import sql_monitor  # noqa: F401  (registra os listeners de SQL por requisição)
+from app.db.pool_metrics import AsyncAdaptedQueuePoolInstrumentado, QueuePoolInstrumentado, pool_monitor
+from app.db.replica import ReplicaRouter
+
+POOL_TRANSACIONAL = "transacional"
+POOL_ANALITICO = "analitico"
+
+
+def opcoes_pool(**sobrescritas) -> dict:
+    """Parâmetros de pool vindos de Settings (DB_POOL_*), com sobrescritas por engine."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Verifica conexões antes de usar
+        **sobrescritas,
+    }
+
+
+def aplicar_statement_timeout(engine: Engine, timeout_ms: int) -> None:
+    """Define statement_timeout em cada conexão nova do pool (somente PostgreSQL)."""
+    if engine.dialect.name != "postgresql" or not timeout_ms:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _definir_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+        finally:
+            cursor.close()
+        # asyncpg (via adaptador) e drivers sem autocommit deixam a transação do SET aberta
+        dbapi_connection.commit()
+        connection_record.info["statement_timeout_ms"] = int(timeout_ms)
+
+
+@event.listens_for(Session, "after_begin")
+def _limitar_transacao_ao_prazo(session, transaction, connection):
+    """
+    Transações de requisições com prazo rodam com SET LOCAL statement_timeout = tempo
+    restante, apenas quando ele é menor que o statement_timeout já definido na conexão.
+    """
+    restante = tempo_restante()
+    if restante is None:
+        return
+    if restante <= 0:
+        raise PrazoEsgotado("Prazo da requisição esgotado antes da consulta")
+    if connection.dialect.name != "postgresql":
+        return
+    timeout_ms = max(1, int(restante * 1000))
+    limite_pool = connection.info.get("statement_timeout_ms")
+    if limite_pool and timeout_ms >= limite_pool:
+        # O timeout da conexão já é o mais apertado: evita um round trip por transação
+        return
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+engine = create_engine(settings.DATABASE_URL, poolclass=QueuePoolInstrumentado, **opcoes_pool())
+aplicar_statement_timeout(engine, settings.DB_STATEMENT_TIMEOUT_MS)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-engine = create_engine(
+# Engine do tráfego analítico (relatórios, dashboard): pool próprio e menor, com statement_timeout
+# maior. Relatórios concorrentes esgotam só este pool, sem enfileirar login e inscrições.
+analytics_engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verifica conexões antes de usar
+    poolclass=QueuePoolInstrumentado,
+    **opcoes_pool(pool_size=settings.ANALYTICS_DB_POOL_SIZE, max_overflow=settings.ANALYTICS_DB_MAX_OVERFLOW),
 )
+aplicar_statement_timeout(analytics_engine, settings.ANALYTICS_STATEMENT_TIMEOUT_MS)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AnalyticsSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=analytics_engine)
+
+# Engine das rotinas do scheduler: varrem o histórico e não cabem no statement_timeout
+# da API; uma conexão só, fora dos pools que atendem requisições.
+maintenance_engine = create_engine(
+    settings.DATABASE_URL, poolclass=QueuePoolInstrumentado, **opcoes_pool(pool_size=1, max_overflow=0),
+)
+aplicar_statement_timeout(maintenance_engine, settings.SCHEDULER_STATEMENT_TIMEOUT_MS)
+
+MaintenanceSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=maintenance_engine)
+
+# Engine assíncrona (asyncpg) para os endpoints de leitura migrados para async.
+# Convive com a engine síncrona durante a migração; cada uma tem seu pool.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL, poolclass=AsyncAdaptedQueuePoolInstrumentado, **opcoes_pool(),
+)
+aplicar_statement_timeout(async_engine.sync_engine, settings.DB_STATEMENT_TIMEOUT_MS)
+
+# expire_on_commit=False: objetos continuam legíveis após o commit sem lazy load (proibido em async)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+pool_monitor.registrar("principal", engine.pool)
+pool_monitor.registrar(POOL_ANALITICO, analytics_engine.pool)
+pool_monitor.registrar("manutencao", maintenance_engine.pool)
+pool_monitor.registrar("async", async_engine.sync_engine.pool)
+
+# Sessões síncronas por carga de trabalho (escolhida por router em app/api/v1/router.py)
+sessoes_por_pool: Dict[str, Callable[[], Session]] = {
+    POOL_TRANSACIONAL: SessionLocal,
+    POOL_ANALITICO: AnalyticsSessionLocal,
+}
+
+# Réplica de leitura opcional; sem DATABASE_REPLICA_URL todas as leituras vão para a primária
+replica_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL, poolclass=QueuePoolInstrumentado, **opcoes_pool())
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+if replica_engine is not None:
+    aplicar_statement_timeout(replica_engine, settings.ANALYTICS_STATEMENT_TIMEOUT_MS)
+    pool_monitor.registrar("replica", replica_engine.pool)
+
+replica_router = ReplicaRouter(SessionLocal, replica_engine)
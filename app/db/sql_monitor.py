@@ -0,0 +1,169 @@
+"""
+Contagem e tempo de SQL por requisição, log de consultas lentas e detecção de N+1.
+
+Listeners before/after_cursor_execute em todas as engines somam a quantidade
+de consultas e o tempo de banco no objeto da requisição atual (contextvar,
+iniciado pelo middleware de timing). Consultas acima de SLOW_QUERY_MS vão
+para um buffer circular, opcionalmente com o plano de EXPLAIN (ANALYZE,
+BUFFERS) no PostgreSQL. Com SQL_N_PLUS_ONE_DETECTION ligado (dev/testes), o
+mesmo statement repetido SQL_N_PLUS_ONE_THRESHOLD vezes numa requisição é
+registrado como suspeita de N+1.
+"""
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EstatisticasSQL:
+    """SQL executado durante uma requisição."""
+
+    rota: str = ""
+    consultas: int = 0
+    tempo_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+
+_estatisticas: ContextVar[Optional[EstatisticasSQL]] = ContextVar("estatisticas_sql", default=None)
+
+
+class RegistroCircular:
+    """Buffer circular thread-safe de dicts (consultas lentas, suspeitas de N+1)."""
+
+    def __init__(self, tamanho: int):
+        self._itens: deque = deque(maxlen=tamanho)
+        self._lock = threading.Lock()
+
+    def adicionar(self, item: dict) -> None:
+        with self._lock:
+            self._itens.append(item)
+
+    def listar(self, limit: int = 50) -> List[dict]:
+        with self._lock:
+            return list(self._itens)[-limit:][::-1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+
+consultas_lentas = RegistroCircular(settings.SLOW_QUERY_LOG_SIZE)
+suspeitas_n_mais_1 = RegistroCircular(settings.SLOW_QUERY_LOG_SIZE)
+
+
+def iniciar_requisicao(rota: str) -> Token:
+    """Começa a contabilizar o SQL da requisição atual."""
+    return _estatisticas.set(EstatisticasSQL(rota=rota))
+
+
+def finalizar_requisicao(token: Token) -> EstatisticasSQL:
+    """Encerra a contabilização, registra suspeitas de N+1 e devolve os totais."""
+    estatisticas = _estatisticas.get()
+    _estatisticas.reset(token)
+    if estatisticas is not None:
+        _detectar_n_mais_1(estatisticas)
+    return estatisticas or EstatisticasSQL()
+
+
+@contextmanager
+def monitorar_sql(rota: str = "") -> Iterator[EstatisticasSQL]:
+    """Contabiliza o SQL de um bloco (scripts e testes)."""
+    token = iniciar_requisicao(rota)
+    estatisticas = _estatisticas.get()
+    try:
+        yield estatisticas
+    finally:
+        finalizar_requisicao(token)
+
+
+def _detectar_n_mais_1(estatisticas: EstatisticasSQL) -> None:
+    for statement, repeticoes in estatisticas.statements.items():
+        if repeticoes >= settings.SQL_N_PLUS_ONE_THRESHOLD:
+            logger.warning("Possível N+1 em %s: %dx %s", estatisticas.rota, repeticoes, statement[:200])
+            suspeitas_n_mais_1.adicionar({
+                "rota": estatisticas.rota,
+                "statement": statement[:2000],
+                "repeticoes": repeticoes,
+                "timestamp": datetime.utcnow().isoformat(),
+            })
+
+
+def _explicar(conn, statement: str, parameters) -> Optional[str]:
+    """
+    Plano com EXPLAIN (ANALYZE, BUFFERS) para SELECTs no PostgreSQL (executa a consulta de novo).
+
+    Roda dentro de um SAVEPOINT na transação da requisição: se o EXPLAIN falhar
+    (statement_timeout é o mais provável, a consulta já era lenta), só o
+    savepoint é desfeito e a transação segue utilizável. Direto no cursor DBAPI
+    para não disparar de novo os eventos deste monitor.
+    """
+    if conn.dialect.name != "postgresql" or not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    dbapi_connection = conn.connection.dbapi_connection
+    # Em autocommit não há transação a proteger (e SAVEPOINT nem é aceito)
+    savepoint = not getattr(dbapi_connection, "autocommit", False)
+    cursor = None
+    try:
+        cursor = dbapi_connection.cursor()
+        if savepoint:
+            cursor.execute("SAVEPOINT sql_monitor_explain")
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        plano = "\n".join(linha[0] for linha in cursor.fetchall())
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT sql_monitor_explain")
+        return plano
+    except Exception:
+        logger.exception("Falha ao capturar EXPLAIN de consulta lenta")
+        if savepoint and cursor is not None:
+            try:
+                cursor.execute("ROLLBACK TO SAVEPOINT sql_monitor_explain")
+            except Exception:
+                logger.exception("Falha ao desfazer o savepoint do EXPLAIN")
+        return None
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_executar(conn, cursor, statement, parameters, context, executemany):
+    # O contexto de execução é descartado junto com a execução, mesmo se ela falhar
+    context._sql_monitor_inicio = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_de_executar(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, "_sql_monitor_inicio", None)
+    if inicio is None:
+        return
+    duracao_ms = (time.perf_counter() - inicio) * 1000
+
+    estatisticas = _estatisticas.get()
+    if estatisticas is not None:
+        estatisticas.consultas += 1
+        estatisticas.tempo_ms += duracao_ms
+        if settings.SQL_N_PLUS_ONE_DETECTION:
+            estatisticas.statements[statement] += 1
+
+    if duracao_ms >= settings.SLOW_QUERY_MS:
+        consultas_lentas.adicionar({
+            "rota": estatisticas.rota if estatisticas else None,
+            "statement": statement[:2000],
+            "parametros": repr(parameters)[:500],
+            "duracao_ms": round(duracao_ms, 2),
+            "timestamp": datetime.utcnow().isoformat(),
+            "plano": _explicar(conn, statement, parameters) if settings.SLOW_QUERY_EXPLAIN and not executemany else None,
+        })
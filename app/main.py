@@ -1,13 +1,22 @@
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 import time
 import logging
 
 from app.api.v1.router import api_router
+from app.core.concurrency import controle_admissao
 from app.core.config import settings
+from app.core.deadline import PrazoEsgotado
 from app.core.monitoring import require_metrics_access
+from app.core.password_hasher import FilaSenhasCheia, password_hasher
+from app.db import sql_monitor
+from app.db.pool_metrics import pool_monitor
+from app.db.session import replica_router
+from app.repositories.paginacao import CursorInvalido
 from app.services.metrics_service import metrics_service
 
 # Logger para performance
@@ -25,7 +34,12 @@ class TimingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         start_time = time.perf_counter()
         
-        response = await call_next(request)
+        # SQL executado pela requisição (contextvar herdado pela task e pelo threadpool)
+        sql_token = sql_monitor.iniciar_requisicao(f"{request.method} {request.url.path}")
+        try:
+            response = await call_next(request)
+        finally:
+            sql = sql_monitor.finalizar_requisicao(sql_token)
         
         end_time = time.perf_counter()
         duration_ms = (end_time - start_time) * 1000
@@ -42,7 +56,7 @@ class TimingMiddleware(BaseHTTPMiddleware):
         path = request.url.path
         if path.startswith("/api/") and not path.startswith("/api/v1/metrics"):
             method = request.method
-            perf_logger.info(f"{status} {method} {path}: {duration_ms:.2f}ms")
+            perf_logger.info(f"{status} {method} {path}: {duration_ms:.2f}ms ({sql.consultas} SQL, {sql.tempo_ms:.2f}ms)")
             
             # Registra no serviço de métricas
             metrics_service.record(
@@ -50,6 +64,8 @@ class TimingMiddleware(BaseHTTPMiddleware):
                 method=method,
                 duration_ms=duration_ms,
                 status_code=response.status_code,
+                db_queries=sql.consultas,
+                db_ms=sql.tempo_ms,
             )
         
         return response
@@ -71,11 +87,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor de /diarias/minhas-inscricoes
 )
 
 # Middleware de timing para medir performance de todas as rotas
 app.add_middleware(TimingMiddleware)
 
+# SQLSTATE do PostgreSQL para consulta cancelada por statement_timeout
+QUERY_CANCELED = "57014"
+
+
+def _prazo_esgotado(request: Request) -> JSONResponse:
+    rota = request.scope.get("route")
+    metrics_service.record_deadline_exceeded(f"{request.method} {getattr(rota, 'path', request.url.path)}")
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "A requisição excedeu o tempo limite. Tente novamente ou reduza o período consultado."},
+    )
+
+
+@app.exception_handler(PrazoEsgotado)
+async def prazo_esgotado_handler(request: Request, exc: PrazoEsgotado):
+    return _prazo_esgotado(request)
+
+
+@app.exception_handler(FilaSenhasCheia)
+async def fila_senhas_cheia_handler(request: Request, exc: FilaSenhasCheia):
+    """Fila de hashing cheia (login, cadastro, troca de senha): 503 em qualquer rota, não 500."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Servidor ocupado processando senhas. Tente novamente em instantes."},
+        headers={"Retry-After": "2"},
+    )
+
+
+@app.exception_handler(CursorInvalido)
+async def cursor_invalido_handler(request: Request, exc: CursorInvalido):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(OperationalError)
+async def consulta_cancelada_handler(request: Request, exc: OperationalError):
+    """statement_timeout (do prazo ou do pool) vira 504; demais erros seguem como 500."""
+    codigo = getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+    if codigo != QUERY_CANCELED:
+        raise exc
+    return _prazo_esgotado(request)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -98,6 +156,8 @@ async def monitor_dashboard(_: None = Depends(require_metrics_access)):
     overview = metrics_service.get_overview()
     endpoints = metrics_service.get_endpoint_stats()
     recent = metrics_service.get_recent_requests(limit=20)
+    report_cache = metrics_service.get_report_cache_stats()
+    pools = pool_monitor.estatisticas()
     
     def get_color(ms):
         if ms < 100: return "#10b981"
@@ -116,6 +176,7 @@ async def monitor_dashboard(_: None = Depends(require_metrics_access)):
             <span class="method" style="background:{get_method_color(method)}">{method}</span>
             <span class="path">{path}</span>
             <span class="time" style="color:{get_color(ep['avg_ms'])}">{ep['avg_ms']}ms</span>
+            <span class="count">{ep['avg_queries']} SQL · {ep['avg_db_ms']}ms DB</span>
             <span class="count">({ep['count']}x)</span>
         </div>'''
     
@@ -130,6 +191,16 @@ async def monitor_dashboard(_: None = Depends(require_metrics_access)):
             <span class="time" style="color:{get_color(req['duration_ms'])}">{req['duration_ms']}ms</span>
         </div>'''
     
+    pools_html = ""
+    for nome, pool in pools.items():
+        pools_html += f'''
+        <div class="endpoint-row">
+            <span class="path">{nome}</span>
+            <span class="count">{pool.get('emprestadas', 0)}/{pool.get('tamanho', 0)} em uso · overflow {pool.get('overflow', 0)}/{pool.get('max_overflow', 0)} · saturação {round(pool.get('saturacao', 0) * 100)}% · pico {pool['pico_emprestadas']}</span>
+            <span class="time" style="color:{get_color(pool['p95_espera_ms'])}">espera p95 {pool['p95_espera_ms']}ms</span>
+            <span class="count">uso médio {pool['avg_uso_ms']}ms · vida média {pool['avg_vida_s']}s · {pool['timeouts']} timeouts</span>
+        </div>'''
+    
     html = f'''
     <!DOCTYPE html>
     <html>
@@ -182,6 +253,15 @@ async def monitor_dashboard(_: None = Depends(require_metrics_access)):
                 <div class="stat-value" style="color:{'#ef4444' if overview['slow_requests'] > 0 else '#10b981'}">{overview['slow_requests']}</div>
                 <div class="stat-label">🐌 Requests Lentos</div>
             </div>
+            <div class="stat-card">
+                <div class="stat-value">{report_cache['hit_rate']}%</div>
+                <div class="stat-label">🗄️ Cache Relatórios</div>
+            </div>
+        </div>
+        
+        <div class="card">
+            <div class="card-title">🔌 Pools de Conexão</div>
+            {pools_html if pools_html else '<p style="color:var(--muted)">Nenhum pool registrado</p>'}
         </div>
         
         <div class="card">
@@ -209,6 +289,15 @@ async def get_metrics(_: None = Depends(require_metrics_access)):
         "endpoints": metrics_service.get_endpoint_stats(),
         "recent": metrics_service.get_recent_requests(limit=30),
         "timeline": metrics_service.get_timeline(minutes=10),
+        "report_cache": metrics_service.get_report_cache_stats(),
+        "password_hashing": password_hasher.estatisticas(),
+        "rate_limit": metrics_service.get_rate_limit_stats(),
+        "concurrency": controle_admissao.estatisticas(),
+        "deadlines": metrics_service.get_deadline_stats(),
+        "db_pools": pool_monitor.estatisticas(),
+        "replica": replica_router.estatisticas(),
+        "slow_queries": sql_monitor.consultas_lentas.listar(limit=20),
+        "n_plus_one": sql_monitor.suspeitas_n_mais_1.listar(limit=20),
     }
 
 
@@ -224,5 +313,20 @@ async def get_metrics_endpoints(_: None = Depends(require_metrics_access)):
     return metrics_service.get_endpoint_stats()
 
 
+@app.get("/api/v1/metrics/slow-queries", tags=["Monitoring"])
+async def get_metrics_slow_queries(limit: int = 50, _: None = Depends(require_metrics_access)):
+    """Retorna as consultas lentas e as suspeitas de N+1 mais recentes."""
+    return {
+        "slow_queries": sql_monitor.consultas_lentas.listar(limit=limit),
+        "n_plus_one": sql_monitor.suspeitas_n_mais_1.listar(limit=limit),
+    }
+
+
+@app.get("/api/v1/metrics/db-pools", tags=["Monitoring"])
+async def get_metrics_db_pools(_: None = Depends(require_metrics_access)):
+    """Retorna o estado e os tempos de checkout dos pools de conexão."""
+    return pool_monitor.estatisticas()
+
+
 # Incluir rotas da API v1
 app.include_router(api_router, prefix=settings.API_V1_STR)
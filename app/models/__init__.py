@@ -1,5 +1,5 @@
 from app.models.pessoa import Pessoa
-from app.models.enums import TipoPessoa, StatusDiaria, StatusInscricao
+from app.models.enums import TipoPessoa, StatusDiaria, StatusInscricao, StatusRelatorioJob
 from app.models.rota import Rota, PontoParada
 from app.models.empresa import Empresa
 from app.models.diaria import Diaria, Inscricao
@@ -9,6 +9,9 @@ from app.models.alocacao import AlocacaoDiaria, AlocacaoColaborador
 from app.models.presenca import RegistroPresenca
 from app.models.perfil import Perfil, Permissao
 from app.models.ponto_onibus import PontoOnibus
+from app.models.fato import FatoDiariaDia, ControleRollup
+from app.models.relatorio_job import RelatorioJob
+from app.models.rate_limit import RateLimitContador
 
 __all__ = [
     "Pessoa", "TipoPessoa",
@@ -21,5 +24,8 @@ __all__ = [
     "RegistroPresenca",
     "Perfil", "Permissao",
     "PontoOnibus",
+    "FatoDiariaDia", "ControleRollup",
+    "RelatorioJob", "StatusRelatorioJob",
+    "RateLimitContador",
 ]
 
@@ -11,8 +11,8 @@ class AlocacaoDiaria(Base):
     __tablename__ = "alocacoes_diarias"
 
     id = Column(Integer, primary_key=True, index=True)
-    diaria_id = Column(Integer, ForeignKey("diarias.id"), nullable=False)
-    veiculo_id = Column(Integer, ForeignKey("veiculos.id"), nullable=False)
+    diaria_id = Column(Integer, ForeignKey("diarias.id"), nullable=False, index=True)
+    veiculo_id = Column(Integer, ForeignKey("veiculos.id"), nullable=False, index=True)
     rota_id = Column(Integer, ForeignKey("rotas.id"), nullable=True)
     horario_saida = Column(Time, nullable=True)
     observacao = Column(String(500), nullable=True)
@@ -31,8 +31,8 @@ class AlocacaoColaborador(Base):
     __tablename__ = "alocacoes_colaboradores"
 
     id = Column(Integer, primary_key=True, index=True)
-    alocacao_diaria_id = Column(Integer, ForeignKey("alocacoes_diarias.id"), nullable=False)
-    inscricao_id = Column(Integer, ForeignKey("inscricoes.id"), nullable=False)
+    alocacao_diaria_id = Column(Integer, ForeignKey("alocacoes_diarias.id"), nullable=False, index=True)
+    inscricao_id = Column(Integer, ForeignKey("inscricoes.id"), nullable=False, index=True)
     ponto_parada_id = Column(Integer, ForeignKey("pontos_parada.id"), nullable=True)
     horario_estimado = Column(Time, nullable=True)  # Horário de passagem no ponto
     ordem_embarque = Column(Integer, default=0)  # Ordem de embarque na rota
@@ -1,6 +1,8 @@
 from datetime import datetime, date, time
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Time, Text, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Time, Text, Numeric, Index
+from sqlalchemy import event, text
+from sqlalchemy.orm import column_property, relationship
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy import Enum as SqlEnum
 
 from app.db.base import Base
@@ -11,6 +13,10 @@ class Diaria(Base):
     """Modelo de Diária no banco de dados."""
 
     __tablename__ = "diarias"
+    __table_args__ = (
+        Index("ix_diarias_status_data", "status", "data"),  # Diárias abertas a partir de hoje
+        Index("ix_diarias_data_id", "data", "id"),  # Listagem paginada por cursor (data, id)
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     titulo = Column(String(150), nullable=False)
@@ -28,7 +34,12 @@ class Diaria(Base):
         nullable=False,
     )
     criado_em = Column(DateTime, default=datetime.utcnow)
-    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Contadores denormalizados, mantidos no flush de Inscricao/RegistroPresenca
+    total_inscritos = Column(Integer, nullable=False, default=0, server_default="0")  # pendentes + confirmadas
+    total_confirmados = Column(Integer, nullable=False, default=0, server_default="0")
+    total_presencas = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Foreign Keys
     empresa_id = Column(Integer, ForeignKey("empresas.id"), nullable=False)
@@ -42,29 +53,112 @@ class Diaria(Base):
     @property
     def vagas_disponiveis(self) -> int:
         """Retorna o número de vagas disponíveis."""
-        inscritos = len([i for i in self.inscricoes if i.status in [StatusInscricao.CONFIRMADA, StatusInscricao.PENDENTE]])
-        return max(0, self.vagas - inscritos)
+        return max(0, self.vagas - (self.total_inscritos or 0))
 
 
 class Inscricao(Base):
     """Modelo de Inscrição em Diária."""
 
     __tablename__ = "inscricoes"
+    __table_args__ = (
+        Index("ix_inscricoes_diaria_id_status", "diaria_id", "status"),
+        Index("ix_inscricoes_pessoa_id_status", "pessoa_id", "status"),
+        Index("ix_inscricoes_pessoa_id_criado_em_id", "pessoa_id", "criado_em", "id"),  # Inscrições da pessoa por cursor
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    status = Column(
-        SqlEnum(StatusInscricao, values_callable=enum_values, name="statusinscricao"),
-        default=StatusInscricao.PENDENTE,
-        nullable=False,
+    # active_history: os listeners dos contadores precisam do valor antigo mesmo com a instância expirada
+    status = column_property(
+        Column(
+            SqlEnum(StatusInscricao, values_callable=enum_values, name="statusinscricao"),
+            default=StatusInscricao.PENDENTE,
+            nullable=False,
+        ),
+        active_history=True,
     )
     observacao = Column(Text, nullable=True)
-    criado_em = Column(DateTime, default=datetime.utcnow)
-    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)  # Chave da paginação por cursor
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Foreign Keys
     pessoa_id = Column(Integer, ForeignKey("pessoas.id"), nullable=False)
-    diaria_id = Column(Integer, ForeignKey("diarias.id"), nullable=False)
+    diaria_id = column_property(Column(Integer, ForeignKey("diarias.id"), nullable=False), active_history=True)
 
     # Relacionamentos
     pessoa = relationship("Pessoa", backref="inscricoes")
     diaria = relationship("Diaria", back_populates="inscricoes")
+
+
+# ========== Contadores denormalizados da diária ==========
+
+STATUS_INSCRICAO_ATIVOS = (StatusInscricao.PENDENTE, StatusInscricao.CONFIRMADA)
+
+
+def _peso_status(status) -> tuple:
+    """Retorna (inscritos, confirmados) com que uma inscrição contribui."""
+    status = status or StatusInscricao.PENDENTE
+    return int(status in STATUS_INSCRICAO_ATIVOS), int(status == StatusInscricao.CONFIRMADA)
+
+
+def ajustar_contadores_diaria(connection, diaria_id, inscritos: int = 0, confirmados: int = 0, presencas: int = 0) -> None:
+    """
+    Aplica deltas nos contadores da diária com UPDATE atômico (col = col + delta).
+
+    Roda na mesma conexão/transação do flush; `diaria_id` pode ser um
+    valor ou uma subquery escalar.
+    """
+    if not (inscritos or confirmados or presencas):
+        return
+    tabela = Diaria.__table__
+    connection.execute(
+        tabela.update()
+        .where(tabela.c.id == diaria_id)
+        .values(
+            total_inscritos=tabela.c.total_inscritos + inscritos,
+            total_confirmados=tabela.c.total_confirmados + confirmados,
+            total_presencas=tabela.c.total_presencas + presencas,
+        )
+    )
+
+
+@event.listens_for(Inscricao, "after_insert")
+def _inscricao_inserida(mapper, connection, target):
+    inscritos, confirmados = _peso_status(target.status)
+    ajustar_contadores_diaria(connection, target.diaria_id, inscritos, confirmados)
+
+
+@event.listens_for(Inscricao, "after_update")
+def _inscricao_atualizada(mapper, connection, target):
+    status = get_history(target, "status")
+    diaria = get_history(target, "diaria_id")
+    if not (status.deleted or diaria.deleted):
+        return
+
+    status_antigo = status.deleted[0] if status.deleted else target.status
+    diaria_antiga = diaria.deleted[0] if diaria.deleted else target.diaria_id
+
+    inscritos_antes, confirmados_antes = _peso_status(status_antigo)
+    inscritos_depois, confirmados_depois = _peso_status(target.status)
+
+    if diaria_antiga == target.diaria_id:
+        ajustar_contadores_diaria(
+            connection,
+            target.diaria_id,
+            inscritos_depois - inscritos_antes,
+            confirmados_depois - confirmados_antes,
+        )
+    else:
+        ajustar_contadores_diaria(connection, diaria_antiga, -inscritos_antes, -confirmados_antes)
+        ajustar_contadores_diaria(connection, target.diaria_id, inscritos_depois, confirmados_depois)
+
+
+@event.listens_for(Inscricao, "before_delete")
+def _inscricao_removida(mapper, connection, target):
+    # Conta antes do DELETE: presenças removidas junto (ON DELETE CASCADE, SQL direto)
+    # não passam pelo listener de RegistroPresenca. As apagadas pelo ORM no mesmo
+    # flush já saíram da tabela e do contador.
+    presencas = connection.execute(
+        text("SELECT COUNT(*) FROM registros_presenca WHERE inscricao_id = :id"), {"id": target.id}
+    ).scalar()
+    inscritos, confirmados = _peso_status(target.status)
+    ajustar_contadores_diaria(connection, target.diaria_id, -inscritos, -confirmados, -presencas)
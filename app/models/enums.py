@@ -31,6 +31,16 @@ class StatusInscricao(str, Enum):
     FALTA = "falta"             # Falta - sem presença confirmada
 
 
+class StatusRelatorioJob(str, Enum):
+    """Status de um job assíncrono de relatório."""
+
+    PENDENTE = "pendente"       # Na fila do pool de workers
+    EXECUTANDO = "executando"   # Em processamento
+    CONCLUIDO = "concluido"     # Arquivo disponível para download
+    ERRO = "erro"               # Falhou (ver campo erro)
+    CANCELADO = "cancelado"     # Cancelado pelo solicitante
+
+
 def enum_values(enum_cls: Type[Enum]) -> list[str]:
     """Retorna os valores persistidos no PostgreSQL (lowercase)."""
     return [member.value for member in enum_cls]
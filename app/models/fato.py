@@ -0,0 +1,35 @@
+"""Tabelas de rollup (fatos pré-agregados) usadas por dashboards e relatórios."""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Numeric
+
+from app.db.base import Base
+
+ROLLUP_FATO_DIARIA_DIA = "fato_diaria_dia"
+
+
+class FatoDiariaDia(Base):
+    """Totais consolidados por dia x empresa (preenchido pelo scheduler)."""
+
+    __tablename__ = "fato_diaria_dia"
+
+    data = Column(Date, primary_key=True)
+    empresa_id = Column(Integer, ForeignKey("empresas.id", ondelete="CASCADE"), primary_key=True)
+    total_diarias = Column(Integer, nullable=False, default=0)
+    total_vagas = Column(Integer, nullable=False, default=0)
+    inscricoes_confirmadas = Column(Integer, nullable=False, default=0)  # status confirmada
+    inscricoes_efetivas = Column(Integer, nullable=False, default=0)  # confirmada + concluida
+    total_presencas = Column(Integer, nullable=False, default=0)
+    valor_total = Column(Numeric(14, 2), nullable=False, default=0)  # presenças x valor, com DSR
+    calculado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ControleRollup(Base):
+    """Estado da carga incremental de cada rollup."""
+
+    __tablename__ = "controle_rollup"
+
+    nome = Column(String(50), primary_key=True)
+    watermark = Column(DateTime, nullable=True)  # Início da última execução bem-sucedida
+    cobertura = Column(Date, nullable=True)  # Último dia consolidado (dias seguintes são calculados ao vivo)
+    congelado_ate = Column(Date, nullable=True)  # Dias até aqui não são mais recalculados
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,6 +1,7 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum as SqlEnum, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum as SqlEnum, ForeignKey, Date, Text, Index, event
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import get_history
 
 from app.db.base import Base
 from app.models.enums import TipoPessoa, enum_values
@@ -11,6 +12,10 @@ class Pessoa(Base):
     """Modelo de Pessoa no banco de dados."""
 
     __tablename__ = "pessoas"
+    __table_args__ = (
+        Index("ix_pessoas_ponto_parada_id_tipo_pessoa_ativo", "ponto_parada_id", "tipo_pessoa", "ativo"),
+        Index("ix_pessoas_nome_id", "nome", "id"),  # Listagem paginada por cursor (nome, id)
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String(100), nullable=False)
@@ -44,8 +49,11 @@ class Pessoa(Base):
     reset_token = Column(String(255), nullable=True, index=True)
     reset_token_expires = Column(DateTime, nullable=True)
     
+    # Versão de autenticação: muda quando dados confiados ao token mudam (revoga o fast path)
+    auth_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     criado_em = Column(DateTime, default=datetime.utcnow)
-    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Ponto de embarque do fretado
     ponto_parada_id = Column(Integer, ForeignKey("pontos_parada.id"), nullable=True)
@@ -61,4 +69,11 @@ class Pessoa(Base):
     )
 
 
+# Campos que, ao mudar, invalidam os tokens emitidos (claims ou estado de acesso)
+CAMPOS_AUTENTICACAO = ("nome", "tipo_pessoa", "senha_hash", "ativo", "bloqueado", "bloqueado_ate")
+
 
+@event.listens_for(Pessoa, "before_update")
+def _incrementar_auth_version(mapper, connection, target):
+    if any(get_history(target, campo).deleted for campo in CAMPOS_AUTENTICACAO):
+        target.auth_version = (target.auth_version or 0) + 1
@@ -1,9 +1,10 @@
 """Modelo de Registro de Presença."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, event, select
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
+from app.models.diaria import Inscricao, ajustar_contadores_diaria
 
 
 class RegistroPresenca(Base):
@@ -17,12 +18,27 @@ class RegistroPresenca(Base):
     latitude = Column(Float, nullable=True)  # GPS opcional
     longitude = Column(Float, nullable=True)
     observacao = Column(Text, nullable=True)
-    criado_em = Column(DateTime, default=datetime.utcnow)
+    criado_em = Column(DateTime, default=datetime.utcnow, index=True)
 
     # Foreign Keys
-    inscricao_id = Column(Integer, ForeignKey("inscricoes.id"), nullable=False)
+    inscricao_id = Column(Integer, ForeignKey("inscricoes.id"), nullable=False, index=True)
     registrado_por_id = Column(Integer, ForeignKey("pessoas.id"), nullable=False)  # Supervisor
 
     # Relacionamentos
     inscricao = relationship("Inscricao", backref="registro_presenca")
     registrado_por = relationship("Pessoa", foreign_keys=[registrado_por_id], backref="presencas_registradas")
+
+
+def _diaria_da_inscricao(inscricao_id):
+    """Subquery escalar com a diária da inscrição (evita carregar o objeto no flush)."""
+    return select(Inscricao.__table__.c.diaria_id).where(Inscricao.__table__.c.id == inscricao_id).scalar_subquery()
+
+
+@event.listens_for(RegistroPresenca, "after_insert")
+def _presenca_inserida(mapper, connection, target):
+    ajustar_contadores_diaria(connection, _diaria_da_inscricao(target.inscricao_id), presencas=1)
+
+
+@event.listens_for(RegistroPresenca, "after_delete")
+def _presenca_removida(mapper, connection, target):
+    ajustar_contadores_diaria(connection, _diaria_da_inscricao(target.inscricao_id), presencas=-1)
@@ -0,0 +1,16 @@
+"""Contadores compartilhados do rate limiting (backend "database")."""
+from sqlalchemy import BigInteger, Column, Float, Integer, String
+
+from app.db.base import Base
+
+
+class RateLimitContador(Base):
+    """Janela atual e anterior de uma chave (uma linha por chave, tamanho fixo)."""
+
+    __tablename__ = "rate_limit_contadores"
+
+    chave = Column(String(200), primary_key=True)
+    janela = Column(BigInteger, nullable=False)  # Índice da janela atual (epoch // window_seconds)
+    atual = Column(Integer, nullable=False, default=0)
+    anterior = Column(Integer, nullable=False, default=0)
+    expira_em = Column(Float, nullable=False, index=True)  # Epoch (s) após o qual a linha pode ser removida
@@ -0,0 +1,39 @@
+"""Modelo de Job assíncrono de relatório."""
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+from app.models.enums import StatusRelatorioJob, enum_values
+
+
+class RelatorioJob(Base):
+    """Execução em background de um relatório, com resultado em arquivo compactado."""
+
+    __tablename__ = "relatorio_jobs"
+
+    id = Column(String(36), primary_key=True)  # UUID
+    tipo = Column(String(50), nullable=False)  # Ex: "diarias", "frequencia-colaborador"
+    parametros = Column(JSON, nullable=False, default=dict)
+    formato = Column(String(10), nullable=False, default="json")  # json, csv, ndjson
+    status = Column(
+        SqlEnum(StatusRelatorioJob, values_callable=enum_values, name="statusrelatoriojob"),
+        default=StatusRelatorioJob.PENDENTE,
+        nullable=False,
+        index=True,
+    )
+    progresso = Column(Integer, nullable=False, default=0)  # 0 a 100
+    cancelamento_solicitado = Column(Boolean, nullable=False, default=False)
+    erro = Column(Text, nullable=True)
+    arquivo = Column(String(500), nullable=True)  # Chave no armazenamento (local ou MinIO)
+    tamanho_bytes = Column(Integer, nullable=True)  # Tamanho do arquivo compactado
+    criado_em = Column(DateTime, default=datetime.utcnow, index=True)
+    iniciado_em = Column(DateTime, nullable=True)
+    concluido_em = Column(DateTime, nullable=True)
+
+    # Foreign Keys
+    solicitado_por_id = Column(Integer, ForeignKey("pessoas.id"), nullable=False)
+
+    # Relacionamentos
+    solicitado_por = relationship("Pessoa")
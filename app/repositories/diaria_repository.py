@@ -1,10 +1,15 @@
 from datetime import date
 from typing import List, Optional
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, func, or_, update
+from sqlalchemy.orm import Session, aliased, joinedload
 
-from app.models.diaria import Diaria, Inscricao
+from app.models.diaria import STATUS_INSCRICAO_ATIVOS, Diaria, Inscricao
+from app.models.empresa import Empresa
 from app.models.enums import StatusDiaria, StatusInscricao
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.repositories.paginacao import Contagem, Pagina, paginar
 from app.schemas.diaria import DiariaCreate, DiariaUpdate, InscricaoCreate, InscricaoUpdate
 
 
@@ -62,6 +67,25 @@ class DiariaRepository:
 
         return query.order_by(Diaria.data.desc()).offset(skip).limit(limit).all()
 
+    def listar(
+        self,
+        status: Optional[StatusDiaria] = None,
+        empresa_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        contagem: Optional[Contagem] = None,
+    ) -> Pagina[Diaria]:
+        """Lista diárias com filtros, paginando por (data, id) da mais recente para a mais antiga."""
+        query = self.db.query(Diaria).options(joinedload(Diaria.empresa))
+        if status:
+            query = query.filter(Diaria.status == status)
+        if empresa_id:
+            query = query.filter(Diaria.empresa_id == empresa_id)
+        return paginar(
+            query, (Diaria.data, Diaria.id), cursor, limit, descendente=True, skip=skip, contagem=contagem,
+        )
+
     def get_disponiveis(self, skip: int = 0, limit: int = 100) -> List[Diaria]:
         """Lista diárias abertas para inscrição."""
         return (
@@ -75,6 +99,48 @@ class DiariaRepository:
             .all()
         )
 
+    def listar_com_contagens(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        supervisor_id: Optional[int] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Diárias com empresa, supervisor e contagens de inscrições/presenças,
+        lidas dos contadores denormalizados da diária (sem agrupar inscrições).
+        """
+        supervisor = aliased(Pessoa)
+        query = (
+            self.db.query(Diaria, Empresa.nome, supervisor.nome)
+            .join(Empresa, Empresa.id == Diaria.empresa_id)
+            .outerjoin(supervisor, supervisor.id == Diaria.supervisor_id)
+        )
+
+        if data_inicio:
+            query = query.filter(Diaria.data >= data_inicio)
+        if data_fim:
+            query = query.filter(Diaria.data <= data_fim)
+        if supervisor_id:
+            query = query.filter(Diaria.supervisor_id == supervisor_id)
+
+        query = query.order_by(Diaria.data.desc(), Diaria.horario_inicio, Diaria.id).offset(skip)
+        if limit:
+            query = query.limit(limit)
+
+        return [
+            {
+                "diaria": diaria,
+                "empresa_nome": empresa_nome,
+                "supervisor_nome": supervisor_nome,
+                "confirmadas": diaria.total_confirmados or 0,
+                "ativas": diaria.total_inscritos or 0,
+                "presencas": diaria.total_presencas or 0,
+            }
+            for diaria, empresa_nome, supervisor_nome in query.all()
+        ]
+
     def count(self, status: Optional[StatusDiaria] = None) -> int:
         """Conta total de diárias."""
         query = self.db.query(Diaria)
@@ -125,6 +191,68 @@ class DiariaRepository:
         self.db.commit()
         return True
 
+    def reconciliar_contadores(self) -> List[int]:
+        """
+        Recalcula os contadores denormalizados a partir de inscrições/presenças
+        e corrige apenas as diárias divergentes.
+
+        Returns:
+            Lista de IDs das diárias corrigidas
+        """
+        inscricoes = (
+            self.db.query(
+                Inscricao.diaria_id.label("diaria_id"),
+                func.sum(case((Inscricao.status.in_(STATUS_INSCRICAO_ATIVOS), 1), else_=0)).label("inscritos"),
+                func.sum(case((Inscricao.status == StatusInscricao.CONFIRMADA, 1), else_=0)).label("confirmados"),
+            )
+            .group_by(Inscricao.diaria_id)
+            .subquery()
+        )
+        presencas = (
+            self.db.query(
+                Inscricao.diaria_id.label("diaria_id"),
+                func.count(RegistroPresenca.id).label("presencas"),
+            )
+            .join(RegistroPresenca, RegistroPresenca.inscricao_id == Inscricao.id)
+            .group_by(Inscricao.diaria_id)
+            .subquery()
+        )
+
+        inscritos = func.coalesce(inscricoes.c.inscritos, 0)
+        confirmados = func.coalesce(inscricoes.c.confirmados, 0)
+        total_presencas = func.coalesce(presencas.c.presencas, 0)
+
+        divergentes = (
+            self.db.query(Diaria.id, inscritos, confirmados, total_presencas)
+            .outerjoin(inscricoes, inscricoes.c.diaria_id == Diaria.id)
+            .outerjoin(presencas, presencas.c.diaria_id == Diaria.id)
+            .filter(
+                or_(
+                    Diaria.total_inscritos != inscritos,
+                    Diaria.total_confirmados != confirmados,
+                    Diaria.total_presencas != total_presencas,
+                )
+            )
+            .all()
+        )
+        if not divergentes:
+            return []
+
+        self.db.execute(
+            update(Diaria),
+            [
+                {
+                    "id": diaria_id,
+                    "total_inscritos": n_inscritos,
+                    "total_confirmados": n_confirmados,
+                    "total_presencas": n_presencas,
+                }
+                for diaria_id, n_inscritos, n_confirmados, n_presencas in divergentes
+            ],
+        )
+        self.db.commit()
+        return [diaria_id for diaria_id, *_ in divergentes]
+
 
 class InscricaoRepository:
     """Repositório para operações de Inscrição."""
@@ -158,6 +286,23 @@ class InscricaoRepository:
             query = query.filter(Inscricao.status == status)
         return query.order_by(Inscricao.criado_em.desc()).all()
 
+    def listar_por_pessoa(
+        self,
+        pessoa_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        contagem: Optional[Contagem] = None,
+    ) -> Pagina[Inscricao]:
+        """Inscrições de uma pessoa com diária e empresa, paginando por (criado_em, id) das mais recentes."""
+        query = (
+            self.db.query(Inscricao)
+            .options(joinedload(Inscricao.diaria).joinedload(Diaria.empresa))
+            .filter(Inscricao.pessoa_id == pessoa_id)
+        )
+        return paginar(
+            query, (Inscricao.criado_em, Inscricao.id), cursor, limit, descendente=True, contagem=contagem,
+        )
+
     def get_inscricoes_ativas_pessoa(self, pessoa_id: int) -> List[Inscricao]:
         """Lista inscrições ativas (pendentes ou confirmadas) de uma pessoa com dados da diária."""
         from datetime import date as dt_date
@@ -0,0 +1,107 @@
+"""Repositório do rollup fato_diaria_dia."""
+from datetime import date, datetime
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import func, insert, select, union
+from sqlalchemy.orm import Session
+
+from app.models.diaria import Diaria, Inscricao
+from app.models.fato import ROLLUP_FATO_DIARIA_DIA, ControleRollup, FatoDiariaDia
+from app.models.presenca import RegistroPresenca
+from app.repositories.relatorio_repository import RelatorioRepository
+
+# Máximo de dias por DELETE/SELECT ... IN (...)
+LOTE_DIAS = 500
+
+
+class FatoDiariaDiaRepository:
+    """Leitura e escrita do rollup diário por empresa e do seu controle de carga."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_controle(self) -> Optional[ControleRollup]:
+        """Estado da última carga (None se o rollup nunca rodou)."""
+        return self.db.get(ControleRollup, ROLLUP_FATO_DIARIA_DIA)
+
+    @staticmethod
+    def _no_intervalo(coluna, depois_de: Optional[date], ate: date) -> list:
+        filtros = [coluna <= ate]
+        if depois_de:
+            filtros.append(coluna > depois_de)
+        return filtros
+
+    def dias_com_diarias(self, depois_de: Optional[date], ate: date) -> Set[date]:
+        """Dias com pelo menos uma diária no intervalo (depois_de, ate]."""
+        query = self.db.query(Diaria.data).filter(*self._no_intervalo(Diaria.data, depois_de, ate)).distinct()
+        return {dia for (dia,) in query}
+
+    def dias_alterados(self, desde: datetime, depois_de: Optional[date], ate: date) -> Set[date]:
+        """Dias cujas diárias, inscrições ou presenças mudaram a partir do watermark."""
+        intervalo = self._no_intervalo(Diaria.data, depois_de, ate)
+        alterados = union(
+            select(Diaria.data).where(Diaria.atualizado_em >= desde, *intervalo),
+            select(Diaria.data)
+            .join(Inscricao, Inscricao.diaria_id == Diaria.id)
+            .where(Inscricao.atualizado_em >= desde, *intervalo),
+            select(Diaria.data)
+            .join(Inscricao, Inscricao.diaria_id == Diaria.id)
+            .join(RegistroPresenca, RegistroPresenca.inscricao_id == Inscricao.id)
+            .where(RegistroPresenca.criado_em >= desde, *intervalo),
+        )
+        return {dia for (dia,) in self.db.execute(alterados)}
+
+    def dias_divergentes(self, depois_de: Optional[date], ate: date) -> Set[date]:
+        """
+        Dias em que os totais do rollup diferem dos contadores das diárias.
+
+        Pega o que o watermark não vê: diárias, inscrições e presenças
+        removidas não deixam atualizado_em/criado_em para trás. Compara com
+        total_confirmados/total_presencas da diária, sem ler inscrições.
+        """
+        reais = {
+            dia: tuple(totais)
+            for dia, *totais in self.db.query(
+                Diaria.data,
+                func.count(Diaria.id),
+                func.sum(Diaria.vagas),
+                func.sum(Diaria.total_confirmados),
+                func.sum(Diaria.total_presencas),
+            )
+            .filter(*self._no_intervalo(Diaria.data, depois_de, ate))
+            .group_by(Diaria.data)
+        }
+        consolidados = {
+            dia: tuple(totais)
+            for dia, *totais in self.db.query(
+                FatoDiariaDia.data,
+                func.sum(FatoDiariaDia.total_diarias),
+                func.sum(FatoDiariaDia.total_vagas),
+                func.sum(FatoDiariaDia.inscricoes_confirmadas),
+                func.sum(FatoDiariaDia.total_presencas),
+            )
+            .filter(*self._no_intervalo(FatoDiariaDia.data, depois_de, ate))
+            .group_by(FatoDiariaDia.data)
+        }
+        return {
+            dia for dia in reais.keys() | consolidados.keys()
+            if reais.get(dia) != consolidados.get(dia)
+        }
+
+    def recalcular_dias(self, dias: Iterable[date]) -> int:
+        """Substitui as linhas dos dias informados pelos totais atuais. Não faz commit."""
+        dias = sorted(dias)
+        relatorio_repo = RelatorioRepository(self.db)
+
+        for i in range(0, len(dias), LOTE_DIAS):
+            lote = dias[i:i + LOTE_DIAS]
+            self.db.query(FatoDiariaDia).filter(FatoDiariaDia.data.in_(lote)).delete(synchronize_session=False)
+            linhas = relatorio_repo.totais_por_dia_empresa(lote)
+            if linhas:
+                self.db.execute(insert(FatoDiariaDia), linhas)
+
+        return len(dias)
+
+    def limpar(self) -> None:
+        """Remove todas as linhas do rollup. Não faz commit."""
+        self.db.query(FatoDiariaDia).delete(synchronize_session=False)
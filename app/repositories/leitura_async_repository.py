@@ -0,0 +1,69 @@
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.alocacao import AlocacaoColaborador, AlocacaoDiaria
+from app.models.diaria import Diaria, Inscricao
+from app.models.enums import StatusDiaria
+from app.models.pessoa import Pessoa
+from app.repositories.paginacao import aplicar_keyset, fatiar_pagina
+
+
+class LeituraAsyncRepository:
+    """
+    Consultas de leitura para os endpoints async (AsyncSession).
+
+    Lazy load não é permitido em sessões assíncronas: todo relacionamento
+    usado pelos schemas de resposta é carregado explicitamente aqui.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_pessoa(self, pessoa_id: int) -> Optional[Pessoa]:
+        """Busca pessoa por ID."""
+        return await self.db.get(Pessoa, pessoa_id)
+
+    async def get_diarias_disponiveis(self, skip: int = 0, limit: int = 100) -> List[Diaria]:
+        """Lista diárias abertas para inscrição, com empresa e supervisor."""
+        resultado = await self.db.execute(
+            select(Diaria)
+            .options(joinedload(Diaria.empresa), joinedload(Diaria.supervisor))
+            .where(Diaria.status == StatusDiaria.ABERTA, Diaria.data >= date.today())
+            .order_by(Diaria.data)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(resultado.scalars().all())
+
+    async def get_inscricoes_pessoa(
+        self, pessoa_id: int, cursor: Optional[str] = None, limit: int = 100,
+    ) -> Tuple[List[Inscricao], Optional[str]]:
+        """Página de inscrições de uma pessoa com diária e empresa, por (criado_em, id) das mais recentes."""
+        chave = (Inscricao.criado_em, Inscricao.id)
+        consulta = (
+            select(Inscricao)
+            .options(joinedload(Inscricao.diaria).joinedload(Diaria.empresa))
+            .where(Inscricao.pessoa_id == pessoa_id)
+        )
+        resultado = await self.db.execute(aplicar_keyset(consulta, chave, cursor, limit, descendente=True))
+        return fatiar_pagina(resultado.scalars().all(), chave, limit)
+
+    async def get_alocacoes_pessoa(self, pessoa_id: int) -> List[AlocacaoColaborador]:
+        """Alocações do colaborador em diárias futuras, com veículo, diária e ponto."""
+        resultado = await self.db.execute(
+            select(AlocacaoColaborador)
+            .options(
+                joinedload(AlocacaoColaborador.alocacao_diaria).joinedload(AlocacaoDiaria.veiculo),
+                joinedload(AlocacaoColaborador.alocacao_diaria).joinedload(AlocacaoDiaria.diaria),
+                joinedload(AlocacaoColaborador.ponto_parada),
+            )
+            .join(AlocacaoColaborador.inscricao)
+            .join(AlocacaoColaborador.alocacao_diaria)
+            .join(AlocacaoDiaria.diaria)
+            .where(Inscricao.pessoa_id == pessoa_id, Diaria.data >= date.today())
+        )
+        return list(resultado.scalars().all())
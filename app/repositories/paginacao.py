@@ -0,0 +1,181 @@
+"""
+Paginação por cursor (keyset).
+
+Com OFFSET o banco lê e descarta todas as linhas anteriores à página, e cada
+página fica mais lenta que a anterior. O cursor guarda os valores da chave de
+ordenação da última linha entregue; a página seguinte começa direto no índice
+com `WHERE (chave) > (valores do cursor)`.
+
+O cursor é opaco para o cliente (base64 de JSON) e carrega os nomes das
+colunas da chave: um cursor de outra listagem é rejeitado com CursorInvalido,
+respondido como 400 pelo handler registrado em app.main.
+
+O total exato (COUNT(*)) passa a ser opcional: "estimada" usa as estatísticas
+do PostgreSQL (pg_class.reltuples sem filtros, estimativa do planner com
+filtros) e cai para a contagem exata nos demais bancos.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Generic, List, Literal, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import literal, text, tuple_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+Contagem = Literal["exata", "estimada", "nenhuma"]
+
+
+class CursorInvalido(ValueError):
+    """Cursor malformado ou de outra listagem."""
+
+
+@dataclass
+class Pagina(Generic[T]):
+    """Página de uma listagem keyset."""
+
+    itens: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_estimado: bool = False
+
+
+def _nomes(colunas: Sequence[Any]) -> List[str]:
+    return [f"{coluna.expression.table.name}.{coluna.key}" for coluna in colunas]
+
+
+def _converter(coluna: Any, valor: Any) -> Any:
+    if valor is None:
+        return None
+    tipo = coluna.expression.type.python_type
+    # datetime é subclasse de date: verificar antes
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    return tipo(valor)
+
+
+def codificar_cursor(colunas: Sequence[Any], valores: Sequence[Any]) -> str:
+    """Cursor opaco com os valores da chave da última linha entregue."""
+    carga = {
+        "c": _nomes(colunas),
+        "v": [valor.isoformat() if isinstance(valor, date) else valor for valor in valores],
+    }
+    bruto = json.dumps(carga, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decodificar_cursor(colunas: Sequence[Any], cursor: str) -> List[Any]:
+    """Valores da chave guardados no cursor, convertidos para os tipos das colunas."""
+    try:
+        carga = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        nomes, valores = carga["c"], carga["v"]
+    except (ValueError, KeyError, TypeError, binascii.Error) as exc:
+        raise CursorInvalido("Cursor de paginação inválido") from exc
+    if nomes != _nomes(colunas) or len(valores) != len(colunas):
+        raise CursorInvalido("Cursor de paginação pertence a outra listagem")
+    try:
+        return [_converter(coluna, valor) for coluna, valor in zip(colunas, valores)]
+    except (ValueError, TypeError) as exc:
+        raise CursorInvalido("Cursor de paginação inválido") from exc
+
+
+def aplicar_keyset(
+    consulta: Any,
+    colunas: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+    descendente: bool = False,
+    skip: int = 0,
+) -> Any:
+    """
+    Ordena pela chave, filtra a partir do cursor e busca limit + 1 linhas
+    (a linha extra só indica se há próxima página). Serve para Query e Select.
+
+    `skip` (OFFSET) é mantido para clientes antigos e ignorado quando há cursor.
+    """
+    chave = tuple_(*colunas)
+    if cursor:
+        valores = tuple_(*[
+            literal(valor, coluna.expression.type)
+            for coluna, valor in zip(colunas, decodificar_cursor(colunas, cursor))
+        ])
+        consulta = consulta.filter(chave < valores if descendente else chave > valores)
+    ordem = [coluna.desc() if descendente else coluna.asc() for coluna in colunas]
+    consulta = consulta.order_by(*ordem)
+    if skip and not cursor:
+        consulta = consulta.offset(skip)
+    return consulta.limit(limit + 1)
+
+
+def fatiar_pagina(
+    linhas: Sequence[T],
+    colunas: Sequence[Any],
+    limit: int,
+    chave: Optional[Callable[[T], Sequence[Any]]] = None,
+) -> Tuple[List[T], Optional[str]]:
+    """Separa a linha extra de aplicar_keyset e monta o cursor da próxima página."""
+    itens = list(linhas[:limit])
+    if len(linhas) <= limit:
+        return itens, None
+    ultimo = itens[-1]
+    valores = chave(ultimo) if chave else [getattr(ultimo, coluna.key) for coluna in colunas]
+    return itens, codificar_cursor(colunas, valores)
+
+
+def resolver_contagem(contagem: Optional[Contagem], cursor: Optional[str]) -> Contagem:
+    """Sem escolha explícita, conta só na primeira página (o total não muda entre páginas)."""
+    return contagem or ("nenhuma" if cursor else "exata")
+
+
+def estimar_total(consulta: Query) -> Optional[int]:
+    """Estimativa de linhas pelas estatísticas do PostgreSQL (None em outros bancos ou sem ANALYZE)."""
+    db = consulta.session
+    dialeto = db.get_bind().dialect
+    if dialeto.name != "postgresql":
+        return None
+    consulta = consulta.enable_eagerloads(False).order_by(None)
+    if consulta.whereclause is None:
+        tabela = consulta.column_descriptions[0]["entity"].__table__.name
+        linhas = db.execute(
+            text("SELECT CAST(reltuples AS bigint) FROM pg_class WHERE oid = to_regclass(:tabela)"),
+            {"tabela": tabela},
+        ).scalar()
+        # reltuples = -1: tabela ainda não analisada
+        return linhas if linhas is not None and linhas >= 0 else None
+    compilada = consulta.statement.compile(dialect=dialeto)
+    plano = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compilada}", compilada.params).scalar()
+    plano = json.loads(plano) if isinstance(plano, str) else plano
+    return int(plano[0]["Plan"]["Plan Rows"])
+
+
+def contar(consulta: Query, contagem: Contagem) -> Tuple[Optional[int], bool]:
+    """Total da listagem conforme pedido: (total, se é estimativa)."""
+    if contagem == "nenhuma":
+        return None, False
+    if contagem == "estimada":
+        estimativa = estimar_total(consulta)
+        if estimativa is not None:
+            return estimativa, True
+    return consulta.order_by(None).count(), False
+
+
+def paginar(
+    consulta: Query,
+    colunas: Sequence[Any],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descendente: bool = False,
+    skip: int = 0,
+    contagem: Optional[Contagem] = None,
+    chave: Optional[Callable[[Any], Sequence[Any]]] = None,
+) -> Pagina:
+    """Página keyset de uma Query síncrona, com total conforme `contagem`."""
+    total, estimado = contar(consulta, resolver_contagem(contagem, cursor))
+    linhas = aplicar_keyset(consulta, colunas, cursor, limit, descendente=descendente, skip=skip).all()
+    itens, proximo = fatiar_pagina(linhas, colunas, limit, chave=chave)
+    return Pagina(itens=itens, next_cursor=proximo, total=total, total_estimado=estimado)
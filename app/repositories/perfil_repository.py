@@ -1,8 +1,10 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, select, update
 
-from app.models.perfil import Perfil, Permissao, pessoa_perfil
+from app.core.auth_cache import auth_state_cache
+from app.core.permission_cache import permission_cache
+from app.models.perfil import Perfil, Permissao, perfil_permissao, pessoa_perfil
 from app.models.pessoa import Pessoa
 
 
@@ -12,6 +14,36 @@ class PerfilRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _commit(self) -> None:
+        """Confirma a alteração e invalida as permissões compiladas em cache."""
+        self.db.commit()
+        permission_cache.incrementar_versao()
+
+    def _revogar_tokens_do_perfil(self, perfil_id: int) -> None:
+        """Incrementa a auth_version de quem tem o perfil (os perfis do token mudaram)."""
+        pessoas_do_perfil = select(pessoa_perfil.c.pessoa_id).where(pessoa_perfil.c.perfil_id == perfil_id)
+        self.db.execute(
+            update(Pessoa)
+            .where(Pessoa.id.in_(pessoas_do_perfil))
+            .values(auth_version=Pessoa.auth_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        auth_state_cache.invalidar()
+
+    def _revogar_tokens_da_permissao(self, permissao_id: int) -> None:
+        """Incrementa a auth_version de quem tem algum perfil com a permissão."""
+        perfis_da_permissao = select(perfil_permissao.c.perfil_id).where(
+            perfil_permissao.c.permissao_id == permissao_id
+        )
+        pessoas = select(pessoa_perfil.c.pessoa_id).where(pessoa_perfil.c.perfil_id.in_(perfis_da_permissao))
+        self.db.execute(
+            update(Pessoa)
+            .where(Pessoa.id.in_(pessoas))
+            .values(auth_version=Pessoa.auth_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        auth_state_cache.invalidar()
+
     # ========== CRUD de Perfil ==========
 
     def get_perfil(self, perfil_id: int) -> Optional[Perfil]:
@@ -69,7 +101,7 @@ class PerfilRepository:
             ativo=ativo,
         )
         self.db.add(perfil)
-        self.db.commit()
+        self._commit()
         self.db.refresh(perfil)
         return perfil
 
@@ -92,7 +124,8 @@ class PerfilRepository:
         if ativo is not None:
             perfil.ativo = ativo
 
-        self.db.commit()
+        self._revogar_tokens_do_perfil(perfil_id)
+        self._commit()
         self.db.refresh(perfil)
         return perfil
 
@@ -102,8 +135,9 @@ class PerfilRepository:
         if not perfil or perfil.sistema:
             return False
 
+        self._revogar_tokens_do_perfil(perfil_id)
         self.db.delete(perfil)
-        self.db.commit()
+        self._commit()
         return True
 
     # ========== CRUD de Permissão ==========
@@ -155,7 +189,7 @@ class PerfilRepository:
             ativo=ativo,
         )
         self.db.add(permissao)
-        self.db.commit()
+        self._commit()
         self.db.refresh(permissao)
         return permissao
 
@@ -178,7 +212,8 @@ class PerfilRepository:
         if ativo is not None:
             permissao.ativo = ativo
 
-        self.db.commit()
+        self._revogar_tokens_da_permissao(permissao_id)
+        self._commit()
         self.db.refresh(permissao)
         return permissao
 
@@ -188,8 +223,9 @@ class PerfilRepository:
         if not permissao:
             return False
 
+        self._revogar_tokens_da_permissao(permissao_id)
         self.db.delete(permissao)
-        self.db.commit()
+        self._commit()
         return True
 
     # ========== Gestão de Permissões do Perfil ==========
@@ -205,7 +241,8 @@ class PerfilRepository:
         permissoes = self.db.query(Permissao).filter(Permissao.id.in_(permissoes_ids)).all()
         perfil.permissoes.extend(permissoes)
 
-        self.db.commit()
+        self._revogar_tokens_do_perfil(perfil_id)
+        self._commit()
         self.db.refresh(perfil)
         return perfil
 
@@ -221,7 +258,8 @@ class PerfilRepository:
         for perm in permissoes_remover:
             perfil.permissoes.remove(perm)
 
-        self.db.commit()
+        self._revogar_tokens_do_perfil(perfil_id)
+        self._commit()
         self.db.refresh(perfil)
         return perfil
 
@@ -236,7 +274,8 @@ class PerfilRepository:
         permissoes = self.db.query(Permissao).filter(Permissao.id.in_(permissoes_ids)).all()
         perfil.permissoes = permissoes
 
-        self.db.commit()
+        self._revogar_tokens_do_perfil(perfil_id)
+        self._commit()
         self.db.refresh(perfil)
         return perfil
 
@@ -257,7 +296,8 @@ class PerfilRepository:
             return True
 
         pessoa.perfis.append(perfil)
-        self.db.commit()
+        pessoa.auth_version = (pessoa.auth_version or 0) + 1
+        self._commit()
         return True
 
     def remover_perfil_de_pessoa(self, pessoa_id: int, perfil_id: int) -> bool:
@@ -275,7 +315,8 @@ class PerfilRepository:
 
         if perfil in pessoa.perfis:
             pessoa.perfis.remove(perfil)
-            self.db.commit()
+            pessoa.auth_version = (pessoa.auth_version or 0) + 1
+            self._commit()
 
         return True
 
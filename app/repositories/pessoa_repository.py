@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.models.pessoa import Pessoa
+from app.repositories.paginacao import Contagem, Pagina, paginar
 from app.schemas.pessoa import PessoaCreate, PessoaUpdate
 from app.core.security import get_password_hash
 
@@ -37,6 +38,32 @@ class PessoaRepository:
         """Conta total de pessoas."""
         return self.db.query(Pessoa).count()
 
+    def listar(
+        self,
+        tipo: Optional[str] = None,
+        ativo: Optional[bool] = None,
+        bloqueado: Optional[bool] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        contagem: Optional[Contagem] = None,
+    ) -> Pagina[Pessoa]:
+        """Lista pessoas com filtros, paginando por (nome, id)."""
+        query = self.db.query(Pessoa)
+        if tipo:
+            query = query.filter(Pessoa.tipo_pessoa == tipo)
+        if ativo is not None:
+            query = query.filter(Pessoa.ativo == ativo)
+        if bloqueado is not None:
+            query = query.filter(Pessoa.bloqueado == bloqueado)
+        if search:
+            query = query.filter(
+                (Pessoa.nome.ilike(f"%{search}%")) |
+                (Pessoa.email.ilike(f"%{search}%"))
+            )
+        return paginar(query, (Pessoa.nome, Pessoa.id), cursor, limit, skip=skip, contagem=contagem)
+
     def create(self, pessoa_data: PessoaCreate) -> Pessoa:
         """Cria uma nova pessoa."""
         db_pessoa = Pessoa(
@@ -75,6 +102,22 @@ class PessoaRepository:
         self.db.refresh(db_pessoa)
         return db_pessoa
 
+    def atualizar_hash_senha(self, pessoa_id: int, hash_atual: str, novo_hash: str) -> bool:
+        """
+        Regrava o hash da mesma senha com o custo atual (rehash no login).
+
+        UPDATE direto: a senha não mudou, então a auth_version não é
+        incrementada e os tokens já emitidos continuam no fast path. Só grava
+        se o hash ainda for o verificado (não sobrescreve troca de senha concorrente).
+        """
+        atualizadas = (
+            self.db.query(Pessoa)
+            .filter(Pessoa.id == pessoa_id, Pessoa.senha_hash == hash_atual)
+            .update({Pessoa.senha_hash: novo_hash}, synchronize_session=False)
+        )
+        self.db.commit()
+        return atualizadas > 0
+
     def delete(self, pessoa_id: int) -> bool:
         """Remove uma pessoa."""
         db_pessoa = self.get_by_id(pessoa_id)
@@ -1,9 +1,19 @@
 """Repository para gerenciar registros de presença."""
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.models.diaria import STATUS_INSCRICAO_ATIVOS, Inscricao
+from app.models.pessoa import Pessoa
 from app.models.presenca import RegistroPresenca
 
+# criado_em é definido no flush, mas a linha só fica visível no commit. Toda
+# transação de requisição termina dentro do maior prazo (REQUEST_DEADLINES):
+# o modo incremental relê essa janela para não perder commits atrasados.
+MARGEM_SINCRONIZACAO = timedelta(seconds=max(settings.REQUEST_DEADLINES.values()))
+
 
 class PresencaRepository:
     """Repository para operações com registros de presença."""
@@ -32,6 +42,62 @@ class PresencaRepository:
             Inscricao.diaria_id == diaria_id
         ).all()
 
+    def get_lista_diaria(
+        self,
+        diaria_id: int,
+        since: Optional[datetime] = None,
+    ) -> List[Tuple[Inscricao, Pessoa, Optional[RegistroPresenca]]]:
+        """
+        Inscritos ativos (pendentes/confirmados) da diária com pessoa e registro
+        de presença, em uma única consulta com LEFT OUTER JOIN.
+
+        Com `since`, retorna apenas os inscritos com presença registrada depois
+        desse instante menos MARGEM_SINCRONIZACAO (modo incremental para
+        polling; o cliente mescla por inscricao_id, então repetições são inócuas).
+        """
+        query = (
+            self.db.query(Inscricao, Pessoa, RegistroPresenca)
+            .join(Pessoa, Inscricao.pessoa_id == Pessoa.id)
+            .filter(
+                Inscricao.diaria_id == diaria_id,
+                Inscricao.status.in_(STATUS_INSCRICAO_ATIVOS),
+            )
+        )
+        if since:
+            query = query.join(RegistroPresenca, RegistroPresenca.inscricao_id == Inscricao.id)
+            query = query.filter(RegistroPresenca.criado_em > since - MARGEM_SINCRONIZACAO)
+        else:
+            query = query.outerjoin(RegistroPresenca, RegistroPresenca.inscricao_id == Inscricao.id)
+
+        # Um registro por inscrição: em caso de duplicidade, vale o primeiro
+        linhas = []
+        vistas = set()
+        for inscricao, pessoa, registro in query.order_by(Inscricao.id, RegistroPresenca.id):
+            if inscricao.id in vistas:
+                continue
+            vistas.add(inscricao.id)
+            linhas.append((inscricao, pessoa, registro))
+        return linhas
+
+    def contar_lista_diaria(self, diaria_id: int) -> Tuple[int, int]:
+        """
+        (inscritos ativos, inscritos ativos com presença) da diária: os mesmos
+        totais da lista completa de get_lista_diaria, sem carregar as linhas.
+        """
+        inscritos, presentes = (
+            self.db.query(
+                func.count(func.distinct(Inscricao.id)),
+                func.count(func.distinct(RegistroPresenca.inscricao_id)),
+            )
+            .outerjoin(RegistroPresenca, RegistroPresenca.inscricao_id == Inscricao.id)
+            .filter(
+                Inscricao.diaria_id == diaria_id,
+                Inscricao.status.in_(STATUS_INSCRICAO_ATIVOS),
+            )
+            .one()
+        )
+        return int(inscritos), int(presentes)
+
     def create(self, presenca_data: dict) -> RegistroPresenca:
         """Cria um novo registro de presença."""
         presenca = RegistroPresenca(**presenca_data)
@@ -0,0 +1,607 @@
+"""Consultas agregadas usadas pelos relatórios e dashboards."""
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, extract, func, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.fato import ROLLUP_FATO_DIARIA_DIA, ControleRollup, FatoDiariaDia
+from app.models.enums import StatusDiaria, StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+
+
+def eh_dsr_expr():
+    """Expressão SQL que indica se a diária cai num domingo (DSR)."""
+    # extract('dow') retorna 0 para domingo tanto no PostgreSQL quanto no SQLite
+    return extract("dow", Diaria.data) == 0
+
+
+def valor_dsr_expr():
+    """Valor unitário da diária considerando DSR (domingo = dobro)."""
+    return case((eh_dsr_expr(), Diaria.valor * 2), else_=Diaria.valor)
+
+
+def classificacao_expr(taxa):
+    """Classificação de frequência a partir da taxa de comparecimento."""
+    return case(
+        (taxa >= 90, "Excelente"),
+        (taxa >= 70, "Bom"),
+        (taxa >= 50, "Regular"),
+        else_="Crítico",
+    )
+
+
+# Usada quando o rollup ainda não rodou: todo o período é calculado ao vivo
+DATA_MINIMA = date(1900, 1, 1)
+
+CLASSIFICACOES_FREQUENCIA = ["Excelente", "Bom", "Regular", "Crítico"]
+ORDENACOES_FREQUENCIA = ["taxa", "nome", "confirmadas", "presencas", "faltas"]
+
+
+class RelatorioRepository:
+    """Repositório de consultas agregadas (GROUP BY) para relatórios."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def watermark(self) -> tuple:
+        """
+        Marca d'água barata dos dados dos relatórios (uma consulta, só índices).
+
+        Muda sempre que diárias, inscrições, presenças, pessoas ou empresas são
+        criadas ou alteradas, e a cada carga do rollup fato_diaria_dia.
+        """
+        return tuple(
+            self.db.query(
+                select(func.max(Diaria.atualizado_em)).scalar_subquery(),
+                select(func.max(Diaria.id)).scalar_subquery(),
+                select(func.max(Inscricao.atualizado_em)).scalar_subquery(),
+                select(func.max(Inscricao.id)).scalar_subquery(),
+                select(func.max(RegistroPresenca.criado_em)).scalar_subquery(),
+                select(func.max(RegistroPresenca.id)).scalar_subquery(),
+                select(func.max(Pessoa.atualizado_em)).scalar_subquery(),
+                # Empresas: poucas linhas, o nome aparece nos relatórios
+                select(func.max(Empresa.atualizado_em)).scalar_subquery(),
+                select(func.max(Empresa.id)).scalar_subquery(),
+                select(ControleRollup.watermark)
+                .where(ControleRollup.nome == ROLLUP_FATO_DIARIA_DIA)
+                .scalar_subquery(),
+            ).one()
+        )
+
+    # ========== Subconsultas por diária ==========
+    #
+    # Recebem os filtros de Diaria do chamador e os aplicam dentro da subconsulta:
+    # o PostgreSQL não empurra o filtro externo para dentro de um GROUP BY, e sem
+    # eles cada chamada agregaria o histórico inteiro de inscrições e presenças.
+
+    def _inscricoes_por_diaria(self, *filtros_diaria):
+        """Contagens de inscrições por diária, separadas por grupo de status."""
+        query = (
+            self.db.query(
+                Inscricao.diaria_id.label("diaria_id"),
+                func.sum(
+                    case((Inscricao.status == StatusInscricao.CONFIRMADA, 1), else_=0)
+                ).label("confirmadas"),
+                func.sum(
+                    case(
+                        (Inscricao.status.in_([StatusInscricao.CONFIRMADA, StatusInscricao.CONCLUIDA]), 1),
+                        else_=0,
+                    )
+                ).label("efetivas"),
+                func.sum(
+                    case(
+                        (Inscricao.status.in_([StatusInscricao.CONFIRMADA, StatusInscricao.PENDENTE]), 1),
+                        else_=0,
+                    )
+                ).label("ativas"),
+            )
+        )
+        if filtros_diaria:
+            query = query.join(Diaria, Diaria.id == Inscricao.diaria_id).filter(*filtros_diaria)
+        return query.group_by(Inscricao.diaria_id).subquery()
+
+    def _presencas_por_diaria(self, *filtros_diaria):
+        """Total de presenças registradas por diária."""
+        query = (
+            self.db.query(
+                Inscricao.diaria_id.label("diaria_id"),
+                func.count(RegistroPresenca.id).label("presencas"),
+            )
+            .join(RegistroPresenca, RegistroPresenca.inscricao_id == Inscricao.id)
+        )
+        if filtros_diaria:
+            query = query.join(Diaria, Diaria.id == Inscricao.diaria_id).filter(*filtros_diaria)
+        return query.group_by(Inscricao.diaria_id).subquery()
+
+    def _filtros_periodo(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        empresa_id: Optional[int] = None,
+    ) -> list:
+        filtros = []
+        if data_inicio:
+            filtros.append(Diaria.data >= data_inicio)
+        if data_fim:
+            filtros.append(Diaria.data <= data_fim)
+        if empresa_id:
+            filtros.append(Diaria.empresa_id == empresa_id)
+        return filtros
+
+    def _filtrar_periodo(
+        self,
+        query,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        empresa_id: Optional[int] = None,
+    ):
+        return query.filter(*self._filtros_periodo(data_inicio, data_fim, empresa_id))
+
+    def _linhas_por_diaria(self, *filtros_diaria):
+        """Uma linha por diária (dia, empresa, vagas, inscrições, presenças, valor com DSR) das diárias filtradas."""
+        insc = self._inscricoes_por_diaria(*filtros_diaria)
+        pres = self._presencas_por_diaria(*filtros_diaria)
+        presencas = func.coalesce(pres.c.presencas, 0)
+
+        return (
+            select(
+                Diaria.data.label("data"),
+                Diaria.empresa_id.label("empresa_id"),
+                literal(1).label("diarias"),
+                Diaria.vagas.label("vagas"),
+                func.coalesce(insc.c.confirmadas, 0).label("confirmadas"),
+                func.coalesce(insc.c.efetivas, 0).label("efetivas"),
+                presencas.label("presencas"),
+                (valor_dsr_expr() * presencas).label("valor"),
+            )
+            .select_from(Diaria)
+            .outerjoin(insc, insc.c.diaria_id == Diaria.id)
+            .outerjoin(pres, pres.c.diaria_id == Diaria.id)
+            .where(*filtros_diaria)
+        )
+
+    def _cobertura_rollup(self):
+        """Último dia consolidado em fato_diaria_dia (DATA_MINIMA se o rollup nunca rodou)."""
+        cobertura = (
+            select(ControleRollup.cobertura)
+            .where(ControleRollup.nome == ROLLUP_FATO_DIARIA_DIA)
+            .scalar_subquery()
+        )
+        return func.coalesce(cobertura, DATA_MINIMA)
+
+    def _fatos(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+    ):
+        """
+        Linhas por dia x empresa do período.
+
+        Dias já consolidados vêm de fato_diaria_dia; os demais (hoje e futuros)
+        são calculados ao vivo e unidos com UNION ALL.
+        """
+        cobertura = self._cobertura_rollup()
+
+        historico = select(
+            FatoDiariaDia.data.label("data"),
+            FatoDiariaDia.empresa_id.label("empresa_id"),
+            FatoDiariaDia.total_diarias.label("diarias"),
+            FatoDiariaDia.total_vagas.label("vagas"),
+            FatoDiariaDia.inscricoes_confirmadas.label("confirmadas"),
+            FatoDiariaDia.inscricoes_efetivas.label("efetivas"),
+            FatoDiariaDia.total_presencas.label("presencas"),
+            FatoDiariaDia.valor_total.label("valor"),
+        ).where(FatoDiariaDia.data <= cobertura)
+        if data_inicio:
+            historico = historico.where(FatoDiariaDia.data >= data_inicio)
+        if data_fim:
+            historico = historico.where(FatoDiariaDia.data <= data_fim)
+        ao_vivo = self._linhas_por_diaria(Diaria.data > cobertura, *self._filtros_periodo(data_inicio, data_fim))
+
+        return union_all(historico, ao_vivo).subquery()
+
+    # ========== Agregações ==========
+
+    def totais_periodo(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+    ) -> dict:
+        """Totais de diárias, vagas, inscrições, presenças e valor (com DSR) no período."""
+        fatos = self._fatos(data_inicio, data_fim)
+
+        diarias, vagas, confirmadas, efetivas, presencas, valor = self.db.query(
+            func.coalesce(func.sum(fatos.c.diarias), 0),
+            func.coalesce(func.sum(fatos.c.vagas), 0),
+            func.coalesce(func.sum(fatos.c.confirmadas), 0),
+            func.coalesce(func.sum(fatos.c.efetivas), 0),
+            func.coalesce(func.sum(fatos.c.presencas), 0),
+            func.coalesce(func.sum(fatos.c.valor), 0),
+        ).one()
+
+        return {
+            "total_diarias": int(diarias),
+            "total_vagas": int(vagas),
+            "inscricoes_confirmadas": int(confirmadas),
+            "inscricoes_efetivas": int(efetivas),
+            "total_presencas": int(presencas),
+            "valor_total": float(valor),
+        }
+
+    def diarias_com_totais(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        empresa_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Diárias do período com empresa, supervisor, inscrições e presenças em uma única consulta."""
+        filtros = self._filtros_periodo(data_inicio, data_fim, empresa_id)
+        if status:
+            filtros.append(Diaria.status == status)
+        insc = self._inscricoes_por_diaria(*filtros)
+        pres = self._presencas_por_diaria(*filtros)
+        supervisor = aliased(Pessoa)
+
+        query = (
+            self.db.query(
+                Diaria,
+                Empresa.nome.label("empresa_nome"),
+                supervisor.nome.label("supervisor_nome"),
+                func.coalesce(insc.c.confirmadas, 0).label("inscricoes"),
+                func.coalesce(insc.c.ativas, 0).label("inscricoes_ativas"),
+                func.coalesce(pres.c.presencas, 0).label("presencas"),
+            )
+            .join(Empresa, Empresa.id == Diaria.empresa_id)
+            .outerjoin(supervisor, supervisor.id == Diaria.supervisor_id)
+            .outerjoin(insc, insc.c.diaria_id == Diaria.id)
+            .outerjoin(pres, pres.c.diaria_id == Diaria.id)
+            .filter(*filtros)
+            .order_by(Diaria.data.desc(), Diaria.id.desc())
+        )
+        if limit:
+            query = query.limit(limit)
+
+        return [
+            {
+                "diaria": diaria,
+                "empresa_nome": empresa_nome,
+                "supervisor_nome": supervisor_nome,
+                "inscricoes": int(inscricoes),
+                "inscricoes_ativas": int(ativas),
+                "presencas": int(presencas),
+            }
+            for diaria, empresa_nome, supervisor_nome, inscricoes, ativas, presencas in query.all()
+        ]
+
+    def totais_por_empresa(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+    ) -> List[dict]:
+        """Totais agrupados por empresa no período."""
+        fatos = self._fatos(data_inicio, data_fim)
+
+        query = (
+            self.db.query(
+                Empresa.id,
+                Empresa.nome,
+                func.sum(fatos.c.diarias),
+                func.coalesce(func.sum(fatos.c.vagas), 0),
+                func.coalesce(func.sum(fatos.c.confirmadas), 0),
+                func.coalesce(func.sum(fatos.c.presencas), 0),
+                func.coalesce(func.sum(fatos.c.valor), 0),
+            )
+            .select_from(fatos)
+            .join(Empresa, Empresa.id == fatos.c.empresa_id)
+            .group_by(Empresa.id, Empresa.nome)
+        )
+
+        return [
+            {
+                "empresa_id": empresa_id,
+                "nome": nome,
+                "total_diarias": int(diarias),
+                "total_vagas": int(vagas),
+                "total_inscricoes": int(confirmadas),
+                "total_presencas": int(presencas_total),
+                "valor_total": float(valor),
+            }
+            for empresa_id, nome, diarias, vagas, confirmadas, presencas_total, valor in query.all()
+        ]
+
+    def serie_por_dia(self, data_inicio: date, data_fim: date) -> dict:
+        """Diárias e presenças agrupadas por data. Retorna {data: {...}}."""
+        fatos = self._fatos(data_inicio, data_fim)
+
+        query = (
+            self.db.query(
+                fatos.c.data,
+                func.sum(fatos.c.diarias),
+                func.coalesce(func.sum(fatos.c.presencas), 0),
+            )
+            .group_by(fatos.c.data)
+        )
+
+        return {
+            dia: {"diarias": int(diarias), "presencas": int(presencas)}
+            for dia, diarias, presencas in query.all()
+        }
+
+    def totais_por_dia_empresa(self, dias: Iterable[date]) -> List[dict]:
+        """Totais ao vivo por dia x empresa, no formato das linhas de fato_diaria_dia."""
+        linhas = self._linhas_por_diaria(Diaria.data.in_(list(dias))).subquery()
+        calculado_em = datetime.utcnow()
+
+        query = (
+            self.db.query(
+                linhas.c.data,
+                linhas.c.empresa_id,
+                func.sum(linhas.c.diarias),
+                func.sum(linhas.c.vagas),
+                func.sum(linhas.c.confirmadas),
+                func.sum(linhas.c.efetivas),
+                func.sum(linhas.c.presencas),
+                func.coalesce(func.sum(linhas.c.valor), 0),
+            )
+            .group_by(linhas.c.data, linhas.c.empresa_id)
+        )
+
+        return [
+            {
+                "data": dia,
+                "empresa_id": empresa_id,
+                "total_diarias": int(diarias),
+                "total_vagas": int(vagas),
+                "inscricoes_confirmadas": int(confirmadas),
+                "inscricoes_efetivas": int(efetivas),
+                "total_presencas": int(presencas),
+                "valor_total": valor,
+                "calculado_em": calculado_em,
+            }
+            for dia, empresa_id, diarias, vagas, confirmadas, efetivas, presencas, valor in query.all()
+        ]
+
+    def contagens_do_dia(self, dia: date) -> dict:
+        """Diárias do dia e diárias abertas a partir do dia."""
+        diarias_dia, abertas = self.db.query(
+            func.coalesce(func.sum(case((Diaria.data == dia, 1), else_=0)), 0),
+            func.coalesce(
+                func.sum(
+                    case(
+                        ((Diaria.status == StatusDiaria.ABERTA) & (Diaria.data >= dia), 1),
+                        else_=0,
+                    )
+                ),
+                0,
+            ),
+        ).filter(Diaria.data >= dia).one()
+
+        return {"diarias_hoje": int(diarias_dia), "diarias_abertas": int(abertas)}
+
+    def contagens_colaboradores(self) -> dict:
+        """Colaboradores ativos e bloqueados."""
+        ativos, bloqueados = self.db.query(
+            func.coalesce(func.sum(case((Pessoa.ativo == True, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Pessoa.bloqueado == True, 1), else_=0)), 0),
+        ).filter(Pessoa.tipo_pessoa == TipoPessoa.COLABORADOR).one()
+
+        return {"total_colaboradores": int(ativos), "colaboradores_bloqueados": int(bloqueados)}
+
+    def frequencia_por_colaborador(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        classificacao: Optional[str] = None,
+        ordenar_por: str = "taxa",
+        decrescente: bool = True,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], int, float]:
+        """
+        Frequência (confirmadas x presenças) por colaborador ativo no período.
+
+        Retorna (página, total de colaboradores filtrados, média da taxa).
+        """
+        efetivas = func.sum(
+            case(
+                (Inscricao.status.in_([StatusInscricao.CONFIRMADA, StatusInscricao.CONCLUIDA]), 1),
+                else_=0,
+            )
+        )
+        # Presenças agregadas por inscrição antes do GROUP BY por pessoa: com o join direto,
+        # uma inscrição com mais de um registro seria contada como confirmada mais de uma vez
+        presencas_inscricao = (
+            self.db.query(
+                RegistroPresenca.inscricao_id.label("inscricao_id"),
+                func.count(RegistroPresenca.id).label("presencas"),
+            )
+            .group_by(RegistroPresenca.inscricao_id)
+            .subquery()
+        )
+        por_pessoa = (
+            self.db.query(
+                Pessoa.id.label("pessoa_id"),
+                Pessoa.nome.label("nome"),
+                Pessoa.email.label("email"),
+                Pessoa.telefone.label("telefone"),
+                efetivas.label("confirmadas"),
+                func.coalesce(func.sum(presencas_inscricao.c.presencas), 0).label("presencas"),
+            )
+            .join(Inscricao, Inscricao.pessoa_id == Pessoa.id)
+            .join(Diaria, Diaria.id == Inscricao.diaria_id)
+            .outerjoin(presencas_inscricao, presencas_inscricao.c.inscricao_id == Inscricao.id)
+            .filter(Pessoa.tipo_pessoa == TipoPessoa.COLABORADOR, Pessoa.ativo == True)
+        )
+        por_pessoa = self._filtrar_periodo(por_pessoa, data_inicio, data_fim)
+        por_pessoa = por_pessoa.group_by(Pessoa.id, Pessoa.nome, Pessoa.email, Pessoa.telefone).subquery()
+
+        # literal numérico mantém a divisão em NUMERIC no PostgreSQL (round(numeric, int))
+        taxa = func.round(
+            por_pessoa.c.presencas * literal_column("100.0") / func.nullif(por_pessoa.c.confirmadas, 0),
+            1,
+        )
+        faltas = case(
+            (por_pessoa.c.confirmadas > por_pessoa.c.presencas, por_pessoa.c.confirmadas - por_pessoa.c.presencas),
+            else_=0,
+        )
+        classificacao_col = classificacao_expr(taxa)
+
+        filtros = [por_pessoa.c.confirmadas > 0]  # Só mostra quem teve inscrições
+        if classificacao:
+            filtros.append(classificacao_col == classificacao)
+
+        total, media = (
+            self.db.query(func.count(), func.avg(taxa))
+            .select_from(por_pessoa)
+            .filter(*filtros)
+            .one()
+        )
+
+        colunas_ordenacao = {
+            "taxa": taxa,
+            "nome": por_pessoa.c.nome,
+            "confirmadas": por_pessoa.c.confirmadas,
+            "presencas": por_pessoa.c.presencas,
+            "faltas": faltas,
+        }
+        coluna = colunas_ordenacao[ordenar_por]
+        query = (
+            self.db.query(
+                por_pessoa.c.pessoa_id,
+                por_pessoa.c.nome,
+                por_pessoa.c.email,
+                por_pessoa.c.telefone,
+                por_pessoa.c.confirmadas,
+                por_pessoa.c.presencas,
+                faltas,
+                taxa,
+                classificacao_col,
+            )
+            .filter(*filtros)
+            .order_by(coluna.desc() if decrescente else coluna.asc(), por_pessoa.c.pessoa_id)
+            .offset(skip)
+        )
+        if limit:
+            query = query.limit(limit)
+
+        pagina = [
+            {
+                "colaborador_id": pessoa_id,
+                "nome": nome,
+                "email": email,
+                "telefone": telefone,
+                "total_confirmadas": int(confirmadas),
+                "total_presencas": int(presencas),
+                "total_faltas": int(total_faltas),
+                "taxa_comparecimento": float(taxa_valor),
+                "classificacao": classificacao_valor,
+            }
+            for (
+                pessoa_id, nome, email, telefone, confirmadas, presencas,
+                total_faltas, taxa_valor, classificacao_valor,
+            ) in query.all()
+        ]
+        return pagina, total, float(media or 0)
+
+    # ========== Demanda x oferta ==========
+
+    def demanda_oferta(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+    ) -> dict:
+        """Vagas x inscrições ativas: resumo, por empresa e por dia da semana (dow do SQL)."""
+        filtros = self._filtros_periodo(data_inicio, data_fim)
+        insc = self._inscricoes_por_diaria(*filtros)
+        ativas = func.coalesce(insc.c.ativas, 0)
+        restantes = Diaria.vagas - ativas
+
+        def _base(*colunas):
+            query = (
+                self.db.query(*colunas)
+                .select_from(Diaria)
+                .outerjoin(insc, insc.c.diaria_id == Diaria.id)
+            )
+            return query.filter(*filtros)
+
+        total_diarias, vagas, inscricoes, nao_preenchidas, lotadas = _base(
+            func.count(Diaria.id),
+            func.coalesce(func.sum(Diaria.vagas), 0),
+            func.coalesce(func.sum(ativas), 0),
+            func.coalesce(func.sum(case((restantes > 0, restantes), else_=0)), 0),
+            func.coalesce(func.sum(case((restantes <= 0, 1), else_=0)), 0),
+        ).one()
+
+        por_empresa = (
+            _base(
+                Empresa.nome,
+                func.sum(Diaria.vagas),
+                func.coalesce(func.sum(ativas), 0),
+            )
+            .join(Empresa, Empresa.id == Diaria.empresa_id)
+            .group_by(Empresa.nome)
+            .all()
+        )
+
+        dow = extract("dow", Diaria.data)
+        por_dow = _base(
+            dow,
+            func.sum(Diaria.vagas),
+            func.coalesce(func.sum(ativas), 0),
+        ).group_by(dow).all()
+
+        return {
+            "total_diarias": total_diarias,
+            "total_vagas": int(vagas),
+            "total_inscricoes": int(inscricoes),
+            "vagas_nao_preenchidas": int(nao_preenchidas),
+            "diarias_lotadas": int(lotadas),
+            "por_empresa": [
+                {"empresa": nome, "vagas": int(v), "inscricoes": int(i)}
+                for nome, v, i in por_empresa
+            ],
+            # dow: 0 = domingo ... 6 = sábado
+            "por_dow": {int(d): {"vagas": int(v), "inscricoes": int(i)} for d, v, i in por_dow},
+        }
+
+    # ========== Transporte fretado ==========
+
+    def colaboradores_por_ponto(self) -> List[dict]:
+        """Colaboradores ativos por ponto de parada das rotas ativas."""
+        from app.models.rota import PontoParada, Rota
+
+        query = (
+            self.db.query(
+                PontoParada.id,
+                PontoParada.rota_id,
+                PontoParada.nome,
+                PontoParada.endereco,
+                func.count(Pessoa.id),
+            )
+            .join(Rota, Rota.id == PontoParada.rota_id)
+            .outerjoin(
+                Pessoa,
+                (Pessoa.ponto_parada_id == PontoParada.id)
+                & (Pessoa.tipo_pessoa == TipoPessoa.COLABORADOR)
+                & (Pessoa.ativo == True),
+            )
+            .filter(Rota.ativo == True)
+            .group_by(PontoParada.id, PontoParada.rota_id, PontoParada.nome, PontoParada.endereco)
+        )
+
+        return [
+            {
+                "ponto_id": ponto_id,
+                "rota_id": rota_id,
+                "nome": nome,
+                "endereco": endereco,
+                "colaboradores": colaboradores,
+            }
+            for ponto_id, rota_id, nome, endereco, colaboradores in query.all()
+        ]
@@ -1,8 +1,11 @@
 from typing import Optional, List
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.models.alocacao import AlocacaoDiaria
+from app.models.diaria import Diaria
 from app.models.veiculo import Veiculo
+from app.repositories.paginacao import Contagem, Pagina, paginar
 from app.schemas.veiculo import VeiculoCreate, VeiculoUpdate
 
 
@@ -61,3 +64,25 @@ class VeiculoRepository:
         from sqlalchemy import func
         result = self.db.query(func.sum(Veiculo.capacidade)).filter(Veiculo.ativo == True).scalar()
         return result or 0
+
+    def listar_alocacoes(
+        self,
+        veiculo_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        contagem: Optional[Contagem] = None,
+    ) -> Pagina[AlocacaoDiaria]:
+        """Alocações do veículo com diária, empresa e colaboradores, paginando por (data da diária, id)."""
+        query = (
+            self.db.query(AlocacaoDiaria)
+            .join(Diaria, AlocacaoDiaria.diaria_id == Diaria.id)
+            .options(
+                joinedload(AlocacaoDiaria.diaria).joinedload(Diaria.empresa),
+                selectinload(AlocacaoDiaria.colaboradores),
+            )
+            .filter(AlocacaoDiaria.veiculo_id == veiculo_id)
+        )
+        return paginar(
+            query, (Diaria.data, AlocacaoDiaria.id), cursor, limit, descendente=True, contagem=contagem,
+            chave=lambda alocacao: (alocacao.diaria.data, alocacao.id),
+        )
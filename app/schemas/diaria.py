@@ -146,9 +146,11 @@ class DiariaComInscricoes(DiariaComEmpresa):
 
 
 class DiariaList(BaseModel):
-    """Schema para listagem de Diárias."""
+    """Schema para listagem de Diárias (total só quando pedido; next_cursor busca a próxima página)."""
 
-    total: int
+    total: Optional[int] = None
+    total_estimado: bool = False
+    next_cursor: Optional[str] = None
     diarias: List[DiariaComEmpresa]
 
 
@@ -96,9 +96,11 @@ class BloquearPessoa(BaseModel):
 
 
 class PessoaList(BaseModel):
-    """Schema para listagem de Pessoas."""
+    """Schema para listagem de Pessoas (total só quando pedido; next_cursor busca a próxima página)."""
 
-    total: int
+    total: Optional[int] = None
+    total_estimado: bool = False
+    next_cursor: Optional[str] = None
     pessoas: List[PessoaResponse]
 
 
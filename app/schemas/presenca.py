@@ -77,4 +77,5 @@ class PresencaDiariaResponse(BaseModel):
     total_presentes: int
     inscritos: List[InscritoPresenca]  # Todos os inscritos
     presencas: List[RegistroPresencaResponse]  # Apenas registrados (retrocompat)
+    sincronizado_em: Optional[datetime] = None  # Usar como `since` no próximo polling
 
@@ -0,0 +1,34 @@
+"""Schemas para Jobs assíncronos de relatório."""
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import StatusRelatorioJob
+
+
+class RelatorioJobCreate(BaseModel):
+    """Especificação de um relatório a ser executado em background."""
+
+    tipo: str = Field(..., description="Relatório (ex.: diarias, empresas, frequencia-colaborador)")
+    parametros: Dict[str, Any] = Field(default_factory=dict, description="Mesmos query params do endpoint")
+    formato: Literal["json", "csv", "ndjson"] = "json"
+
+
+class RelatorioJobResponse(BaseModel):
+    """Schema de resposta com o estado do job."""
+
+    id: str
+    tipo: str
+    parametros: Dict[str, Any]
+    formato: str
+    status: StatusRelatorioJob
+    progresso: int
+    erro: Optional[str] = None
+    tamanho_bytes: Optional[int] = None
+    criado_em: datetime
+    iniciado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
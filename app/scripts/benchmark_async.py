@@ -0,0 +1,166 @@
+"""Benchmark: endpoint de leitura síncrono (threadpool) x assíncrono (AsyncSession).
+
+Sobe em processo (ASGI) duas versões de /diarias/disponiveis sobre o mesmo
+SQLite descartável, com latência de rede simulada em cada consulta, e mede a
+vazão com níveis crescentes de concorrência. A versão síncrona ocupa um dos
+tokens do threadpool do anyio (40 por padrão) enquanto espera o banco; a
+assíncrona não ocupa thread nenhuma e fica limitada só pelo pool de conexões.
+
+Requisições que falham (ex.: timeout esperando conexão do pool, quando o
+fechamento das sessões síncronas fica na fila do threadpool) são contadas
+na coluna de erros.
+
+Uso:
+    python -m app.scripts.benchmark_async
+    python -m app.scripts.benchmark_async --latencia-ms 20 --requisicoes 400 --pool 64
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Tuple
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.models  # noqa: F401
+from app.api.v1.endpoints.diarias import list_disponiveis
+from app.core.deps import get_async_db, get_db
+from app.db.base import Base
+from app.models.diaria import Diaria
+from app.models.empresa import Empresa
+from app.schemas.diaria import DiariaList
+from app.services.diaria_service import DiariaService
+
+NIVEIS_CONCORRENCIA = (1, 16, 64, 128)
+
+
+def conexao_com_latencia(latencia_ms: float):
+    """Classe de conexão sqlite3 cujo execute espera `latencia_ms` (simula a rede).
+
+    A espera precisa acontecer na thread da conexão: um listener
+    before_cursor_execute na engine assíncrona rodaria no event loop e o
+    bloquearia. O aiosqlite executa o cursor na sua própria thread.
+    """
+
+    class CursorLento(sqlite3.Cursor):
+        def execute(self, *args, **kwargs):
+            time.sleep(latencia_ms / 1000)
+            return super().execute(*args, **kwargs)
+
+    class ConexaoLenta(sqlite3.Connection):
+        def cursor(self, factory=CursorLento):
+            return super().cursor(factory)
+
+    return ConexaoLenta
+
+
+def criar_ambiente(diretorio: str, latencia_ms: float, pool: int, pool_timeout: float = 5):
+    """Banco SQLite em arquivo com 20 diárias abertas; retorna (engine, async_engine)."""
+    caminho = os.path.join(diretorio, "benchmark.db")
+    with create_engine(f"sqlite:///{caminho}").connect() as conexao:
+        Base.metadata.create_all(bind=conexao)
+        conexao.commit()
+        with Session(bind=conexao) as db:
+            empresa = Empresa(nome="Benchmark", cnpj="00.000.000/0001-00")
+            db.add(empresa)
+            db.flush()
+            db.add_all([
+                Diaria(titulo=f"Diária {n}", data=date.today() + timedelta(days=n), vagas=10, empresa_id=empresa.id)
+                for n in range(20)
+            ])
+            db.commit()
+
+    connect_args = {"check_same_thread": False, "factory": conexao_com_latencia(latencia_ms)}
+    opcoes_pool = {"pool_size": pool, "max_overflow": 0, "pool_timeout": pool_timeout}
+    engine = create_engine(f"sqlite:///{caminho}", connect_args=connect_args, **opcoes_pool)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{caminho}", connect_args=connect_args, **opcoes_pool)
+    return engine, async_engine
+
+
+def criar_app(engine, async_engine) -> FastAPI:
+    """/sync usa DiariaService na sessão síncrona; /async é o endpoint real com AsyncSession."""
+    SessionBenchmark = sessionmaker(bind=engine, autoflush=False)
+    AsyncSessionBenchmark = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_db_benchmark():
+        db = SessionBenchmark()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db_benchmark():
+        async with AsyncSessionBenchmark() as db:
+            yield db
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = get_db_benchmark
+    app.dependency_overrides[get_async_db] = get_async_db_benchmark
+
+    @app.get("/sync", response_model=DiariaList)
+    def disponiveis_sync(db: Session = Depends(get_db)):
+        return DiariaService(db).list_disponiveis()
+
+    @app.get("/async", response_model=DiariaList)
+    async def disponiveis_async(db: AsyncSession = Depends(get_async_db)):
+        return await list_disponiveis(skip=0, limit=100, db=db)
+
+    return app
+
+
+async def medir_vazao(cliente: httpx.AsyncClient, url: str, concorrencia: int, total: int) -> Tuple[float, int]:
+    """Dispara `total` requisições com `concorrencia` clientes simultâneos; retorna (req/s ok, erros)."""
+    fila = iter(range(total))
+    erros = 0
+
+    async def trabalhador():
+        nonlocal erros
+        for _ in fila:
+            resposta = await cliente.get(url)
+            if resposta.status_code != 200:
+                erros += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    return (total - erros) / (time.perf_counter() - inicio), erros
+
+
+async def executar(args) -> None:
+    diretorio = tempfile.mkdtemp(prefix="benchmark_async_")
+    engine, async_engine = criar_ambiente(diretorio, args.latencia_ms, args.pool, args.pool_timeout)
+    transporte = httpx.ASGITransport(app=criar_app(engine, async_engine), raise_app_exceptions=False)
+
+    print(f"{'concorrência':>12} | {'sync req/s':>10} | {'erros':>5} | {'async req/s':>11} | {'erros':>5}", flush=True)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark", timeout=120) as cliente:
+        for concorrencia in NIVEIS_CONCORRENCIA:
+            vazao_sync, erros_sync = await medir_vazao(cliente, "/sync", concorrencia, args.requisicoes)
+            vazao_async, erros_async = await medir_vazao(cliente, "/async", concorrencia, args.requisicoes)
+            print(
+                f"{concorrencia:>12} | {vazao_sync:>10.1f} | {erros_sync:>5} | {vazao_async:>11.1f} | {erros_async:>5}",
+                flush=True,
+            )
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencia-ms", type=float, default=10, help="Latência simulada por consulta")
+    parser.add_argument("--requisicoes", type=int, default=400, help="Requisições por nível de concorrência")
+    parser.add_argument("--pool", type=int, default=64, help="Conexões em cada pool (sync e async)")
+    parser.add_argument("--pool-timeout", type=float, default=5, help="Espera máxima por conexão do pool (s)")
+    args = parser.parse_args()
+    asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
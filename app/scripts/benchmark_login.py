@@ -0,0 +1,169 @@
+"""Benchmark de login: bcrypt inline x pool dedicado de hashing.
+
+Sobe em processo (ASGI) duas rotas de login sobre um SQLite descartável:
+`/login-inline` reproduz a verificação bcrypt inline na thread da requisição;
+`/api/v1/auth/login` é a rota real, que usa o pool de hashing
+(PASSWORD_HASH_WORKERS / PASSWORD_HASH_MAX_PENDING). Para cada nível de
+concorrência mede a vazão de logins e, em paralelo, a latência de uma rota
+leve (`/ping`), que mostra o quanto o pico de logins atrapalha o resto da API.
+
+Uso:
+    python -m app.scripts.benchmark_login
+    python -m app.scripts.benchmark_login --rounds 12 --logins 64 --workers 2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from passlib.context import CryptContext
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.models  # noqa: F401
+from app.api.v1.endpoints import auth
+from app.core import security
+from app.core.config import settings
+from app.core.deps import get_db
+from app.core.password_hasher import PasswordHasherPool
+from app.core.rate_limit import rate_limit_auth
+from app.db.base import Base
+from app.models.enums import TipoPessoa
+from app.models.pessoa import Pessoa
+from app.repositories.pessoa_repository import PessoaRepository
+
+NIVEIS_CONCORRENCIA = (8, 32, 64)
+SENHA = "senha-benchmark"
+
+
+def criar_ambiente(diretorio: str, usuarios: int):
+    """Banco SQLite em arquivo com `usuarios` pessoas que têm a mesma senha."""
+    engine = create_engine(
+        f"sqlite:///{os.path.join(diretorio, 'login.db')}",
+        connect_args={"check_same_thread": False},
+        pool_size=64,
+        max_overflow=0,
+    )
+    Base.metadata.create_all(bind=engine)
+    senha_hash = security.pwd_context.hash(SENHA)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all([
+            Pessoa(nome=f"U{n}", email=f"u{n}@example.com", cpf=f"b{n}", tipo_pessoa=TipoPessoa.COLABORADOR,
+                   senha_hash=senha_hash)
+            for n in range(usuarios)
+        ])
+        db.commit()
+    return engine
+
+
+def criar_app(engine) -> FastAPI:
+    SessionBenchmark = sessionmaker(bind=engine, autoflush=False)
+
+    def get_db_benchmark():
+        db = SessionBenchmark()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/v1/auth")
+    app.dependency_overrides[get_db] = get_db_benchmark
+    app.dependency_overrides[rate_limit_auth] = lambda: None
+
+    @app.post("/login-inline")
+    def login_inline(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+        user = PessoaRepository(db).get_by_email(form_data.username)
+        if not user or not security.pwd_context.verify(form_data.password, user.senha_hash):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def medir(cliente: httpx.AsyncClient, url: str, concorrencia: int, total: int, usuarios: int):
+    """Dispara `total` logins com `concorrencia` clientes e mede /ping em paralelo.
+
+    Retorna (logins/s, recusados, p50 /ping ms, p95 /ping ms).
+    """
+    fila = iter(range(total))
+    recusados = 0
+    latencias_ping: List[float] = []
+    terminou = asyncio.Event()
+
+    async def trabalhador():
+        nonlocal recusados
+        for n in fila:
+            resposta = await cliente.post(url, data={"username": f"u{n % usuarios}@example.com", "password": SENHA})
+            if resposta.status_code == 503:
+                recusados += 1
+            else:
+                resposta.raise_for_status()
+
+    async def sonda():
+        while not terminou.is_set():
+            inicio = time.perf_counter()
+            (await cliente.get("/ping")).raise_for_status()
+            latencias_ping.append((time.perf_counter() - inicio) * 1000)
+            await asyncio.sleep(0.02)
+
+    tarefa_sonda = asyncio.create_task(sonda())
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+    terminou.set()
+    await tarefa_sonda
+
+    quantis = statistics.quantiles(latencias_ping, n=20) if len(latencias_ping) > 1 else latencias_ping * 19
+    return (total - recusados) / duracao, recusados, statistics.median(latencias_ping), quantis[18]
+
+
+async def executar(args) -> None:
+    diretorio = tempfile.mkdtemp(prefix="benchmark_login_")
+    engine = criar_ambiente(diretorio, args.logins)
+    transporte = httpx.ASGITransport(app=criar_app(engine))
+
+    print(f"{'modo':>6} | {'concorrência':>12} | {'logins/s':>8} | {'503':>4} | {'ping p50':>8} | {'ping p95':>8}", flush=True)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark", timeout=300) as cliente:
+        for concorrencia in NIVEIS_CONCORRENCIA:
+            for modo, url in (("inline", "/login-inline"), ("pool", "/api/v1/auth/login")):
+                vazao, recusados, p50, p95 = await medir(cliente, url, concorrencia, args.logins, args.logins)
+                print(
+                    f"{modo:>6} | {concorrencia:>12} | {vazao:>8.1f} | {recusados:>4} | {p50:>8.1f} | {p95:>8.1f}",
+                    flush=True,
+                )
+
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS, help="Custo do bcrypt")
+    parser.add_argument("--logins", type=int, default=64, help="Logins por nível de concorrência")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS, help="Workers do pool de hashing")
+    parser.add_argument("--max-pendentes", type=int, default=settings.PASSWORD_HASH_MAX_PENDING, help="Limite da fila")
+    args = parser.parse_args()
+
+    security.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+    pool = PasswordHasherPool(max_workers=args.workers, max_pendentes=args.max_pendentes)
+    security.password_hasher = pool
+    auth.password_hasher = pool
+    try:
+        asyncio.run(executar(args))
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Benchmark dos relatórios financeiros sobre uma massa sintética.
+
+Gera diárias, inscrições e presenças em um banco descartável (SQLite em
+memória por padrão) e mede tempo e número de queries de /relatorios/diarias e
+/relatorios/empresas para períodos crescentes.
+
+Uso:
+    python -m app.scripts.benchmark_relatorios
+    python -m app.scripts.benchmark_relatorios --diarias 5000 --inscricoes 100000
+    python -m app.scripts.benchmark_relatorios --database-url postgresql://.../alpha_bench
+
+ATENÇÃO: com --database-url as tabelas são criadas e apagadas no banco
+informado. Nunca aponte para o banco de produção.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.db.base import Base
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.repositories.diaria_repository import DiariaRepository
+
+
+def _criar_engine(database_url: str):
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(database_url)
+
+
+def popular_massa(db, total_diarias: int, total_inscricoes: int, dias: int, inicio: date) -> Pessoa:
+    """Insere a massa sintética em lote (bulk insert)."""
+    rnd = random.Random(42)
+    total_pessoas = max(1, total_inscricoes // max(1, total_diarias // dias))
+
+    admin = Pessoa(nome="Admin Bench", email="admin@bench.local", cpf="bench-admin", tipo_pessoa=TipoPessoa.ADMIN)
+    db.add(admin)
+    db.flush()
+
+    db.execute(insert(Empresa), [
+        {"nome": f"Empresa {i}", "cnpj": f"bench-{i}"} for i in range(20)
+    ])
+    db.execute(insert(Pessoa), [
+        {
+            "nome": f"Colaborador {i}",
+            "email": f"colab{i}@bench.local",
+            "cpf": f"bench-{i}",
+            "tipo_pessoa": TipoPessoa.COLABORADOR,
+        }
+        for i in range(total_pessoas)
+    ])
+    empresa_ids = [e.id for e in db.query(Empresa.id)]
+    pessoa_ids = [p.id for p in db.query(Pessoa.id).filter(Pessoa.tipo_pessoa == TipoPessoa.COLABORADOR)]
+
+    db.execute(insert(Diaria), [
+        {
+            "titulo": f"Diaria {i}",
+            "data": inicio + timedelta(days=i % dias),
+            "vagas": 30,
+            "valor": Decimal("120.00"),
+            "empresa_id": rnd.choice(empresa_ids),
+        }
+        for i in range(total_diarias)
+    ])
+    diaria_ids = [d.id for d in db.query(Diaria.id)]
+
+    inscricoes = []
+    por_diaria = max(1, total_inscricoes // total_diarias)
+    for diaria_id in diaria_ids:
+        for pessoa_id in rnd.sample(pessoa_ids, min(por_diaria, len(pessoa_ids))):
+            inscricoes.append({
+                "diaria_id": diaria_id,
+                "pessoa_id": pessoa_id,
+                "status": StatusInscricao.CONFIRMADA,
+            })
+    db.execute(insert(Inscricao), inscricoes)
+
+    inscricao_ids = [i.id for i in db.query(Inscricao.id)]
+    db.execute(insert(RegistroPresenca), [
+        {"foto_url": "bench.jpg", "inscricao_id": inscricao_id, "registrado_por_id": admin.id}
+        for inscricao_id in inscricao_ids
+        if rnd.random() < 0.8
+    ])
+    db.commit()
+
+    # Bulk insert não passa pelos eventos do ORM: recalcula os contadores das diárias
+    DiariaRepository(db).reconciliar_contadores()
+    return admin
+
+
+def medir(db, funcao, **kwargs) -> tuple:
+    """Executa o relatório e retorna (queries, tempo_ms)."""
+    contador = {"queries": 0}
+
+    def _on_execute(*_args):
+        contador["queries"] += 1
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    inicio = time.perf_counter()
+    try:
+        funcao(db=db, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+    return contador["queries"], (time.perf_counter() - inicio) * 1000
+
+
+def main() -> None:
+    from app.api.v1.endpoints.relatorios import relatorio_diarias, relatorio_por_empresa
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--diarias", type=int, default=5000)
+    parser.add_argument("--inscricoes", type=int, default=100000)
+    parser.add_argument("--dias", type=int, default=365, help="Dias cobertos pela massa")
+    args = parser.parse_args()
+
+    engine = _criar_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    inicio = date.today() - timedelta(days=args.dias)
+
+    try:
+        print(f"Populando {args.diarias} diárias / ~{args.inscricoes} inscrições...")
+        admin = popular_massa(db, args.diarias, args.inscricoes, args.dias, inicio)
+
+        print(f"{'período':>10} | {'relatório':<10} | {'queries':>7} | {'tempo (ms)':>10}")
+        for periodo in (7, 30, 90, args.dias):
+            fim = inicio + timedelta(days=periodo - 1)
+            filtros = {"data_inicio": inicio, "data_fim": fim, "current_user": admin}
+            for nome, funcao, extras in (
+                ("diarias", relatorio_diarias, {"empresa_id": None, "status": None}),
+                ("empresas", relatorio_por_empresa, {}),
+            ):
+                queries, tempo_ms = medir(db, funcao, **filtros, **extras)
+                print(f"{periodo:>8} d | {nome:<10} | {queries:>7} | {tempo_ms:>10.1f}")
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Teste de carga da cadeia de autenticação (get_current_user + permissões).
+
+Sobe a API em processo (ASGI) sobre um SQLite descartável com latência de rede
+simulada em cada consulta e dispara requisições autenticadas com níveis
+crescentes de concorrência. Com as dependências de autenticação rodando no
+threadpool, a vazão cresce com a concorrência; se elas bloqueassem o event
+loop, ficaria estável em ~1 / latência.
+
+Uso:
+    python -m app.scripts.load_test_auth
+    python -m app.scripts.load_test_auth --latencia-ms 20 --requisicoes 400
+    python -m app.scripts.load_test_auth --fast-path   # com o fast path do JWT
+    python -m app.scripts.load_test_auth --url http://localhost:8000/api/v1/pessoas/me --token <jwt>
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.config import settings
+from app.core.deps import get_db
+from app.core.permissions import require_authenticated
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.models.enums import TipoPessoa
+from app.models.pessoa import Pessoa
+
+NIVEIS_CONCORRENCIA = (1, 4, 16, 32)
+
+
+def criar_ambiente(diretorio: str, latencia_ms: float):
+    """Banco SQLite em arquivo com latência simulada e um usuário; retorna (engine, token)."""
+    engine = create_engine(
+        f"sqlite:///{os.path.join(diretorio, 'carga.db')}",
+        connect_args={"check_same_thread": False},
+        pool_size=64,
+        max_overflow=0,
+    )
+    Base.metadata.create_all(bind=engine)
+
+    with sessionmaker(bind=engine)() as db:
+        pessoa = Pessoa(nome="Carga", email="carga@example.com", cpf="carga", tipo_pessoa=TipoPessoa.COLABORADOR)
+        db.add(pessoa)
+        db.commit()
+        token = create_access_token({
+            "sub": str(pessoa.id),
+            "nome": pessoa.nome,
+            "tipo_pessoa": pessoa.tipo_pessoa.value,
+            "perfis": [],
+            "av": pessoa.auth_version,
+        })
+
+    if latencia_ms:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _latencia(*_args):
+            time.sleep(latencia_ms / 1000)
+
+    return engine, token
+
+
+def criar_app(engine) -> FastAPI:
+    """App mínima: a rota é async e só as dependências de autenticação acessam o banco."""
+    SessionCarga = sessionmaker(bind=engine, autoflush=False)
+
+    def get_db_carga():
+        db = SessionCarga()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = get_db_carga
+
+    @app.get("/me")
+    async def me(current_user: Pessoa = Depends(require_authenticated())):
+        return {"id": current_user.id}
+
+    return app
+
+
+async def medir_vazao(cliente: httpx.AsyncClient, url: str, token: str, concorrencia: int, total: int) -> float:
+    """Dispara `total` requisições com `concorrencia` clientes simultâneos; retorna req/s."""
+    fila = iter(range(total))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def trabalhador():
+        for _ in fila:
+            resposta = await cliente.get(url, headers=headers)
+            resposta.raise_for_status()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    return total / (time.perf_counter() - inicio)
+
+
+async def executar(args) -> None:
+    if args.url:
+        cliente = httpx.AsyncClient(timeout=60)
+        url, token = args.url, args.token
+        diretorio = None
+    else:
+        diretorio = tempfile.mkdtemp(prefix="load_test_auth_")
+        engine, token = criar_ambiente(diretorio, args.latencia_ms)
+        cliente = httpx.AsyncClient(transport=httpx.ASGITransport(app=criar_app(engine)), base_url="http://carga")
+        url = "/me"
+
+    print(f"{'concorrência':>12} | {'req/s':>8}")
+    async with cliente:
+        for concorrencia in NIVEIS_CONCORRENCIA:
+            vazao = await medir_vazao(cliente, url, token, concorrencia, args.requisicoes)
+            print(f"{concorrencia:>12} | {vazao:>8.1f}")
+
+    if diretorio:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Endpoint autenticado de um servidor em execução")
+    parser.add_argument("--token", help="JWT usado com --url")
+    parser.add_argument("--latencia-ms", type=float, default=10, help="Latência simulada por consulta (modo local)")
+    parser.add_argument("--requisicoes", type=int, default=200, help="Requisições por nível de concorrência")
+    parser.add_argument("--fast-path", action="store_true", help="Mantém o fast path do JWT habilitado")
+    args = parser.parse_args()
+
+    if args.url and not args.token:
+        parser.error("--url exige --token")
+    if not args.fast_path:
+        # Sem o fast path toda requisição consulta o banco
+        settings.AUTH_FAST_PATH_ENABLED = False
+
+    asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
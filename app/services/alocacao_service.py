@@ -8,6 +8,7 @@ from typing import List, Dict, Optional, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.deadline import PrazoEsgotado
 from app.models.alocacao import AlocacaoDiaria, AlocacaoColaborador
 from app.models.diaria import Diaria, Inscricao
 from app.models.veiculo import Veiculo
@@ -339,6 +340,8 @@ class AlocacaoService:
 
                         if directions.get("success"):
                             minutos_viagem = directions["duracao_total_minutos"]
+                    except PrazoEsgotado:
+                        raise
                     except Exception as e:
                         print(f"Google Maps API error: {e}")
                         # Usa tempo padrão em caso de falha
@@ -377,26 +380,27 @@ class AlocacaoService:
             .all()
         )
 
-        resultado = []
-        for aloc in alocacoes:
-            diaria = aloc.alocacao_diaria.diaria
-            veiculo = aloc.alocacao_diaria.veiculo
-            ponto = aloc.ponto_parada
-
-            resultado.append(MinhaAlocacaoResponse(
-                diaria_id=diaria.id,
-                diaria_titulo=diaria.titulo,
-                diaria_data=diaria.data.isoformat(),
-                diaria_local=diaria.local,
-                veiculo_placa=veiculo.placa if veiculo else "N/A",
-                veiculo_modelo=veiculo.modelo if veiculo else "N/A",
-                veiculo_cor=veiculo.cor if veiculo else None,
-                motorista=veiculo.motorista if veiculo else None,
-                telefone_motorista=veiculo.telefone_motorista if veiculo else None,
-                ponto_nome=ponto.nome if ponto else None,
-                ponto_endereco=ponto.endereco if ponto else None,
-                horario_estimado=aloc.horario_estimado.strftime("%H:%M") if aloc.horario_estimado else None,
-                ordem_embarque=aloc.ordem_embarque,
-            ))
-
-        return resultado
+        return [self.montar_minha_alocacao(aloc) for aloc in alocacoes]
+
+    @staticmethod
+    def montar_minha_alocacao(aloc: AlocacaoColaborador) -> MinhaAlocacaoResponse:
+        """Monta a resposta de uma alocação (relacionamentos já carregados)."""
+        diaria = aloc.alocacao_diaria.diaria
+        veiculo = aloc.alocacao_diaria.veiculo
+        ponto = aloc.ponto_parada
+
+        return MinhaAlocacaoResponse(
+            diaria_id=diaria.id,
+            diaria_titulo=diaria.titulo,
+            diaria_data=diaria.data.isoformat(),
+            diaria_local=diaria.local,
+            veiculo_placa=veiculo.placa if veiculo else "N/A",
+            veiculo_modelo=veiculo.modelo if veiculo else "N/A",
+            veiculo_cor=veiculo.cor if veiculo else None,
+            motorista=veiculo.motorista if veiculo else None,
+            telefone_motorista=veiculo.telefone_motorista if veiculo else None,
+            ponto_nome=ponto.nome if ponto else None,
+            ponto_endereco=ponto.endereco if ponto else None,
+            horario_estimado=aloc.horario_estimado.strftime("%H:%M") if aloc.horario_estimado else None,
+            ordem_embarque=aloc.ordem_embarque,
+        )
@@ -8,6 +8,7 @@ from app.models.diaria import Diaria, Inscricao
 from app.models.enums import StatusDiaria, StatusInscricao
 from app.repositories.diaria_repository import DiariaRepository, InscricaoRepository
 from app.repositories.empresa_repository import EmpresaRepository
+from app.repositories.paginacao import Contagem
 from app.schemas.diaria import (
     DiariaCreate, DiariaUpdate, DiariaList, DiariaComInscricoes,
     InscricaoCreate, InscricaoUpdate, MinhaInscricao,
@@ -47,13 +48,19 @@ class DiariaService:
         limit: int = 100,
         status: Optional[StatusDiaria] = None,
         empresa_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        contagem: Optional[Contagem] = None,
     ) -> DiariaList:
-        """Lista diárias com filtros (para admin)."""
-        diarias = self.repository.get_all(
-            skip=skip, limit=limit, status=status, empresa_id=empresa_id
+        """Lista diárias com filtros (para admin), paginadas por cursor."""
+        pagina = self.repository.listar(
+            status=status, empresa_id=empresa_id, cursor=cursor, limit=limit, skip=skip, contagem=contagem,
+        )
+        return DiariaList(
+            total=pagina.total,
+            total_estimado=pagina.total_estimado,
+            next_cursor=pagina.next_cursor,
+            diarias=pagina.itens,
         )
-        total = self.repository.count(status=status)
-        return DiariaList(total=total, diarias=diarias)
 
     def list_disponiveis(self, skip: int = 0, limit: int = 100) -> DiariaList:
         """Lista diárias disponíveis para inscrição (para colaboradores)."""
@@ -126,7 +133,7 @@ class InscricaoService:
         if pessoa:
             assert_user_not_blocked(pessoa)
 
-        diaria = self.diaria_repository.get_by_id_with_inscricoes(inscricao_data.diaria_id)
+        diaria = self.diaria_repository.get_by_id(inscricao_data.diaria_id)
 
         if not diaria:
             raise HTTPException(
@@ -6,12 +6,14 @@ import httpx
 from typing import List, Dict, Optional, Tuple
 
 from app.core.config import settings
+from app.core.deadline import PrazoEsgotado, limitar_timeout, prazo_esgotado
 
 
 class GoogleMapsService:
     """Serviço para integração com Google Maps Directions API."""
 
     BASE_URL = "https://maps.googleapis.com/maps/api/directions/json"
+    TIMEOUT = 5.0  # segundos; limitado ao prazo da requisição
 
     def __init__(self):
         self.api_key = settings.GOOGLE_MAPS_API_KEY
@@ -45,9 +47,14 @@ class GoogleMapsService:
             waypoints_str = "|".join([f"{lat},{lng}" for lat, lng in waypoints])
             params["waypoints"] = f"optimize:true|{waypoints_str}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.BASE_URL, params=params)
-            data = response.json()
+        try:
+            async with httpx.AsyncClient(timeout=limitar_timeout(self.TIMEOUT)) as client:
+                response = await client.get(self.BASE_URL, params=params)
+                data = response.json()
+        except httpx.TimeoutException as exc:
+            if prazo_esgotado():
+                raise PrazoEsgotado("Prazo da requisição esgotado aguardando o Google Maps") from exc
+            raise
 
         if data.get("status") != "OK":
             return {
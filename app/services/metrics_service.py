@@ -5,7 +5,7 @@ Armazena métricas em memória para monitoramento em tempo real.
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from threading import Lock
 import statistics
 
@@ -17,6 +17,8 @@ class RequestMetric:
     method: str
     duration_ms: float
     status_code: int
+    db_queries: int = 0
+    db_ms: float = 0.0
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
@@ -40,16 +42,35 @@ class MetricsService:
         self.requests: deque[RequestMetric] = deque(maxlen=1000)
         # Métricas por endpoint
         self.endpoint_stats: Dict[str, List[float]] = {}
+        # SQL por endpoint: (consultas, tempo de banco em ms) das mesmas medições
+        self.endpoint_sql: Dict[str, List[Tuple[int, float]]] = {}
+        # Cache de relatórios: contadores e tempos de cálculo por relatório
+        self.report_cache_stats: Dict[str, Dict[str, int]] = {}
+        self.report_compute_ms: Dict[str, deque] = {}
+        # Rate limiting: requisições permitidas e negadas por limitador
+        self.rate_limit_stats: Dict[str, Dict[str, int]] = {}
+        # Prazos esgotados (504) por endpoint
+        self.deadline_exceeded: Dict[str, int] = {}
         # Lock para thread-safety
         self.lock = Lock()
     
-    def record(self, path: str, method: str, duration_ms: float, status_code: int):
-        """Registra uma nova métrica de requisição."""
+    def record(
+        self,
+        path: str,
+        method: str,
+        duration_ms: float,
+        status_code: int,
+        db_queries: int = 0,
+        db_ms: float = 0.0,
+    ):
+        """Registra uma nova métrica de requisição (com o SQL executado nela)."""
         metric = RequestMetric(
             path=path,
             method=method,
             duration_ms=duration_ms,
             status_code=status_code,
+            db_queries=db_queries,
+            db_ms=db_ms,
         )
         
         with self.lock:
@@ -59,12 +80,74 @@ class MetricsService:
             key = f"{method} {path}"
             if key not in self.endpoint_stats:
                 self.endpoint_stats[key] = []
+                self.endpoint_sql[key] = []
             
             # Mantém últimas 100 medições por endpoint
             if len(self.endpoint_stats[key]) >= 100:
                 self.endpoint_stats[key].pop(0)
+                self.endpoint_sql[key].pop(0)
             self.endpoint_stats[key].append(duration_ms)
+            self.endpoint_sql[key].append((db_queries, db_ms))
     
+    def record_report_cache(self, report: str, outcome: str, compute_ms: Optional[float] = None):
+        """Registra hit/miss/coalesced do cache de relatórios e o tempo de cálculo."""
+        with self.lock:
+            stats = self.report_cache_stats.setdefault(report, {"hit": 0, "miss": 0, "coalesced": 0})
+            stats[outcome] += 1
+            if compute_ms is not None:
+                self.report_compute_ms.setdefault(report, deque(maxlen=100)).append(compute_ms)
+
+    def record_rate_limit(self, limiter: str, allowed: bool):
+        """Registra uma requisição permitida ou negada por um rate limiter."""
+        with self.lock:
+            stats = self.rate_limit_stats.setdefault(limiter, {"allowed": 0, "denied": 0})
+            stats["allowed" if allowed else "denied"] += 1
+
+    def get_rate_limit_stats(self) -> dict:
+        """Retorna contadores de permitidas/negadas por rate limiter."""
+        with self.lock:
+            return {
+                limiter: {**stats, "total": stats["allowed"] + stats["denied"]}
+                for limiter, stats in sorted(self.rate_limit_stats.items())
+            }
+
+    def record_deadline_exceeded(self, endpoint: str):
+        """Registra uma requisição abortada por ter esgotado o prazo."""
+        with self.lock:
+            self.deadline_exceeded[endpoint] = self.deadline_exceeded.get(endpoint, 0) + 1
+
+    def get_deadline_stats(self) -> dict:
+        """Retorna o total e a contagem por endpoint de prazos esgotados."""
+        with self.lock:
+            return {
+                "total": sum(self.deadline_exceeded.values()),
+                "endpoints": dict(sorted(self.deadline_exceeded.items(), key=lambda item: -item[1])),
+            }
+
+    def get_report_cache_stats(self) -> dict:
+        """Retorna estatísticas do cache de relatórios."""
+        with self.lock:
+            reports = []
+            for report, stats in self.report_cache_stats.items():
+                total = stats["hit"] + stats["miss"] + stats["coalesced"]
+                durations = list(self.report_compute_ms.get(report, []))
+                reports.append({
+                    "report": report,
+                    "hits": stats["hit"],
+                    "misses": stats["miss"],
+                    "coalesced": stats["coalesced"],
+                    "hit_rate": round((stats["hit"] + stats["coalesced"]) / total * 100, 1) if total else 0,
+                    "avg_compute_ms": round(statistics.mean(durations), 2) if durations else 0,
+                    "max_compute_ms": round(max(durations), 2) if durations else 0,
+                })
+
+            hits = sum(r["hits"] + r["coalesced"] for r in reports)
+            total = hits + sum(r["misses"] for r in reports)
+            return {
+                "hit_rate": round(hits / total * 100, 1) if total else 0,
+                "reports": sorted(reports, key=lambda r: r["report"]),
+            }
+
     def get_overview(self) -> dict:
         """Retorna visão geral das métricas."""
         with self.lock:
@@ -98,6 +181,8 @@ class MetricsService:
             for endpoint, durations in self.endpoint_stats.items():
                 if not durations:
                     continue
+                queries = [q for q, _ in self.endpoint_sql[endpoint]]
+                db_ms = [ms for _, ms in self.endpoint_sql[endpoint]]
                     
                 result.append({
                     "endpoint": endpoint,
@@ -106,6 +191,9 @@ class MetricsService:
                     "min_ms": round(min(durations), 2),
                     "max_ms": round(max(durations), 2),
                     "p95_ms": round(sorted(durations)[int(len(durations) * 0.95)] if len(durations) >= 2 else durations[0], 2),
+                    "avg_queries": round(statistics.mean(queries), 1),
+                    "max_queries": max(queries),
+                    "avg_db_ms": round(statistics.mean(db_ms), 2),
                 })
             
             # Ordena por média de tempo (mais lentos primeiro)
@@ -122,6 +210,8 @@ class MetricsService:
                     "method": r.method,
                     "duration_ms": round(r.duration_ms, 2),
                     "status_code": r.status_code,
+                    "db_queries": r.db_queries,
+                    "db_ms": round(r.db_ms, 2),
                     "timestamp": r.timestamp.isoformat(),
                 }
                 for r in reversed(requests)
@@ -0,0 +1,150 @@
+"""Exportação em streaming (CSV/NDJSON) dos relatórios de presença."""
+import csv
+import io
+import json
+from datetime import date
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+
+# Quantidade de linhas lidas do cursor do servidor por vez
+YIELD_PER = 1000
+
+CAMPOS_PRESENCA = [
+    "pessoa_id",
+    "nome",
+    "cpf",
+    "email",
+    "telefone",
+    "diaria_id",
+    "titulo",
+    "data",
+    "empresa",
+    "valor",
+    "eh_dsr",
+    "horario_registro",
+]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _query_presencas(
+    db: Session,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    empresa_id: Optional[int] = None,
+):
+    """Linhas planas de presença com empresa já incluída no JOIN."""
+    query = (
+        db.query(
+            Pessoa.id,
+            Pessoa.nome,
+            Pessoa.cpf,
+            Pessoa.email,
+            Pessoa.telefone,
+            Diaria.id,
+            Diaria.titulo,
+            Diaria.data,
+            Empresa.nome,
+            Diaria.valor,
+            RegistroPresenca.horario_registro,
+        )
+        .select_from(RegistroPresenca)
+        .join(Inscricao, RegistroPresenca.inscricao_id == Inscricao.id)
+        .join(Diaria, Inscricao.diaria_id == Diaria.id)
+        .join(Empresa, Diaria.empresa_id == Empresa.id)
+        .join(Pessoa, Inscricao.pessoa_id == Pessoa.id)
+    )
+
+    if data_inicio:
+        query = query.filter(Diaria.data >= data_inicio)
+    if data_fim:
+        query = query.filter(Diaria.data <= data_fim)
+    if empresa_id:
+        query = query.filter(Diaria.empresa_id == empresa_id)
+
+    return query.order_by(Diaria.data.desc(), RegistroPresenca.id.desc())
+
+
+def _iter_linhas(
+    db: Session,
+    progresso: Optional[Callable[[int], None]] = None,
+    **filtros,
+) -> Iterator[dict]:
+    """
+    Itera as presenças via server-side cursor, sem materializar o resultado.
+
+    Se `progresso` for informado, é chamado com o percentual (0-100) a cada
+    YIELD_PER linhas (usado pelos jobs de relatório).
+    """
+    # Sessão própria: a sessão da request pode ser fechada antes do fim do streaming
+    with Session(bind=db.get_bind()) as stream_db:
+        total = _query_presencas(stream_db, **filtros).order_by(None).count() if progresso else 0
+        query = _query_presencas(stream_db, **filtros).yield_per(YIELD_PER)
+        for i, (
+            pessoa_id, nome, cpf, email, telefone,
+            diaria_id, titulo, data, empresa, valor, horario_registro,
+        ) in enumerate(query, 1):
+            if progresso and total and i % YIELD_PER == 0:
+                progresso(int(i * 100 / total))
+            eh_dsr = data.weekday() == 6
+            valor_pagamento = valor * 2 if valor and eh_dsr else valor
+            yield {
+                "pessoa_id": pessoa_id,
+                "nome": nome,
+                "cpf": cpf,
+                "email": email,
+                "telefone": telefone,
+                "diaria_id": diaria_id,
+                "titulo": titulo,
+                "data": str(data),
+                "empresa": empresa,
+                "valor": float(valor_pagamento) if valor_pagamento else None,
+                "eh_dsr": eh_dsr,
+                "horario_registro": horario_registro.isoformat(),
+            }
+
+
+def iter_presencas_csv(
+    db: Session,
+    progresso: Optional[Callable[[int], None]] = None,
+    **filtros,
+) -> Iterator[str]:
+    """Gera o relatório de presenças em CSV, em blocos de YIELD_PER linhas."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CAMPOS_PRESENCA)
+    writer.writeheader()
+
+    for i, linha in enumerate(_iter_linhas(db, progresso, **filtros), 1):
+        writer.writerow(linha)
+        if i % YIELD_PER == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+def iter_presencas_ndjson(
+    db: Session,
+    progresso: Optional[Callable[[int], None]] = None,
+    **filtros,
+) -> Iterator[str]:
+    """Gera o relatório de presenças em NDJSON (um objeto JSON por linha)."""
+    bloco = []
+    for linha in _iter_linhas(db, progresso, **filtros):
+        bloco.append(json.dumps(linha, ensure_ascii=False))
+        if len(bloco) == YIELD_PER:
+            yield "\n".join(bloco) + "\n"
+            bloco = []
+
+    if bloco:
+        yield "\n".join(bloco) + "\n"
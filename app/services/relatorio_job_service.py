@@ -0,0 +1,359 @@
+"""
+Execução assíncrona de relatórios (jobs).
+
+O POST grava o job e o enfileira num pool limitado de threads. O worker
+executa o relatório com sessão própria, grava o resultado compactado (gzip)
+em disco local ou no MinIO e atualiza progresso/status no banco, onde o
+cliente acompanha por polling.
+"""
+import gzip
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from pydantic_core import PydanticUndefined
+from sqlalchemy.orm import Session
+from typing_extensions import Annotated
+
+from app.core.config import settings
+from app.db.session import AnalyticsSessionLocal
+from app.models.enums import StatusRelatorioJob
+from app.models.pessoa import Pessoa
+from app.models.relatorio_job import RelatorioJob
+
+# Parâmetros injetados pelo FastAPI que não fazem parte da especificação do job
+PARAMETROS_INTERNOS = {"db", "current_user"}
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+STATUS_FINAIS = (StatusRelatorioJob.CONCLUIDO, StatusRelatorioJob.ERRO, StatusRelatorioJob.CANCELADO)
+
+# Assinatura do executor: (db, progresso, usuario) -> dict/list (JSON) ou Iterator[str]
+Executor = Callable[[Session, Callable[[int], None], Pessoa], Any]
+
+
+class RelatorioJobCancelado(Exception):
+    """Interrompe a execução quando o cancelamento é solicitado."""
+
+
+class FilaRelatoriosCheia(RuntimeError):
+    """Pool de workers com o máximo de jobs pendentes."""
+
+
+def preparar_parametros(funcao: Callable, parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valida os parâmetros do job contra a assinatura do endpoint do relatório.
+
+    Aplica tipos, restrições e valores padrão dos Query params, como o
+    FastAPI faria numa requisição. Levanta ValueError se inválidos.
+    """
+    assinatura = inspect.signature(funcao)
+    aceitos = set(assinatura.parameters) - PARAMETROS_INTERNOS
+    desconhecidos = set(parametros) - aceitos
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    kwargs = {}
+    for nome, parametro in assinatura.parameters.items():
+        if nome in PARAMETROS_INTERNOS:
+            continue
+
+        campo = parametro.default
+        padrao = getattr(campo, "default", campo)
+        if nome in parametros:
+            tipo = Annotated[parametro.annotation, campo] if hasattr(campo, "metadata") else parametro.annotation
+            try:
+                kwargs[nome] = TypeAdapter(tipo).validate_python(parametros[nome])
+            except Exception as exc:
+                raise ValueError(f"Parâmetro inválido '{nome}': {exc}") from exc
+        elif padrao in (PydanticUndefined, inspect.Parameter.empty, Ellipsis):
+            raise ValueError(f"Parâmetro obrigatório: {nome}")
+        else:
+            kwargs[nome] = padrao
+
+    return kwargs
+
+
+# ========== Armazenamento dos resultados ==========
+
+class ArmazenamentoLocal:
+    """Resultados em disco local."""
+
+    def __init__(self, diretorio: Optional[str] = None):
+        self.diretorio = diretorio or settings.REPORT_JOBS_LOCAL_DIR or os.path.join(
+            tempfile.gettempdir(), "relatorio_jobs"
+        )
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, *chave.split("/"))
+
+    def salvar(self, chave: str, arquivo: str, content_type: str) -> None:
+        destino = self._caminho(chave)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        shutil.move(arquivo, destino)
+
+    def abrir(self, chave: str, tamanho_bloco: int = 64 * 1024) -> Iterator[bytes]:
+        with open(self._caminho(chave), "rb") as arquivo:
+            while bloco := arquivo.read(tamanho_bloco):
+                yield bloco
+
+    def remover(self, chave: str) -> None:
+        try:
+            os.remove(self._caminho(chave))
+        except FileNotFoundError:
+            pass
+
+
+class ArmazenamentoMinio:
+    """Resultados no bucket MinIO do storage_service."""
+
+    def salvar(self, chave: str, arquivo: str, content_type: str) -> None:
+        from app.services.storage_service import storage_service
+        storage_service.upload_file(chave, arquivo, content_type)
+
+    def abrir(self, chave: str) -> Iterator[bytes]:
+        from app.services.storage_service import storage_service
+        return storage_service.iter_file(chave)
+
+    def remover(self, chave: str) -> None:
+        from app.services.storage_service import storage_service
+        storage_service.delete_file(chave)
+
+
+def criar_armazenamento():
+    """Backend de armazenamento conforme REPORT_JOBS_STORAGE."""
+    if settings.REPORT_JOBS_STORAGE.lower() == "minio":
+        return ArmazenamentoMinio()
+    return ArmazenamentoLocal()
+
+
+# ========== Engine ==========
+
+class RelatorioJobService:
+    """Fila de jobs de relatório com pool limitado de workers."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = AnalyticsSessionLocal,
+        max_workers: Optional[int] = None,
+        max_pendentes: Optional[int] = None,
+        armazenamento=None,
+    ):
+        self.session_factory = session_factory
+        self.max_workers = max_workers or settings.REPORT_JOBS_MAX_WORKERS
+        self.max_pendentes = max_pendentes or settings.REPORT_JOBS_MAX_PENDING
+        self.armazenamento = armazenamento or criar_armazenamento()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futuros: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Cria o pool sob demanda."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="relatorio-job")
+        return self._executor
+
+    def submeter(
+        self,
+        db: Session,
+        tipo: str,
+        parametros: Dict[str, Any],
+        formato: str,
+        solicitante_id: int,
+        executar: Executor,
+    ) -> RelatorioJob:
+        """Grava o job e o enfileira. Levanta FilaRelatoriosCheia se o limite foi atingido."""
+        with self._lock:
+            ativos = sum(1 for futuro in self._futuros.values() if not futuro.done())
+            if ativos >= self.max_pendentes:
+                raise FilaRelatoriosCheia("Muitos relatórios em processamento. Tente novamente em instantes.")
+
+            job = RelatorioJob(
+                id=str(uuid.uuid4()),
+                tipo=tipo,
+                parametros=jsonable_encoder(parametros),
+                formato=formato,
+                solicitado_por_id=solicitante_id,
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+
+            self._futuros[job.id] = self._get_executor().submit(self._executar, job.id, executar)
+
+        return job
+
+    def aguardar(self, job_id: str, timeout: Optional[float] = None) -> None:
+        """Bloqueia até o fim do job neste processo (uso em scripts e testes)."""
+        futuro = self._futuros.get(job_id)
+        if futuro is not None:
+            try:
+                futuro.result(timeout=timeout)
+            except Exception:
+                pass
+
+    def cancelar(self, db: Session, job: RelatorioJob) -> RelatorioJob:
+        """
+        Solicita o cancelamento.
+
+        Jobs pendentes são cancelados na hora; jobs em execução param no
+        próximo ponto de verificação de progresso.
+        """
+        job.cancelamento_solicitado = True
+        if job.status == StatusRelatorioJob.PENDENTE:
+            futuro = self._futuros.get(job.id)
+            if futuro is not None:
+                futuro.cancel()
+            job.status = StatusRelatorioJob.CANCELADO
+            job.concluido_em = datetime.utcnow()
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def abrir_resultado(self, job: RelatorioJob) -> Iterator[bytes]:
+        """Blocos do arquivo compactado (gzip) do resultado."""
+        return self.armazenamento.abrir(job.arquivo)
+
+    def limpar_expirados(self, db: Session, horas: Optional[int] = None) -> int:
+        """Remove jobs finalizados (e seus arquivos) mais antigos que a retenção."""
+        limite = datetime.utcnow() - timedelta(hours=horas or settings.REPORT_JOBS_RETENTION_HOURS)
+        expirados = (
+            db.query(RelatorioJob)
+            .filter(RelatorioJob.status.in_(STATUS_FINAIS))
+            .filter(RelatorioJob.criado_em < limite)
+            .all()
+        )
+        for job in expirados:
+            if job.arquivo:
+                self.armazenamento.remover(job.arquivo)
+            db.delete(job)
+        if expirados:
+            db.commit()
+        return len(expirados)
+
+    def marcar_abandonados(self, db: Session, minutos: Optional[int] = None) -> int:
+        """
+        Marca como erro jobs pendentes/em execução há mais que REPORT_JOBS_STALE_MINUTES.
+
+        O pool é em memória: se o processo reinicia, esses jobs nunca terminam
+        e o cliente ficaria em polling para sempre. Jobs deste processo ainda
+        na fila ou executando são preservados.
+        """
+        limite = datetime.utcnow() - timedelta(minutes=minutos or settings.REPORT_JOBS_STALE_MINUTES)
+        with self._lock:
+            locais = [job_id for job_id, futuro in self._futuros.items() if not futuro.done()]
+        query = (
+            db.query(RelatorioJob)
+            .filter(RelatorioJob.status.in_([StatusRelatorioJob.PENDENTE, StatusRelatorioJob.EXECUTANDO]))
+            .filter(RelatorioJob.criado_em < limite)
+        )
+        if locais:
+            query = query.filter(RelatorioJob.id.notin_(locais))
+        marcados = query.update(
+            {
+                RelatorioJob.status: StatusRelatorioJob.ERRO,
+                RelatorioJob.erro: "Job interrompido (processo reiniciado antes da conclusão)",
+                RelatorioJob.concluido_em: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+        if marcados:
+            db.commit()
+        return marcados
+
+    # ========== Worker ==========
+
+    def _atualizar(self, db: Session, job_id: str, **valores) -> None:
+        db.query(RelatorioJob).filter(RelatorioJob.id == job_id).update(valores, synchronize_session=False)
+        db.commit()
+
+    def _executar(self, job_id: str, executar: Executor) -> None:
+        db = self.session_factory()
+        arquivo_tmp = None
+
+        def progresso(percentual: int) -> None:
+            cancelado = (
+                db.query(RelatorioJob.cancelamento_solicitado)
+                .filter(RelatorioJob.id == job_id)
+                .scalar()
+            )
+            if cancelado:
+                raise RelatorioJobCancelado()
+            self._atualizar(db, job_id, progresso=max(0, min(99, percentual)))
+
+        try:
+            job = db.get(RelatorioJob, job_id)
+            if job is None or job.status != StatusRelatorioJob.PENDENTE:
+                return
+            if job.cancelamento_solicitado:
+                raise RelatorioJobCancelado()
+
+            formato = job.formato
+            usuario = db.get(Pessoa, job.solicitado_por_id)
+            self._atualizar(db, job_id, status=StatusRelatorioJob.EXECUTANDO, iniciado_em=datetime.utcnow())
+
+            resultado = executar(db, progresso, usuario)
+            if isinstance(resultado, (dict, list)):
+                # Relatórios JSON não reportam progresso enquanto calculam: verifica antes de gravar
+                progresso(90)
+
+            descritor, arquivo_tmp = tempfile.mkstemp(suffix=".gz")
+            os.close(descritor)
+            with gzip.open(arquivo_tmp, "wt", encoding="utf-8") as saida:
+                if isinstance(resultado, (dict, list)):
+                    json.dump(jsonable_encoder(resultado), saida, ensure_ascii=False)
+                else:
+                    for bloco in resultado:
+                        saida.write(bloco)
+
+            progresso(99)
+            tamanho = os.path.getsize(arquivo_tmp)
+            chave = f"relatorios/{job_id}.{formato}.gz"
+            self.armazenamento.salvar(chave, arquivo_tmp, CONTENT_TYPES[formato])
+
+            self._atualizar(
+                db,
+                job_id,
+                status=StatusRelatorioJob.CONCLUIDO,
+                progresso=100,
+                arquivo=chave,
+                tamanho_bytes=tamanho,
+                concluido_em=datetime.utcnow(),
+            )
+        except RelatorioJobCancelado:
+            db.rollback()
+            self._atualizar(db, job_id, status=StatusRelatorioJob.CANCELADO, concluido_em=datetime.utcnow())
+        except Exception as exc:
+            db.rollback()
+            detalhe = getattr(exc, "detail", None) or str(exc) or exc.__class__.__name__
+            print(f"[RelatorioJob] Job {job_id} falhou: {detalhe}")
+            self._atualizar(
+                db,
+                job_id,
+                status=StatusRelatorioJob.ERRO,
+                erro=str(detalhe)[:1000],
+                concluido_em=datetime.utcnow(),
+            )
+        finally:
+            if arquivo_tmp and os.path.exists(arquivo_tmp):
+                os.remove(arquivo_tmp)
+            db.close()
+            with self._lock:
+                self._futuros.pop(job_id, None)
+
+
+# Instância global: o pool de threads é criado apenas no primeiro job.
+relatorio_job_service = RelatorioJobService()
@@ -0,0 +1,168 @@
+"""
+Cache em memória dos resultados de relatórios.
+
+As entradas são invalidadas pelo watermark dos dados (maior atualizado_em/id
+de diárias, inscrições, presenças, pessoas e empresas, mais a última carga do
+rollup) e requisições idênticas simultâneas são coalescidas em um único
+cálculo (single-flight).
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.services.metrics_service import metrics_service
+
+# Parâmetros do endpoint que não fazem parte da chave do cache
+PARAMETROS_IGNORADOS = {"db", "current_user"}
+
+
+@dataclass
+class _Entrada:
+    watermark: Hashable
+    valor: Any
+    expira_em: float
+
+
+@dataclass
+class _Calculo:
+    """Cálculo em andamento compartilhado entre requisições idênticas."""
+    evento: threading.Event = field(default_factory=threading.Event)
+    valor: Any = None
+    erro: Optional[BaseException] = None
+
+
+def _normalizar(valor: Any) -> Hashable:
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, (list, tuple, set)):
+        return tuple(_normalizar(v) for v in valor)
+    return valor
+
+
+def chave_relatorio(nome: str, parametros: dict) -> Tuple:
+    """
+    Chave estável a partir do nome do relatório e dos parâmetros normalizados.
+
+    Inclui a data atual, pois dashboards usam date.today() como referência.
+    """
+    return (nome, date.today().isoformat()) + tuple(
+        (k, _normalizar(v))
+        for k, v in sorted(parametros.items())
+        if k not in PARAMETROS_IGNORADOS
+    )
+
+
+class ReportCacheService:
+    """Cache LRU com TTL, invalidação por watermark e single-flight."""
+
+    def __init__(self, max_entradas: int = 256, ttl_segundos: Optional[int] = None):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos if ttl_segundos is not None else settings.REPORT_CACHE_TTL_SECONDS
+        self.habilitado = settings.REPORT_CACHE_ENABLED
+        # Tempo máximo que uma requisição espera o cálculo de outra
+        self.espera_max_segundos = 120
+        self._entradas: "OrderedDict[Tuple, _Entrada]" = OrderedDict()
+        self._em_andamento: Dict[Tuple, _Calculo] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, chave: Tuple, watermark: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache para (chave, watermark) ou o calcula uma única vez."""
+        nome = chave[0]
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada and entrada.watermark == watermark and entrada.expira_em > time.monotonic():
+                self._entradas.move_to_end(chave)
+                metrics_service.record_report_cache(nome, "hit")
+                return entrada.valor
+
+            calculo = self._em_andamento.get((chave, watermark))
+            lider = calculo is None
+            if lider:
+                calculo = _Calculo()
+                self._em_andamento[(chave, watermark)] = calculo
+
+        if not lider:
+            metrics_service.record_report_cache(nome, "coalesced")
+            if not calculo.evento.wait(self.espera_max_segundos):
+                return calcular()
+            if calculo.erro is not None:
+                raise calculo.erro
+            return calculo.valor
+
+        inicio = time.perf_counter()
+        try:
+            calculo.valor = calcular()
+        except BaseException as e:
+            calculo.erro = e
+            raise
+        else:
+            with self._lock:
+                self._entradas[chave] = _Entrada(
+                    watermark=watermark,
+                    valor=calculo.valor,
+                    expira_em=time.monotonic() + self.ttl_segundos,
+                )
+                self._entradas.move_to_end(chave)
+                while len(self._entradas) > self.max_entradas:
+                    self._entradas.popitem(last=False)
+            metrics_service.record_report_cache(nome, "miss", (time.perf_counter() - inicio) * 1000)
+            return calculo.valor
+        finally:
+            with self._lock:
+                self._em_andamento.pop((chave, watermark), None)
+            calculo.evento.set()
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+# Singleton instance
+report_cache = ReportCacheService()
+
+
+def cached_report(nome: str, ignorar_se: Optional[Callable[[dict], bool]] = None):
+    """
+    Decorador para endpoints síncronos de relatório.
+
+    A chave usa os parâmetros da chamada (exceto db/current_user) e o
+    watermark é lido com a sessão `db` do próprio endpoint. `ignorar_se`
+    recebe os kwargs e permite pular o cache (ex.: respostas em streaming).
+
+    Uso:
+        @router.get("/diarias")
+        @cached_report("relatorios.diarias")
+        def relatorio_diarias(..., db: Session = Depends(get_db)):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            if args or not report_cache.habilitado or (ignorar_se and ignorar_se(kwargs)):
+                return func(*args, **kwargs)
+
+            from app.repositories.relatorio_repository import RelatorioRepository
+
+            watermark = RelatorioRepository(kwargs["db"]).watermark()
+            return report_cache.get_or_compute(
+                chave_relatorio(nome, kwargs),
+                watermark,
+                lambda: func(**kwargs),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,71 @@
+"""Carga incremental dos rollups usados por dashboards e relatórios."""
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.fato import ROLLUP_FATO_DIARIA_DIA, ControleRollup
+from app.repositories.fato_repository import FatoDiariaDiaRepository
+
+# Folga aplicada ao watermark para não perder transações que commitaram
+# depois da leitura anterior com atualizado_em menor que o watermark
+SOBREPOSICAO_WATERMARK = timedelta(minutes=10)
+
+
+class RollupService:
+    """Mantém fato_diaria_dia a partir de diárias, inscrições e presenças."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = FatoDiariaDiaRepository(db)
+
+    def atualizar_fato_diaria_dia(self, hoje: Optional[date] = None, reconstruir: bool = False) -> dict:
+        """
+        Consolida os dias anteriores a `hoje` em fato_diaria_dia.
+
+        Na primeira execução (ou com reconstruir=True) todo o histórico é
+        calculado. Depois, só são recalculados os dias que deixaram de ser
+        "hoje" desde a última carga e os dias ainda não congelados que mudaram
+        a partir do watermark. Dias com mais de ROLLUP_DIAS_CARENCIA dias
+        ficam congelados.
+
+        Returns:
+            Dicionário com dias recalculados e a nova cobertura
+        """
+        hoje = hoje or date.today()
+        ontem = hoje - timedelta(days=1)
+        inicio = datetime.utcnow()
+        congelar_ate = hoje - timedelta(days=settings.ROLLUP_DIAS_CARENCIA + 1)
+
+        controle = self.repository.get_controle()
+
+        if reconstruir or controle is None or controle.watermark is None:
+            dias = self.repository.dias_com_diarias(None, ontem)
+            self.repository.limpar()
+            if controle is None:
+                controle = ControleRollup(nome=ROLLUP_FATO_DIARIA_DIA)
+                self.db.add(controle)
+            controle.congelado_ate = None
+        else:
+            congelado_ate = controle.congelado_ate
+            desde = controle.watermark - SOBREPOSICAO_WATERMARK
+            dias = (
+                self.repository.dias_com_diarias(controle.cobertura, ontem)
+                | self.repository.dias_alterados(desde, congelado_ate, ontem)
+                | self.repository.dias_divergentes(congelado_ate, ontem)
+            )
+
+        recalculados = self.repository.recalcular_dias(dias)
+
+        controle.watermark = inicio
+        controle.cobertura = ontem
+        if controle.congelado_ate is None or congelar_ate > controle.congelado_ate:
+            controle.congelado_ate = congelar_ate
+        self.db.commit()
+
+        return {
+            "dias_recalculados": recalculados,
+            "cobertura": ontem,
+            "congelado_ate": controle.congelado_ate,
+        }
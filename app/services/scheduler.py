@@ -2,6 +2,7 @@
 Scheduler para tarefas automáticas do sistema.
 Inclui fechamento automático de diárias antes do início.
 """
+import logging
 import threading
 import time as time_module
 from datetime import datetime, timedelta
@@ -9,10 +10,12 @@ from typing import List
 
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db.session import MaintenanceSessionLocal
 from app.models.diaria import Diaria
 from app.models.enums import StatusDiaria
 
+logger = logging.getLogger("scheduler")
+
 
 def fechar_diarias_proximas(db: Session, horas_antes: int = 4) -> List[int]:
     """
@@ -57,18 +60,29 @@ def fechar_diarias_proximas(db: Session, horas_antes: int = 4) -> List[int]:
     return fechadas
 
 
+def reconciliar_contadores_diarias(db: Session) -> List[int]:
+    """Repara divergências dos contadores de inscritos/presenças das diárias."""
+    from app.repositories.diaria_repository import DiariaRepository
+    return DiariaRepository(db).reconciliar_contadores()
+
+
 def executar_scheduler():
     """
     Loop principal do scheduler.
     Roda a cada 30 minutos verificando diárias para fechar.
     Roda a cada hora verificando faltas.
+    Roda a cada 30 minutos consolidando o rollup fato_diaria_dia.
+    Roda a cada 6 horas reconciliando os contadores das diárias.
+    Roda a cada 30 minutos marcando como erro jobs de relatório abandonados.
+    Roda a cada 6 horas removendo resultados expirados de jobs de relatório.
     """
     print("[Scheduler] Iniciando scheduler de diárias...")
     contador_ciclos = 0
 
     while True:
+        # Sessão própria do scheduler: rollup e reconciliação não têm o statement_timeout da API
+        db = MaintenanceSessionLocal()
         try:
-            db = SessionLocal()
             
             # Fecha diárias próximas (a cada 30 min)
             fechadas = fechar_diarias_proximas(db, horas_antes=4)
@@ -82,10 +96,33 @@ def executar_scheduler():
                 resultado = attendance_service.marcar_faltas_automaticas()
                 if resultado['total_faltas'] > 0:
                     print(f"[Scheduler] {resultado['total_faltas']} falta(s) marcada(s), {resultado['total_penalidades']} penalidade(s) aplicada(s)")
-            
+
+            # Consolida o histórico usado por dashboards e relatórios (a cada 30 min)
+            from app.services.rollup_service import RollupService
+            rollup = RollupService(db).atualizar_fato_diaria_dia()
+            if rollup['dias_recalculados']:
+                print(f"[Scheduler] fato_diaria_dia: {rollup['dias_recalculados']} dia(s) recalculado(s)")
+
+            # Jobs de relatório órfãos de um processo reiniciado (a cada 30 min, inclusive na subida)
+            from app.services.relatorio_job_service import relatorio_job_service
+            abandonados = relatorio_job_service.marcar_abandonados(db)
+            if abandonados:
+                print(f"[Scheduler] {abandonados} job(s) de relatório abandonado(s) marcado(s) como erro")
+
+            # Corrige divergências nos contadores denormalizados (a cada 6 horas)
+            if contador_ciclos % 12 == 0:
+                corrigidas = reconciliar_contadores_diarias(db)
+                if corrigidas:
+                    print(f"[Scheduler] Contadores de {len(corrigidas)} diária(s) reconciliados")
+
+                removidos = relatorio_job_service.limpar_expirados(db)
+                if removidos:
+                    print(f"[Scheduler] {removidos} job(s) de relatório expirado(s) removido(s)")
+        except Exception:
+            # Com traceback: um statement_timeout (57014) aqui repetiria a cada ciclo
+            logger.exception("[Scheduler] Erro no ciclo")
+        finally:
             db.close()
-        except Exception as e:
-            print(f"[Scheduler] Erro: {e}")
 
         contador_ciclos += 1
         # Aguarda 30 minutos
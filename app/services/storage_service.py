@@ -1,7 +1,7 @@
 """Servico de armazenamento de arquivos usando MinIO/S3 compatible."""
 import base64
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 import uuid
 
 import boto3
@@ -154,6 +154,35 @@ class StorageService:
 
         return self._upload_image(foto_base64, filename, content_type)
 
+    def upload_file(self, key: str, file_path: str, content_type: str) -> str:
+        """Envia um arquivo local para o bucket (ex.: resultados de relatórios)."""
+        self._ensure_bucket_exists()
+
+        try:
+            with open(file_path, "rb") as body:
+                self._get_client().put_object(
+                    Bucket=self.bucket,
+                    Key=key,
+                    Body=body,
+                    ContentType=content_type,
+                )
+        except (BotoCoreError, ClientError) as exc:
+            raise StorageServiceError(f"Erro ao enviar arquivo para storage: {exc}") from exc
+
+        return key
+
+    def iter_file(self, key: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Lê um objeto do bucket em blocos, sem carregá-lo inteiro em memória."""
+        try:
+            body = self._get_client().get_object(Bucket=self.bucket, Key=key)["Body"]
+        except (BotoCoreError, ClientError) as exc:
+            raise StorageServiceError(f"Erro ao ler arquivo do storage: {exc}") from exc
+
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
     def delete_file(self, file_path: str) -> bool:
         """Deleta um arquivo do bucket."""
         try:
@@ -8,6 +8,7 @@ from urllib.parse import urlparse, urlunparse
 import httpx
 
 from app.core.config import settings
+from app.core.deadline import PrazoEsgotado, limitar_timeout, prazo_esgotado
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +75,8 @@ class WhatsAppClient:
         **kwargs: Any,
     ) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
-        req_timeout = timeout if timeout is not None else self.timeout
+        # Nunca espera além do prazo da requisição HTTP em andamento
+        req_timeout = limitar_timeout(timeout if timeout is not None else self.timeout)
         try:
             client = _get_shared_client(self.timeout)
             response = client.request(
@@ -85,6 +87,8 @@ class WhatsAppClient:
                 **kwargs,
             )
         except httpx.RequestError as exc:
+            if isinstance(exc, httpx.TimeoutException) and prazo_esgotado():
+                raise PrazoEsgotado("Prazo da requisição esgotado aguardando o serviço WhatsApp") from exc
             logger.error("WhatsApp service unreachable: %s", exc)
             raise WhatsAppClientError(
                 "Serviço WhatsApp indisponível. Verifique se está em execução."
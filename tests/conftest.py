@@ -1,9 +1,11 @@
 from collections.abc import Generator
+from datetime import date, timedelta
+from decimal import Decimal
 from pathlib import Path
 import sys
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -13,6 +15,14 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import app.models  # noqa: F401
 from app.db.base import Base
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+
+# 2026-10-18 é domingo (DSR): primeiro dia das diárias de seed_relatorios
+RELATORIOS_INICIO = date(2026, 10, 18)
 
 
 @pytest.fixture()
@@ -32,3 +42,101 @@ def db_session() -> Generator[Session, None, None]:
         db.close()
         Base.metadata.drop_all(bind=engine)
         engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def report_cache():
+    """Cache de relatórios desligado por padrão; os testes de cache o habilitam."""
+    from app.services.report_cache_service import report_cache as cache
+
+    habilitado = cache.habilitado
+    cache.clear()
+    cache.habilitado = False
+    yield cache
+    cache.habilitado = habilitado
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def permission_cache():
+    """Permissões compiladas não vazam entre bancos de teste (IDs se repetem)."""
+    from app.core.permission_cache import permission_cache as cache
+
+    cache.incrementar_versao()
+    yield cache
+    cache.incrementar_versao()
+
+
+@pytest.fixture(autouse=True)
+def auth_state_cache():
+    """Estado de autenticação em cache não vaza entre testes."""
+    from app.core.auth_cache import auth_state_cache as cache
+
+    cache.invalidar()
+    yield cache
+    cache.invalidar()
+
+
+class QueryCounter:
+    """Conta os statements SQL executados numa sessão."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture()
+def query_counter(db_session: Session) -> QueryCounter:
+    return QueryCounter(db_session.get_bind())
+
+
+@pytest.fixture()
+def seed_relatorios(db_session: Session):
+    """
+    Cria `dias` diárias a partir de RELATORIOS_INICIO, cada uma com um
+    colaborador presente e um faltoso. Retorna (admin, empresa).
+    """
+    def criar(dias: int = 2):
+        admin = Pessoa(nome="Admin", email="admin@example.com", cpf="999", tipo_pessoa=TipoPessoa.ADMIN)
+        colab = Pessoa(nome="Colab", email="colab@example.com", cpf="111", tipo_pessoa=TipoPessoa.COLABORADOR)
+        faltoso = Pessoa(nome="Faltoso", email="faltoso@example.com", cpf="222", tipo_pessoa=TipoPessoa.COLABORADOR)
+        empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+        db_session.add_all([admin, colab, faltoso, empresa])
+        db_session.flush()
+
+        for n in range(dias):
+            diaria = Diaria(
+                titulo=f"Diaria {n}",
+                data=RELATORIOS_INICIO + timedelta(days=n),
+                vagas=2,
+                valor=Decimal("100.00"),
+                empresa_id=empresa.id,
+                supervisor_id=admin.id,
+            )
+            db_session.add(diaria)
+            db_session.flush()
+            presente = Inscricao(pessoa_id=colab.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+            ausente = Inscricao(pessoa_id=faltoso.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+            db_session.add_all([presente, ausente])
+            db_session.flush()
+            db_session.add(RegistroPresenca(foto_url="f.jpg", inscricao_id=presente.id, registrado_por_id=admin.id))
+
+        db_session.commit()
+        return admin, empresa
+
+    return criar
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints.alocacoes import minhas_alocacoes
+from app.api.v1.endpoints.diarias import list_disponiveis, minhas_inscricoes
+from app.api.v1.endpoints.pessoas import get_meu_perfil
+from app.core.auth_cache import UsuarioAutenticado
+from app.core.config import Settings
+from app.db.base import Base
+from app.models.alocacao import AlocacaoColaborador, AlocacaoDiaria
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusDiaria, StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.veiculo import Veiculo
+from app.services.alocacao_service import AlocacaoService
+from app.services.diaria_service import DiariaService, InscricaoService
+
+
+@pytest.fixture()
+def bancos(tmp_path):
+    """Mesmo arquivo SQLite aberto pela engine síncrona (seed) e pela assíncrona."""
+    caminho = tmp_path / "async.db"
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{caminho}")
+    yield sessionmaker(bind=engine, autoflush=False), async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+
+def seed(db):
+    hoje = date.today()
+    supervisor = Pessoa(nome="Sup", email="sup@example.com", cpf="1", tipo_pessoa=TipoPessoa.SUPERVISOR)
+    colab = Pessoa(nome="Colab", email="colab@example.com", cpf="2", tipo_pessoa=TipoPessoa.COLABORADOR)
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    veiculo = Veiculo(placa="ABC1D23", modelo="Van", capacidade=15, motorista="Zé")
+    db.add_all([supervisor, colab, empresa, veiculo])
+    db.flush()
+
+    futuras = [
+        Diaria(titulo=f"D{n}", data=hoje + timedelta(days=n), vagas=10, empresa_id=empresa.id,
+               supervisor_id=supervisor.id if n % 2 else None)
+        for n in range(3)
+    ]
+    passada = Diaria(titulo="Passada", data=hoje - timedelta(days=1), vagas=10, empresa_id=empresa.id)
+    fechada = Diaria(titulo="Fechada", data=hoje, vagas=10, empresa_id=empresa.id, status=StatusDiaria.FECHADA)
+    db.add_all([*futuras, passada, fechada])
+    db.flush()
+
+    inscricoes = [
+        Inscricao(pessoa_id=colab.id, diaria_id=d.id, status=StatusInscricao.CONFIRMADA)
+        for d in (futuras[1], passada)
+    ]
+    db.add_all(inscricoes)
+    db.flush()
+    for inscricao in inscricoes:
+        alocacao = AlocacaoDiaria(diaria_id=inscricao.diaria_id, veiculo_id=veiculo.id)
+        db.add(alocacao)
+        db.flush()
+        db.add(AlocacaoColaborador(
+            alocacao_diaria_id=alocacao.id, inscricao_id=inscricao.id,
+            horario_estimado=time(6, 30), ordem_embarque=1,
+        ))
+    db.commit()
+    return colab.id
+
+
+def test_endpoints_async_equivalem_aos_sincronos(bancos):
+    SessionSync, SessionAsync = bancos
+    with SessionSync() as db:
+        colab_id = seed(db)
+        colab = db.get(Pessoa, colab_id)
+        esperado_disponiveis = DiariaService(db).list_disponiveis().model_dump()
+        esperado_alocacoes = AlocacaoService(db).get_minhas_alocacoes(colab_id)
+        esperado_inscricoes = [
+            (i.id, i.diaria.titulo, i.diaria.empresa.nome) for i in InscricaoService(db).minhas_inscricoes(colab_id)
+        ]
+
+    async def chamar():
+        async with SessionAsync() as db:
+            disponiveis = await list_disponiveis(skip=0, limit=100, db=db)
+            inscricoes = await minhas_inscricoes(Response(), limit=100, cursor=None, db=db, current_user=colab)
+            alocacoes = await minhas_alocacoes(db=db, current_user=colab)
+            return disponiveis, inscricoes, alocacoes
+
+    disponiveis, inscricoes, alocacoes = asyncio.run(chamar())
+
+    assert disponiveis.model_dump() == esperado_disponiveis
+    assert [d.titulo for d in disponiveis.diarias] == ["D0", "D1", "D2"]
+    assert disponiveis.diarias[1].supervisor.nome == "Sup"
+    assert [(i.id, i.diaria.titulo, i.diaria.empresa.nome) for i in inscricoes] == esperado_inscricoes
+    assert alocacoes == esperado_alocacoes
+    assert [(a.diaria_titulo, a.veiculo_placa, a.horario_estimado) for a in alocacoes] == [("D1", "ABC1D23", "06:30")]
+
+
+def test_me_async_carrega_pessoa_do_fast_path(bancos):
+    SessionSync, SessionAsync = bancos
+    with SessionSync() as db:
+        colab_id = seed(db)
+        # Usuário do fast path: só claims do token, sem a Pessoa carregada
+        usuario = UsuarioAutenticado(db, colab_id, "Colab", TipoPessoa.COLABORADOR, 0)
+
+        async def chamar():
+            async with SessionAsync() as adb:
+                return await get_meu_perfil(db=adb, current_user=usuario)
+
+        pessoa = asyncio.run(chamar())
+
+    assert (pessoa.id, pessoa.email) == (colab_id, "colab@example.com")
+    assert usuario._pessoa is None
+
+
+@pytest.mark.parametrize("url, esperado", [
+    ("postgresql://u:p%40ss@db:5432/alpha", "postgresql+asyncpg://u:p%40ss@db:5432/alpha"),
+    ("postgresql+psycopg2://u:p@db/alpha", "postgresql+asyncpg://u:p@db/alpha"),
+    ("sqlite:///./local.db", "sqlite+aiosqlite:///./local.db"),
+])
+def test_async_database_url(url, esperado):
+    assert Settings(DATABASE_URL=url).ASYNC_DATABASE_URL == esperado
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+
+import httpx
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.scripts.load_test_auth import criar_ambiente, criar_app
+
+
+def test_autenticacao_roda_no_threadpool_sem_bloquear_o_event_loop(tmp_path, monkeypatch):
+    # Sem fast path: toda requisição consulta o banco
+    monkeypatch.setattr(settings, "AUTH_FAST_PATH_ENABLED", False)
+    # Dependência síncrona: o FastAPI a executa no threadpool
+    assert not asyncio.iscoroutinefunction(get_current_user)
+
+    engine, token = criar_ambiente(str(tmp_path), latencia_ms=0)
+    lock = threading.Lock()
+    consultas = {"em_andamento": 0, "pico": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _entrar(*_args):
+        with lock:
+            consultas["em_andamento"] += 1
+            consultas["pico"] = max(consultas["pico"], consultas["em_andamento"])
+        # Consulta "lenta": com o event loop bloqueado, nenhuma outra começaria neste intervalo
+        time.sleep(0.05)
+        with lock:
+            consultas["em_andamento"] -= 1
+
+    async def disparar():
+        headers = {"Authorization": f"Bearer {token}"}
+        transport = httpx.ASGITransport(app=criar_app(engine))
+        async with httpx.AsyncClient(transport=transport, base_url="http://carga") as cliente:
+            respostas = await asyncio.gather(*(cliente.get("/me", headers=headers) for _ in range(8)))
+        return [resposta.status_code for resposta in respostas]
+
+    try:
+        assert asyncio.run(disparar()) == [200] * 8
+    finally:
+        engine.dispose()
+
+    # Bloqueando o event loop as consultas seriam estritamente sequenciais (pico 1)
+    assert consultas["pico"] > 1
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.core.auth_cache import UsuarioAutenticado
+from app.core.deps import get_current_user
+from app.core.security import create_access_token
+from app.models.enums import TipoPessoa
+from app.models.pessoa import Pessoa
+
+
+def criar_usuario(db_session) -> Pessoa:
+    pessoa = Pessoa(nome="Colab", email="colab@example.com", cpf="111", tipo_pessoa=TipoPessoa.COLABORADOR)
+    db_session.add(pessoa)
+    db_session.commit()
+    return pessoa
+
+
+def token_de(pessoa: Pessoa) -> str:
+    return create_access_token({
+        "sub": str(pessoa.id),
+        "nome": pessoa.nome,
+        "tipo_pessoa": pessoa.tipo_pessoa.value,
+        "perfis": [],
+        "av": pessoa.auth_version,
+    })
+
+
+def autenticar(db_session, token):
+    return get_current_user(db=db_session, token=token)
+
+
+def test_fast_path_autentica_sem_consultar_o_banco(db_session, query_counter):
+    pessoa = criar_usuario(db_session)
+    token = token_de(pessoa)
+    autenticar(db_session, token)
+    db_session.expunge_all()  # Como numa nova requisição: nada no identity map
+
+    with query_counter:
+        usuario = autenticar(db_session, token)
+
+    assert query_counter.count == 0
+    assert isinstance(usuario, UsuarioAutenticado)
+    assert (usuario.id, usuario.nome, usuario.tipo_pessoa) == (pessoa.id, "Colab", TipoPessoa.COLABORADOR)
+
+    with query_counter:
+        assert usuario.email == "colab@example.com"
+    assert query_counter.count == 1
+
+
+def test_bloqueio_e_mudanca_de_tipo_revogam_o_fast_path(db_session):
+    pessoa = criar_usuario(db_session)
+    token = token_de(pessoa)
+    assert isinstance(autenticar(db_session, token), UsuarioAutenticado)
+
+    pessoa.tipo_pessoa = TipoPessoa.SUPERVISOR
+    db_session.commit()
+    usuario = autenticar(db_session, token)
+    assert isinstance(usuario, Pessoa)
+    assert usuario.tipo_pessoa == TipoPessoa.SUPERVISOR
+
+    pessoa.bloqueado = True
+    db_session.commit()
+    with pytest.raises(HTTPException) as exc:
+        autenticar(db_session, token_de(pessoa))
+    assert exc.value.status_code == 403
+
+
+def test_desativacao_em_outro_worker_vale_apos_o_ttl(db_session, auth_state_cache, monkeypatch):
+    pessoa = criar_usuario(db_session)
+    token = token_de(pessoa)
+    autenticar(db_session, token)
+
+    # UPDATE direto não passa pelos eventos do ORM (como uma alteração feita em outro processo)
+    db_session.execute(update(Pessoa).where(Pessoa.id == pessoa.id).values(ativo=False))
+    db_session.commit()
+    assert isinstance(autenticar(db_session, token), UsuarioAutenticado)
+
+    agora = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: agora + auth_state_cache.ttl_segundos + 1)
+    with pytest.raises(HTTPException) as exc:
+        autenticar(db_session, token)
+    assert exc.value.status_code == 403
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import concurrency
+from app.core.concurrency import ControleAdmissao, GrupoSobrecarregado, LimiteConcorrencia, limitar_concorrencia
+
+
+def test_limite_enfileira_rejeita_e_expira():
+    async def cenario():
+        limite = LimiteConcorrencia("teste", max_concorrentes=1, max_fila=1, timeout_fila=0.05)
+        ordem = []
+
+        async def tarefa(nome, duracao):
+            await limite.adquirir()
+            try:
+                ordem.append(nome)
+                await asyncio.sleep(duracao)
+            finally:
+                limite.liberar()
+
+        primeira = asyncio.create_task(tarefa("primeira", 0.02))
+        await asyncio.sleep(0)
+        segunda = asyncio.create_task(tarefa("segunda", 0))
+        await asyncio.sleep(0)
+        # Uma em execução e uma na fila: a terceira é recusada na hora
+        with pytest.raises(GrupoSobrecarregado):
+            await limite.adquirir()
+        assert (limite.estatisticas()["em_execucao"], limite.estatisticas()["na_fila"]) == (1, 1)
+        await asyncio.gather(primeira, segunda)
+
+        # Vaga presa além do timeout da fila: quem espera desiste com erro e a vaga não vaza
+        await limite.adquirir()
+        with pytest.raises(GrupoSobrecarregado):
+            await limite.adquirir()
+        limite.liberar()
+        await limite.adquirir()
+        limite.liberar()
+        return ordem, limite.estatisticas()
+
+    ordem, estatisticas = asyncio.run(cenario())
+    assert ordem == ["primeira", "segunda"]
+    assert (estatisticas["em_execucao"], estatisticas["na_fila"], estatisticas["pico_fila"]) == (0, 0, 1)
+    assert (estatisticas["admitidas"], estatisticas["rejeitadas"], estatisticas["timeouts"]) == (4, 1, 1)
+
+
+def test_rota_limitada_responde_503_com_retry_after(monkeypatch):
+    monkeypatch.setattr(concurrency.settings, "CONCURRENCY_LIMITS", {"lento": 1})
+    monkeypatch.setattr(concurrency.settings, "CONCURRENCY_MAX_QUEUE", {"lento": 0})
+    monkeypatch.setattr(concurrency, "controle_admissao", ControleAdmissao())
+
+    app = FastAPI()
+
+    @app.get("/lento", dependencies=[Depends(limitar_concorrencia("lento"))])
+    async def lento():
+        # Ocupa a única vaga e chama de novo a mesma rota: sem fila, a segunda é recusada
+        recusada = TestClient(app).get("/lento")
+        return [recusada.status_code, recusada.headers.get("retry-after")]
+
+    @app.get("/livre", dependencies=[Depends(limitar_concorrencia("sem-limite"))])
+    async def livre():
+        return "ok"
+
+    resposta = TestClient(app).get("/lento")
+    assert resposta.json() == [503, "5"]
+    assert TestClient(app).get("/livre").status_code == 200
+    assert concurrency.controle_admissao.estatisticas()["lento"]["rejeitadas"] == 1
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.api.v1.endpoints.dashboard import dashboard_executive, dashboard_hoje
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+
+
+def seed_diarias(db_session, quantidade: int, *, presentes_por_diaria: int = 3) -> Pessoa:
+    """Cria diárias de hoje com inscrições confirmadas e presenças."""
+    admin = Pessoa(
+        nome="Admin",
+        email="admin@example.com",
+        cpf="999.999.999-99",
+        tipo_pessoa=TipoPessoa.ADMIN,
+    )
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    db_session.add_all([admin, empresa])
+    db_session.flush()
+
+    colaboradores = []
+    for i in range(presentes_por_diaria):
+        colaborador = Pessoa(
+            nome=f"Colaborador {i}",
+            email=f"colab{i}@example.com",
+            cpf=f"000.000.000-{i:02d}",
+            tipo_pessoa=TipoPessoa.COLABORADOR,
+        )
+        colaboradores.append(colaborador)
+    db_session.add_all(colaboradores)
+    db_session.flush()
+
+    for n in range(quantidade):
+        diaria = Diaria(
+            titulo=f"Diaria {n}",
+            data=date.today(),
+            vagas=presentes_por_diaria,
+            valor=Decimal("100.00"),
+            empresa_id=empresa.id,
+        )
+        db_session.add(diaria)
+        db_session.flush()
+        for colaborador in colaboradores:
+            inscricao = Inscricao(
+                pessoa_id=colaborador.id,
+                diaria_id=diaria.id,
+                status=StatusInscricao.CONFIRMADA,
+            )
+            db_session.add(inscricao)
+            db_session.flush()
+            db_session.add(
+                RegistroPresenca(
+                    foto_url="foto.jpg",
+                    inscricao_id=inscricao.id,
+                    registrado_por_id=admin.id,
+                )
+            )
+
+    db_session.commit()
+    return admin
+
+
+def test_dashboard_executive_totais(db_session):
+    admin = seed_diarias(db_session, 2)
+
+    resultado = dashboard_executive(db=db_session, current_user=admin)
+
+    fator_dsr = 2 if date.today().weekday() == 6 else 1
+    assert resultado["resumo"]["total_colaboradores"] == 3
+    assert resultado["resumo"]["diarias_hoje"] == 2
+    assert resultado["mes_atual"]["total_diarias"] == 2
+    assert resultado["mes_atual"]["total_vagas"] == 6
+    assert resultado["mes_atual"]["total_presencas"] == 6
+    assert resultado["mes_atual"]["valor_total"] == 600.0 * fator_dsr
+    assert resultado["mes_atual"]["taxa_frequencia"] == 100.0
+    assert resultado["top_empresas"] == [
+        {"empresa": "Empresa A", "diarias": 2, "valor": 600.0 * fator_dsr}
+    ]
+    assert len(resultado["ultimos_7_dias"]) == 7
+    assert resultado["ultimos_7_dias"][-1]["diarias"] == 2
+    assert resultado["ultimos_7_dias"][-1]["presencas"] == 6
+    assert resultado["ultimos_7_dias"][0]["data"] == (date.today() - timedelta(days=6)).strftime("%d/%m")
+
+
+def test_dashboard_executive_numero_de_queries_constante(db_session, query_counter):
+    admin = seed_diarias(db_session, 1)
+    with query_counter:
+        dashboard_executive(db=db_session, current_user=admin)
+    queries_poucos_dados = query_counter.count
+
+    empresa_id = db_session.query(Empresa.id).scalar()
+    for n in range(20):
+        db_session.add(
+            Diaria(titulo=f"Extra {n}", data=date.today(), vagas=5, valor=Decimal("50"), empresa_id=empresa_id)
+        )
+    db_session.commit()
+
+    with query_counter:
+        dashboard_executive(db=db_session, current_user=admin)
+
+    assert query_counter.count == queries_poucos_dados
+    assert query_counter.count <= 8
+
+
+def test_dashboard_hoje_contagens_em_uma_consulta(db_session, query_counter):
+    admin = seed_diarias(db_session, 3)
+    diaria = db_session.query(Diaria).first()
+    diaria.supervisor_id = admin.id
+    db_session.add(Diaria(titulo="Ontem", data=date.today() - timedelta(days=1), vagas=1, empresa_id=diaria.empresa_id))
+    db_session.commit()
+
+    with query_counter:
+        resultado = dashboard_hoje(db=db_session, current_user=admin)
+
+    assert query_counter.count == 1
+    assert resultado["total_diarias"] == 3
+    assert {(d["inscricoes"], d["presencas"]) for d in resultado["diarias"]} == {(3, 3)}
+    assert sorted(d["supervisor"] or "" for d in resultado["diarias"]) == ["", "", "Admin"]
+    assert resultado["diarias"][0]["empresa"] == "Empresa A"
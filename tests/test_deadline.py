@@ -0,0 +1,103 @@
+import contextvars
+import time
+
+import httpx
+import pytest
+from fastapi import BackgroundTasks, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import deadline
+from app.core.deadline import PrazoEsgotado, definir_prazo, limitar_timeout, prazo
+from app.main import prazo_esgotado_handler
+from app.services import whatsapp_client
+from app.services.metrics_service import metrics_service
+from app.services.whatsapp_client import WhatsAppClient
+
+
+def test_prazo_esgotado_aborta_consulta_com_504(db_session, monkeypatch):
+    monkeypatch.setattr(deadline.settings, "REQUEST_DEADLINES", {"teste": 0.05})
+    sessoes = sessionmaker(bind=db_session.get_bind())
+    observado = {}
+
+    app = FastAPI(dependencies=[prazo("teste")])
+    app.add_exception_handler(PrazoEsgotado, prazo_esgotado_handler)
+
+    @app.get("/rapida")
+    def rapida(tarefas: BackgroundTasks):
+        observado["restante"] = deadline.tempo_restante()
+        tarefas.add_task(lambda: observado.update(em_background=deadline.tempo_restante()))
+        with sessoes() as db:
+            return db.execute(text("select 1")).scalar()
+
+    @app.get("/lenta")
+    def lenta():
+        time.sleep(0.06)
+        with sessoes() as db:
+            db.execute(text("select 1"))
+        observado["executou"] = True
+
+    antes = metrics_service.get_deadline_stats()["endpoints"].get("GET /lenta", 0)
+    cliente = TestClient(app)
+
+    assert cliente.get("/rapida").json() == 1
+    assert 0 < observado["restante"] <= 0.05
+    # Tarefas em background não herdam o prazo da requisição
+    assert observado["em_background"] is None
+
+    assert cliente.get("/lenta").status_code == 504
+    assert "executou" not in observado
+    assert metrics_service.get_deadline_stats()["endpoints"]["GET /lenta"] == antes + 1
+
+
+def test_timeout_http_limitado_ao_prazo(monkeypatch):
+    timeouts = []
+
+    def responder(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        time.sleep(timeouts[-1])
+        raise httpx.ReadTimeout("sem resposta", request=request)
+
+    cliente_http = httpx.Client(transport=httpx.MockTransport(responder))
+    monkeypatch.setattr(whatsapp_client, "_get_shared_client", lambda timeout: cliente_http)
+
+    def com_prazo(segundos):
+        definir_prazo(segundos)
+        if segundos < 0:
+            with pytest.raises(PrazoEsgotado):
+                limitar_timeout(60)
+        with pytest.raises(PrazoEsgotado):
+            WhatsAppClient(base_url="http://whatsapp").send_messages(["5511999999999"], "oi")
+
+    contextvars.copy_context().run(com_prazo, 0.5)
+    assert 0 < timeouts[0] <= 0.5
+
+    # Prazo já vencido: nem chega a chamar o serviço
+    contextvars.copy_context().run(com_prazo, -1)
+    assert len(timeouts) == 1
+    # Fora de uma requisição com prazo, o timeout configurado vale
+    assert limitar_timeout(60) == 60
+
+
+def test_set_local_so_quando_o_prazo_aperta_o_timeout_da_conexao():
+    from types import SimpleNamespace
+
+    from app.db.session import _limitar_transacao_ao_prazo
+
+    emitidos = []
+    conexao = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        info={"statement_timeout_ms": 10000},
+        exec_driver_sql=emitidos.append,
+    )
+
+    def transacao(segundos):
+        contexto = contextvars.copy_context()
+        contexto.run(lambda: (definir_prazo(segundos), _limitar_transacao_ao_prazo(None, None, conexao)))
+
+    transacao(30)
+    assert emitidos == []
+    transacao(2)
+    assert len(emitidos) == 1
+    assert 1000 < int(emitidos[0].rsplit("=", 1)[1]) <= 2000
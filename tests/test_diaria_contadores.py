@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.repositories.diaria_repository import DiariaRepository, InscricaoRepository
+from app.repositories.presenca_repository import PresencaRepository
+from app.schemas.diaria import InscricaoCreate
+from app.services.diaria_service import DiariaService
+
+
+def seed(db_session, colaboradores: int = 3, vagas: int = 5):
+    admin = Pessoa(nome="Admin", email="admin@example.com", cpf="999", tipo_pessoa=TipoPessoa.ADMIN)
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    pessoas = [
+        Pessoa(nome=f"Colab {i}", email=f"c{i}@example.com", cpf=f"c{i}", tipo_pessoa=TipoPessoa.COLABORADOR)
+        for i in range(colaboradores)
+    ]
+    db_session.add_all([admin, empresa, *pessoas])
+    db_session.flush()
+    diaria = Diaria(titulo="Diaria", data=date.today() + timedelta(days=1), vagas=vagas, empresa_id=empresa.id)
+    db_session.add(diaria)
+    db_session.commit()
+    return admin, diaria, pessoas
+
+
+def contadores(db_session, diaria_id: int) -> tuple:
+    diaria = db_session.get(Diaria, diaria_id)
+    db_session.refresh(diaria)
+    return diaria.total_inscritos, diaria.total_confirmados, diaria.total_presencas
+
+
+def test_contadores_acompanham_inscricoes_e_presencas(db_session):
+    admin, diaria, pessoas = seed(db_session)
+    repo = InscricaoRepository(db_session)
+
+    inscricoes = [repo.create(p.id, InscricaoCreate(diaria_id=diaria.id)) for p in pessoas]
+    assert contadores(db_session, diaria.id) == (3, 0, 0)
+
+    repo.update_status(inscricoes[0].id, StatusInscricao.CONFIRMADA)
+    repo.update_status(inscricoes[1].id, StatusInscricao.CONFIRMADA)
+    repo.update_status(inscricoes[2].id, StatusInscricao.CANCELADA)
+    assert contadores(db_session, diaria.id) == (2, 2, 0)
+
+    presenca = PresencaRepository(db_session).create(
+        {"foto_url": "f.jpg", "inscricao_id": inscricoes[0].id, "registrado_por_id": admin.id}
+    )
+    assert contadores(db_session, diaria.id) == (2, 2, 1)
+    assert db_session.get(Diaria, diaria.id).vagas_disponiveis == 3
+
+    PresencaRepository(db_session).delete(presenca.id)
+    repo.delete(inscricoes[1].id)
+    repo.delete(inscricoes[2].id)
+    assert contadores(db_session, diaria.id) == (1, 1, 0)
+
+
+def test_listagem_nao_carrega_inscricoes(db_session, query_counter):
+    _, diaria, pessoas = seed(db_session, colaboradores=4, vagas=5)
+    for pessoa in pessoas:
+        db_session.add(Inscricao(pessoa_id=pessoa.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA))
+    db_session.commit()
+    db_session.expire_all()
+
+    with query_counter:
+        resultado = DiariaService(db_session).list_disponiveis(skip=0, limit=100)
+
+    assert query_counter.count == 1
+    assert resultado.diarias[0].vagas_disponiveis == 1
+
+
+def test_reconciliacao_corrige_divergencias(db_session):
+    admin, diaria, pessoas = seed(db_session)
+    outra = Diaria(titulo="Outra", data=diaria.data, vagas=1, empresa_id=diaria.empresa_id)
+    db_session.add(outra)
+    db_session.flush()
+    inscricao = Inscricao(pessoa_id=pessoas[0].id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+    db_session.add(inscricao)
+    db_session.commit()
+
+    # Simula drift (ex.: carga em lote fora do ORM)
+    diaria.total_inscritos = 7
+    diaria.total_presencas = 2
+    db_session.commit()
+
+    corrigidas = DiariaRepository(db_session).reconciliar_contadores()
+
+    assert corrigidas == [diaria.id]
+    assert contadores(db_session, diaria.id) == (1, 1, 0)
+    assert DiariaRepository(db_session).reconciliar_contadores() == []
+
+
+def test_remover_inscricao_com_presenca_desconta_a_presenca_uma_vez(db_session):
+    admin, diaria, pessoas = seed(db_session)
+    inscricao = Inscricao(pessoa_id=pessoas[0].id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+    db_session.add(inscricao)
+    db_session.flush()
+    presenca = RegistroPresenca(foto_url="f.jpg", inscricao_id=inscricao.id, registrado_por_id=admin.id)
+    db_session.add(presenca)
+    db_session.commit()
+    assert contadores(db_session, diaria.id) == (1, 1, 1)
+
+    # Mesmo flush: o ORM apaga a presença antes da inscrição
+    db_session.delete(presenca)
+    db_session.delete(inscricao)
+    db_session.commit()
+    assert contadores(db_session, diaria.id) == (0, 0, 0)
+
+
+def test_alterar_inscricao_expirada_pelo_commit_atualiza_contadores(db_session):
+    admin, diaria, pessoas = seed(db_session)
+    outra = Diaria(titulo="Outra", data=diaria.data, vagas=5, empresa_id=diaria.empresa_id)
+    inscricao = Inscricao(pessoa_id=pessoas[0].id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+    db_session.add_all([outra, inscricao])
+    db_session.commit()
+    assert contadores(db_session, diaria.id) == (1, 1, 0)
+
+    # Após o commit a instância está expirada: o valor antigo não está carregado
+    inscricao.status = StatusInscricao.CANCELADA
+    db_session.commit()
+    assert contadores(db_session, diaria.id) == (0, 0, 0)
+
+    inscricao.status = StatusInscricao.CONFIRMADA
+    db_session.commit()
+    inscricao.diaria_id = outra.id
+    db_session.commit()
+    assert contadores(db_session, diaria.id) == (0, 0, 0)
+    assert contadores(db_session, outra.id) == (1, 1, 0)
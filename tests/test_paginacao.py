@@ -0,0 +1,106 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.models.alocacao import AlocacaoDiaria
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusDiaria, StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.veiculo import Veiculo
+from app.repositories.diaria_repository import DiariaRepository, InscricaoRepository
+from app.repositories.paginacao import CursorInvalido, codificar_cursor
+from app.repositories.pessoa_repository import PessoaRepository
+from app.repositories.veiculo_repository import VeiculoRepository
+
+
+def seed(db):
+    empresa = Empresa(nome="Empresa", cnpj="00.000.000/0001-00")
+    veiculo = Veiculo(placa="ABC1D23", modelo="Van", capacidade=15)
+    db.add_all([empresa, veiculo])
+    db.flush()
+    # Nomes e datas repetidos: o id desempata a chave
+    pessoas = [
+        Pessoa(nome=nome, email=f"p{i}@example.com", cpf=str(i), tipo_pessoa=TipoPessoa.COLABORADOR)
+        for i, nome in enumerate(["Bia", "Ana", "Caio", "Ana", "Bia"])
+    ]
+    diarias = [
+        Diaria(titulo=f"D{i}", data=date(2026, 10, 1 + i // 2), vagas=10, empresa_id=empresa.id,
+               status=StatusDiaria.ABERTA if i % 2 else StatusDiaria.FECHADA)
+        for i in range(5)
+    ]
+    db.add_all(pessoas + diarias)
+    db.flush()
+    mesmo_instante = datetime(2026, 10, 1, 8, 0)
+    db.add_all([
+        Inscricao(pessoa_id=pessoas[0].id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA,
+                  criado_em=mesmo_instante)
+        for diaria in diarias
+    ])
+    db.add_all([AlocacaoDiaria(diaria_id=diaria.id, veiculo_id=veiculo.id) for diaria in diarias])
+    db.commit()
+    return pessoas, diarias, veiculo
+
+
+def percorrer(listar, limit=2):
+    """Percorre todas as páginas seguindo next_cursor."""
+    paginas = [listar(cursor=None, limit=limit)]
+    while paginas[-1].next_cursor:
+        paginas.append(listar(cursor=paginas[-1].next_cursor, limit=limit))
+    return paginas
+
+
+def test_cursor_percorre_todas_as_linhas_sem_repetir(db_session):
+    pessoas, diarias, veiculo = seed(db_session)
+
+    paginas = percorrer(PessoaRepository(db_session).listar)
+    assert [len(p.itens) for p in paginas] == [2, 2, 1]
+    assert [(p.nome, p.id) for pagina in paginas for p in pagina.itens] == sorted((p.nome, p.id) for p in pessoas)
+    # Total exato só na primeira página
+    assert [p.total for p in paginas] == [5, None, None]
+
+    paginas = percorrer(DiariaRepository(db_session).listar)
+    assert [d.id for pagina in paginas for d in pagina.itens] == [
+        d.id for d in sorted(diarias, key=lambda d: (d.data, d.id), reverse=True)
+    ]
+
+    abertas = percorrer(lambda **kw: DiariaRepository(db_session).listar(status=StatusDiaria.ABERTA, **kw), limit=1)
+    assert [d.titulo for pagina in abertas for d in pagina.itens] == ["D3", "D1"]
+    assert abertas[0].total == 2
+
+    paginas = percorrer(lambda **kw: InscricaoRepository(db_session).listar_por_pessoa(pessoas[0].id, **kw))
+    ids = [i.id for pagina in paginas for i in pagina.itens]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 5
+
+    paginas = percorrer(lambda **kw: VeiculoRepository(db_session).listar_alocacoes(veiculo.id, **kw))
+    assert [a.diaria.titulo for pagina in paginas for a in pagina.itens] == ["D4", "D3", "D2", "D1", "D0"]
+
+
+def test_contagem_opcional_e_cursor_invalido(db_session):
+    seed(db_session)
+    repo = PessoaRepository(db_session)
+
+    assert repo.listar(contagem="nenhuma").total is None
+    # Fora do PostgreSQL não há estatísticas: a estimativa cai para a contagem exata
+    estimada = repo.listar(contagem="estimada", ativo=True)
+    assert (estimada.total, estimada.total_estimado) == (5, False)
+    # skip continua valendo para clientes antigos
+    assert [p.nome for p in repo.listar(skip=3, limit=10).itens] == ["Bia", "Caio"]
+
+    cursor_de_diarias = codificar_cursor((Diaria.data, Diaria.id), [date(2026, 10, 1), 1])
+    with pytest.raises(CursorInvalido):
+        repo.listar(cursor=cursor_de_diarias)
+    with pytest.raises(CursorInvalido):
+        repo.listar(cursor="nao-e-um-cursor")
+
+
+def test_chave_do_cursor_de_inscricoes_nao_aceita_nulo(db_session):
+    pessoas, diarias, _ = seed(db_session)
+
+    # (NULL, id) < (cursor) é NULL: a linha sumiria da paginação
+    with pytest.raises(IntegrityError):
+        db_session.execute(insert(Inscricao).values(
+            pessoa_id=pessoas[1].id, diaria_id=diarias[0].id, status=StatusInscricao.PENDENTE, criado_em=None,
+        ))
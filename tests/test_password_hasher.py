@@ -0,0 +1,120 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from passlib.context import CryptContext
+
+from app.api.v1.endpoints import auth
+from app.core import security
+from app.core.password_hasher import FilaSenhasCheia, PasswordHasherPool
+from app.models.enums import TipoPessoa
+from app.models.pessoa import Pessoa
+
+
+@pytest.fixture()
+def hasher(monkeypatch):
+    """Pool isolado e bcrypt com custo baixo (custo configurado: 5)."""
+    pool = PasswordHasherPool(max_workers=1, max_pendentes=4)
+    monkeypatch.setattr(security, "password_hasher", pool)
+    monkeypatch.setattr(auth, "password_hasher", pool)
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5))
+    yield pool
+    pool.shutdown()
+
+
+def logar(db_session, senha):
+    form = OAuth2PasswordRequestForm(username="ana@example.com", password=senha)
+    return asyncio.run(auth.login(form_data=form, db=db_session, _=None))
+
+
+def criar_usuario(db_session, rounds):
+    hash_antigo = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash("segredo")
+    pessoa = Pessoa(nome="Ana", email="ana@example.com", cpf="1", tipo_pessoa=TipoPessoa.COLABORADOR, senha_hash=hash_antigo)
+    db_session.add(pessoa)
+    db_session.commit()
+    return pessoa, hash_antigo
+
+
+def test_login_refaz_hash_quando_custo_muda(db_session, hasher):
+    pessoa, hash_antigo = criar_usuario(db_session, rounds=4)
+    versao = pessoa.auth_version
+
+    assert logar(db_session, "segredo").access_token
+
+    db_session.refresh(pessoa)
+    assert hash_antigo.startswith("$2b$04$")
+    assert pessoa.senha_hash.startswith("$2b$05$")
+    assert security.pwd_context.verify("segredo", pessoa.senha_hash)
+    # Rehash não é troca de senha: tokens emitidos continuam válidos no fast path
+    assert pessoa.auth_version == versao
+
+    # Hash já no custo atual: nada a regravar
+    logar(db_session, "segredo")
+    estatisticas = hasher.estatisticas()
+    assert (estatisticas["rehashes"], estatisticas["concluidas"]) == (1, 2)
+
+
+def test_login_senha_incorreta_nao_refaz_hash(db_session, hasher):
+    pessoa, hash_antigo = criar_usuario(db_session, rounds=4)
+
+    with pytest.raises(HTTPException) as exc:
+        logar(db_session, "errada")
+
+    assert exc.value.status_code == 401
+    db_session.refresh(pessoa)
+    assert pessoa.senha_hash == hash_antigo
+    assert hasher.estatisticas()["rehashes"] == 0
+
+
+def test_fila_cheia_recusa_operacao():
+    pool = PasswordHasherPool(max_workers=1, max_pendentes=1)
+    liberar = threading.Event()
+    iniciou = threading.Event()
+
+    def bloquear():
+        iniciou.set()
+        liberar.wait(5)
+        return True
+
+    try:
+        em_execucao = pool.submeter(bloquear)
+        iniciou.wait(5)
+        na_fila = pool.submeter(lambda: True)
+        with pytest.raises(FilaSenhasCheia):
+            pool.submeter(lambda: True)
+
+        estatisticas = pool.estatisticas()
+        assert (estatisticas["em_execucao"], estatisticas["pendentes"], estatisticas["rejeitadas"]) == (1, 1, 1)
+
+        liberar.set()
+        assert em_execucao.result(5) and na_fila.result(5)
+        assert pool.estatisticas()["pendentes"] == 0
+    finally:
+        liberar.set()
+        pool.shutdown()
+
+
+def test_fila_cheia_fora_do_login_responde_503(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.main import fila_senhas_cheia_handler
+
+    class PoolCheio:
+        def executar(self, funcao, *args):
+            raise FilaSenhasCheia("Fila de hashing de senhas cheia")
+
+    monkeypatch.setattr(security, "password_hasher", PoolCheio())
+    app = FastAPI()
+    app.add_exception_handler(FilaSenhasCheia, fila_senhas_cheia_handler)
+
+    # Mesmo caminho do cadastro de pessoas (PessoaRepository.create)
+    @app.post("/pessoas")
+    def criar():
+        return security.get_password_hash("segredo")
+
+    resposta = TestClient(app).post("/pessoas")
+    assert resposta.status_code == 503
+    assert resposta.headers["retry-after"] == "2"
@@ -0,0 +1,93 @@
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.permissions import (
+    require_permission,
+    require_supervisor_or_above,
+    user_has_any_permission,
+    user_has_perfil,
+    user_has_permission,
+    user_is_admin_or_supervisor,
+)
+from app.models.enums import TipoPessoa
+from app.models.perfil import Perfil, Permissao
+from app.models.pessoa import Pessoa
+from app.repositories.perfil_repository import PerfilRepository
+
+
+def seed(db_session):
+    ler = Permissao(codigo="diarias.read", nome="Ler", recurso="diarias", acao="read")
+    criar = Permissao(codigo="diarias.create", nome="Criar", recurso="diarias", acao="create")
+    inativa = Permissao(codigo="diarias.delete", nome="Excluir", recurso="diarias", acao="delete", ativo=False)
+    supervisor = Perfil(nome="Supervisor", codigo="SUPERVISOR", permissoes=[ler, inativa])
+    desativado = Perfil(nome="Financeiro", codigo="FINANCEIRO", ativo=False, permissoes=[criar])
+    pessoa = Pessoa(
+        nome="Colab", email="colab@example.com", cpf="111",
+        tipo_pessoa=TipoPessoa.COLABORADOR, perfis=[supervisor, desativado],
+    )
+    db_session.add_all([criar, pessoa])
+    db_session.commit()
+    return pessoa, supervisor, criar
+
+
+def test_permissoes_compiladas_consideram_apenas_ativos(db_session):
+    pessoa, _, _ = seed(db_session)
+
+    assert user_has_perfil(pessoa, "supervisor")
+    assert not user_has_perfil(pessoa, "FINANCEIRO")
+    assert user_has_permission(pessoa, "diarias.read")
+    assert not user_has_permission(pessoa, "diarias.delete")
+    assert not user_has_permission(pessoa, "diarias.create")
+    assert user_has_any_permission(pessoa, ["diarias.create", "diarias.read"])
+    assert user_is_admin_or_supervisor(pessoa)
+
+
+def test_verificacoes_sem_consultas_com_cache(db_session, query_counter):
+    pessoa, _, _ = seed(db_session)
+    db_session.refresh(pessoa)
+
+    with query_counter:
+        user_is_admin_or_supervisor(pessoa)
+        require_supervisor_or_above()(current_user=pessoa)
+        require_permission("diarias.read")(current_user=pessoa)
+    assert query_counter.count == 1
+
+    with query_counter:
+        user_is_admin_or_supervisor(pessoa)
+        require_permission("diarias.read")(current_user=pessoa)
+    assert query_counter.count == 0
+
+
+def test_alteracao_de_perfil_invalida_cache(db_session):
+    pessoa, supervisor, criar = seed(db_session)
+    repository = PerfilRepository(db_session)
+    checker = require_permission("diarias.create")
+
+    with pytest.raises(HTTPException) as exc:
+        checker(current_user=pessoa)
+    assert exc.value.status_code == 403
+
+    repository.adicionar_permissoes_ao_perfil(supervisor.id, [criar.id])
+    assert checker(current_user=pessoa) is pessoa
+
+    repository.remover_perfil_de_pessoa(pessoa.id, supervisor.id)
+    assert not user_is_admin_or_supervisor(pessoa)
+
+
+
+def test_alteracao_em_outro_worker_invalida_pela_auth_version(db_session, permission_cache, monkeypatch):
+    pessoa, supervisor, criar = seed(db_session)
+    assert not user_has_permission(pessoa, "diarias.create")
+
+    # Alteração feita por outro worker: a versão global deste processo não muda
+    monkeypatch.setattr(permission_cache, "incrementar_versao", lambda: permission_cache.versao)
+    repository = PerfilRepository(db_session)
+
+    repository.adicionar_permissoes_ao_perfil(supervisor.id, [criar.id])
+    db_session.refresh(pessoa)
+    assert user_has_permission(pessoa, "diarias.create")
+
+    repository.update_permissao(criar.id, ativo=False)
+    db_session.refresh(pessoa)
+    assert not user_has_permission(pessoa, "diarias.create")
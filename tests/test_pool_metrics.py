@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core import deps
+from app.db.pool_metrics import PoolMonitor, QueuePoolInstrumentado
+
+
+def test_pool_registra_espera_overflow_uso_e_vida(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePoolInstrumentado,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    metricas = PoolMonitor().registrar("teste", engine.pool)
+
+    primeira = engine.connect()
+    segunda = engine.connect()
+    primeira.execute(text("select 1"))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    durante = metricas.estatisticas()
+    assert (durante["emprestadas"], durante["overflow"], durante["max_overflow"]) == (2, 1, 1)
+    assert (durante["checkouts"], durante["timeouts"], durante["pico_overflow"]) == (2, 1, 1)
+    assert durante["saturacao"] == 1.0
+    assert durante["max_espera_ms"] >= 100
+
+    primeira.close()
+    segunda.close()
+    engine.dispose()
+
+    depois = metricas.estatisticas()
+    assert depois["emprestadas"] == 0
+    assert depois["avg_uso_ms"] > 0
+    assert (depois["conexoes_abertas"], depois["conexoes_fechadas"]) == (2, 2)
+
+    # Pool recriado pelo dispose() continua instrumentado
+    with engine.connect():
+        pass
+    assert metricas.estatisticas()["checkouts"] == 3
+
+
+def test_metricas_expoem_pools():
+    from app.main import app
+
+    cliente = TestClient(app)
+    pools = cliente.get("/api/v1/metrics/db-pools").json()
+    assert {"principal", "analitico", "async"} <= set(pools)
+    assert "db_pools" in cliente.get("/api/v1/metrics").json()
+    assert "Pools de Conexão" in cliente.get("/monitor").text
+
+
+def test_routers_analiticos_usam_pool_proprio(db_session, monkeypatch):
+    from app.main import app
+
+    usados = []
+
+    def fabrica(nome):
+        sessoes = sessionmaker(bind=db_session.get_bind())
+        return lambda: usados.append(nome) or sessoes()
+
+    monkeypatch.setattr(deps, "sessoes_por_pool", {nome: fabrica(nome) for nome in deps.sessoes_por_pool})
+    cliente = TestClient(app)
+
+    for rota in ("/api/v1/dashboard/hoje", "/api/v1/relatorios/diarias", "/api/v1/pessoas/"):
+        usados.clear()
+        cliente.get(rota)
+        assert set(usados) == ({"transacional"} if rota == "/api/v1/pessoas/" else {"analitico"}), rota
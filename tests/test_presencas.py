@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from app.api.v1.endpoints.presencas import listar_presencas_diaria, minhas_diarias_supervisor
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+
+INICIO = date(2026, 9, 1)
+
+
+def seed_supervisor(db_session, dias: int = 5):
+    """Cria diárias supervisionadas com uma inscrição pendente, duas confirmadas e uma presença."""
+    supervisor = Pessoa(nome="Supervisor", email="sup@example.com", cpf="999", tipo_pessoa=TipoPessoa.SUPERVISOR)
+    outro = Pessoa(nome="Outro", email="outro@example.com", cpf="998", tipo_pessoa=TipoPessoa.SUPERVISOR)
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    colabs = [
+        Pessoa(nome=f"C{i}", email=f"c{i}@example.com", cpf=f"c{i}", tipo_pessoa=TipoPessoa.COLABORADOR)
+        for i in range(4)
+    ]
+    db_session.add_all([supervisor, outro, empresa, *colabs])
+    db_session.flush()
+
+    for n in range(dias):
+        diaria = Diaria(
+            titulo=f"D{n}", data=INICIO + timedelta(days=n), vagas=10,
+            empresa_id=empresa.id, supervisor_id=supervisor.id,
+        )
+        db_session.add(diaria)
+        db_session.flush()
+        status = [StatusInscricao.PENDENTE, StatusInscricao.CONFIRMADA, StatusInscricao.CONFIRMADA, StatusInscricao.CANCELADA]
+        inscricoes = [
+            Inscricao(pessoa_id=c.id, diaria_id=diaria.id, status=s) for c, s in zip(colabs, status)
+        ]
+        db_session.add_all(inscricoes)
+        db_session.flush()
+        db_session.add(RegistroPresenca(foto_url="f.jpg", inscricao_id=inscricoes[1].id, registrado_por_id=supervisor.id))
+
+    db_session.add(Diaria(titulo="Alheia", data=INICIO, vagas=1, empresa_id=empresa.id, supervisor_id=outro.id))
+    db_session.commit()
+    return supervisor
+
+
+def chamar(db_session, supervisor, **kwargs):
+    params = {"data_inicio": None, "data_fim": None, "skip": 0, "limit": 50}
+    params.update(kwargs)
+    return minhas_diarias_supervisor(db=db_session, current_user=supervisor, **params)
+
+
+def test_minhas_diarias_contagens_em_uma_consulta(db_session, query_counter):
+    supervisor = seed_supervisor(db_session, dias=5)
+    db_session.refresh(supervisor)
+
+    with query_counter:
+        resultado = chamar(db_session, supervisor)
+
+    assert query_counter.count == 1
+    assert [d["titulo"] for d in resultado] == ["D4", "D3", "D2", "D1", "D0"]
+    assert {(d["total_inscritos"], d["total_presentes"], d["empresa_nome"]) for d in resultado} == {
+        (3, 1, "Empresa A")
+    }
+
+
+def test_minhas_diarias_janela_e_paginacao(db_session):
+    supervisor = seed_supervisor(db_session, dias=5)
+
+    janela = chamar(db_session, supervisor, data_inicio=INICIO + timedelta(days=1), data_fim=INICIO + timedelta(days=3))
+    assert [d["titulo"] for d in janela] == ["D3", "D2", "D1"]
+
+    pagina = chamar(db_session, supervisor, skip=2, limit=2)
+    assert [d["titulo"] for d in pagina] == ["D2", "D1"]
+
+
+def test_lista_presencas_diaria_em_uma_consulta(db_session, query_counter):
+    supervisor = seed_supervisor(db_session, dias=1)
+    diaria_id = db_session.query(Diaria.id).filter(Diaria.titulo == "D0").scalar()
+    db_session.refresh(supervisor)
+
+    with query_counter:
+        resultado = listar_presencas_diaria(diaria_id, since=None, db=db_session, current_user=supervisor)
+
+    assert query_counter.count == 3  # diária + perfis do usuário + lista
+    assert resultado.total_inscritos == 3
+    assert resultado.total_presentes == 1
+    assert sorted(i.pessoa_nome for i in resultado.inscritos) == ["C0", "C1", "C2"]
+    assert [p.pessoa_nome for p in resultado.presencas] == ["C1"]
+
+
+def test_lista_presencas_diaria_incremental(db_session):
+    supervisor = seed_supervisor(db_session, dias=1)
+    diaria_id = db_session.query(Diaria.id).filter(Diaria.titulo == "D0").scalar()
+    anterior = listar_presencas_diaria(diaria_id, since=None, db=db_session, current_user=supervisor)
+
+    inscricao = db_session.query(Inscricao).filter(
+        Inscricao.diaria_id == diaria_id, Inscricao.status == StatusInscricao.CONFIRMADA,
+        ~Inscricao.registro_presenca.any(),
+    ).one()
+    # criado_em anterior ao sincronizado_em, mas commit depois da leitura anterior
+    db_session.add(RegistroPresenca(
+        foto_url="f.jpg", inscricao_id=inscricao.id, registrado_por_id=supervisor.id,
+        criado_em=anterior.sincronizado_em - timedelta(seconds=5),
+    ))
+    db_session.commit()
+
+    novas = listar_presencas_diaria(diaria_id, since=anterior.sincronizado_em, db=db_session, current_user=supervisor)
+
+    assert inscricao.id in [p.inscricao_id for p in novas.presencas]
+    assert inscricao.id in [i.inscricao_id for i in novas.inscritos]
+    # Totais com a mesma definição do modo completo
+    completa = listar_presencas_diaria(diaria_id, since=None, db=db_session, current_user=supervisor)
+    assert (novas.total_inscritos, novas.total_presentes) == (completa.total_inscritos, completa.total_presentes) == (3, 2)
+
+    antigas = listar_presencas_diaria(
+        diaria_id, since=anterior.sincronizado_em + timedelta(hours=1), db=db_session, current_user=supervisor,
+    )
+    assert antigas.presencas == []
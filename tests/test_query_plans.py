@@ -0,0 +1,182 @@
+"""
+Regressão de planos: as consultas quentes dos repositórios não podem virar
+varredura sequencial nas tabelas grandes.
+
+Roda sempre no SQLite (EXPLAIN QUERY PLAN) e, com TEST_POSTGRES_URL apontando
+para um banco PostgreSQL descartável, também no PostgreSQL (EXPLAIN FORMAT
+JSON com enable_seqscan=off: se nenhum índice servir, o plano mantém o Seq Scan).
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.alocacao import AlocacaoColaborador, AlocacaoDiaria
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusDiaria, StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.models.rota import PontoParada, Rota
+from app.models.veiculo import Veiculo
+from app.repositories.diaria_repository import DiariaRepository, InscricaoRepository
+from app.repositories.paginacao import codificar_cursor
+from app.repositories.pessoa_repository import PessoaRepository
+from app.repositories.presenca_repository import PresencaRepository
+from app.repositories.relatorio_repository import RelatorioRepository
+from app.services.alocacao_service import AlocacaoService
+
+PESSOAS, DIARIAS, INSCRICOES_POR_PESSOA = 400, 80, 6
+
+# (nome, consulta do repositório, tabelas que precisam ser lidas por índice)
+CONSULTAS = [
+    ("inscricoes_da_diaria", lambda db: InscricaoRepository(db).get_by_diaria(7), {"inscricoes"}),
+    ("inscricoes_da_pessoa", lambda db: InscricaoRepository(db).get_by_pessoa(11), {"inscricoes"}),
+    ("inscricao_pessoa_diaria", lambda db: InscricaoRepository(db).get_by_pessoa_e_diaria(11, 7), {"inscricoes"}),
+    ("diarias_disponiveis", lambda db: DiariaRepository(db).get_disponiveis(), {"diarias"}),
+    ("presenca_da_inscricao", lambda db: PresencaRepository(db).get_by_inscricao(5), {"registros_presenca"}),
+    ("lista_presenca_diaria", lambda db: PresencaRepository(db).get_lista_diaria(7),
+     {"inscricoes", "registros_presenca"}),
+    ("alocacoes_da_diaria", lambda db: AlocacaoService(db).get_alocacoes_diaria(7),
+     {"alocacoes_diarias", "alocacoes_colaboradores"}),
+    ("minhas_alocacoes", lambda db: AlocacaoService(db).get_minhas_alocacoes(11),
+     {"inscricoes", "alocacoes_colaboradores"}),
+    ("colaboradores_por_ponto", lambda db: RelatorioRepository(db).colaboradores_por_ponto(), {"pessoas"}),
+    ("pessoas_por_cursor", lambda db: PessoaRepository(db).listar(
+        cursor=codificar_cursor((Pessoa.nome, Pessoa.id), ["Pessoa 200", 200]), limit=20), {"pessoas"}),
+    ("inscricoes_da_pessoa_por_cursor", lambda db: InscricaoRepository(db).listar_por_pessoa(
+        11, cursor=codificar_cursor((Inscricao.criado_em, Inscricao.id), [datetime.utcnow(), 70]), limit=3),
+     {"inscricoes"}),
+]
+
+
+def popular(engine) -> None:
+    """Massa de dados com a proporção das tabelas em produção (inserts em lote, sem eventos do ORM)."""
+    hoje = date.today()
+    agora = datetime.utcnow()
+    with engine.begin() as conexao:
+        conexao.execute(insert(Empresa), [{"id": 1, "nome": "Empresa", "cnpj": "00.000.000/0001-00"}])
+        conexao.execute(insert(Rota), [{"id": 1, "nome": "Rota", "ativo": True}])
+        conexao.execute(insert(PontoParada), [{"id": p, "nome": f"P{p}", "rota_id": 1} for p in range(1, 21)])
+        conexao.execute(insert(Veiculo), [{"id": 1, "placa": "ABC1D23", "modelo": "Van", "capacidade": 15}])
+        conexao.execute(insert(Pessoa), [
+            {
+                "id": p, "nome": f"Pessoa {p}", "email": f"p{p}@example.com", "cpf": str(p),
+                "tipo_pessoa": TipoPessoa.COLABORADOR, "ativo": p % 10 != 0, "ponto_parada_id": p % 20 + 1,
+            }
+            for p in range(1, PESSOAS + 1)
+        ])
+        conexao.execute(insert(Diaria), [
+            {
+                "id": d, "titulo": f"D{d}", "data": hoje + timedelta(days=d - DIARIAS // 2), "vagas": 50,
+                "empresa_id": 1, "status": StatusDiaria.ABERTA if d % 3 else StatusDiaria.FECHADA,
+            }
+            for d in range(1, DIARIAS + 1)
+        ])
+        inscricoes = [
+            {
+                "pessoa_id": p, "diaria_id": (p * 7 + n * 13) % DIARIAS + 1, "criado_em": agora,
+                "status": StatusInscricao.CONFIRMADA if n % 2 else StatusInscricao.PENDENTE,
+            }
+            for p in range(1, PESSOAS + 1)
+            for n in range(INSCRICOES_POR_PESSOA)
+        ]
+        conexao.execute(insert(Inscricao), inscricoes)
+        total = len(inscricoes)
+        conexao.execute(insert(RegistroPresenca), [
+            {"inscricao_id": i, "registrado_por_id": 1, "foto_url": "x", "horario_registro": agora, "criado_em": agora}
+            for i in range(1, total + 1, 2)
+        ])
+        conexao.execute(insert(AlocacaoDiaria), [{"id": d, "diaria_id": d, "veiculo_id": 1} for d in range(1, DIARIAS + 1)])
+        conexao.execute(insert(AlocacaoColaborador), [
+            {"alocacao_diaria_id": inscricao["diaria_id"], "inscricao_id": i, "ordem_embarque": 0}
+            for i, inscricao in enumerate(inscricoes, start=1)
+            if i % 3 == 0
+        ])
+
+
+def capturar_sql(engine, consulta):
+    """Executa a consulta do repositório e devolve os SELECTs emitidos com seus parâmetros."""
+    capturadas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            capturadas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            consulta(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    assert capturadas, "a consulta não emitiu SQL"
+    return capturadas
+
+
+def varreduras_sqlite(conexao, statement, parameters) -> set:
+    linhas = conexao.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    varridas = set()
+    for linha in linhas:
+        detalhe = linha[-1]
+        partes = detalhe.split()
+        # "SCAN tabela" sem índice, ou índice automático (temporário) criado pelo próprio SQLite
+        if partes[0] == "SCAN" and "INDEX" not in detalhe or "AUTOMATIC" in detalhe:
+            varridas.add(partes[1])
+    return varridas
+
+
+def varreduras_postgres(conexao, statement, parameters) -> set:
+    plano = conexao.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    plano = json.loads(plano) if isinstance(plano, str) else plano
+    varridas, pendentes = set(), [plano[0]["Plan"]]
+    while pendentes:
+        no = pendentes.pop()
+        if no["Node Type"] == "Seq Scan":
+            varridas.add(no["Relation Name"])
+        pendentes.extend(no.get("Plans", []))
+    return varridas
+
+
+def _sqlite(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('planos') / 'planos.db'}")
+    Base.metadata.create_all(bind=engine)
+    popular(engine)
+    return engine, varreduras_sqlite, lambda conexao: None
+
+
+def _postgres(tmp_path_factory):
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL não definido (PostgreSQL local descartável)")
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    popular(engine)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        conexao.exec_driver_sql("ANALYZE")
+    return engine, varreduras_postgres, lambda conexao: conexao.exec_driver_sql("SET enable_seqscan = off")
+
+
+@pytest.fixture(scope="module", params=["sqlite", "postgresql"])
+def banco(request, tmp_path_factory):
+    engine, varreduras, preparar = (_sqlite if request.param == "sqlite" else _postgres)(tmp_path_factory)
+    yield engine, varreduras, preparar
+    if request.param == "postgresql":
+        Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("nome,consulta,tabelas", CONSULTAS, ids=[c[0] for c in CONSULTAS])
+def test_consulta_quente_usa_indice(banco, nome, consulta, tabelas):
+    engine, varreduras, preparar = banco
+    varridas = set()
+    with engine.connect() as conexao:
+        preparar(conexao)
+        for statement, parameters in capturar_sql(engine, consulta):
+            varridas |= varreduras(conexao, statement, parameters)
+
+    assert not varridas & tabelas, f"{nome}: varredura sequencial em {sorted(varridas & tabelas)}"
@@ -0,0 +1,65 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.core.rate_limit import DatabaseRateLimitBackend, MemoryRateLimitBackend, RateLimiter
+from app.models.rate_limit import RateLimitContador
+from app.services.metrics_service import metrics_service
+
+INICIO = 6000.0  # início de uma janela de 60s
+
+
+def consumir(backend, n, agora, chave="1.2.3.4"):
+    return [backend.consumir(chave, 10, 60, agora) for _ in range(n)]
+
+
+def verificar_janela_deslizante(backend, outro=None):
+    outro = outro or backend
+    assert consumir(backend, 6, INICIO) + consumir(outro, 5, INICIO + 10) == [True] * 10 + [False]
+    # Metade da janela seguinte: a anterior pesa 50% (10 * 0.5 = 5)
+    assert consumir(outro, 6, INICIO + 90) == [True] * 5 + [False]
+    # Duas janelas depois nada mais conta
+    assert consumir(backend, 10, INICIO + 180) == [True] * 10
+
+
+def test_memoria_janela_deslizante_e_chaves_limitadas():
+    backend = MemoryRateLimitBackend(max_chaves=3)
+    verificar_janela_deslizante(backend)
+
+    for ip in ("a", "b", "c", "d"):
+        backend.consumir(ip, 10, 60, INICIO + 200)
+    assert len(backend) == 3
+
+    # Chaves sem acesso na janela atual nem na anterior são descartadas
+    backend.consumir("e", 10, 60, INICIO + 400)
+    assert len(backend) == 1
+
+
+def test_banco_compartilhado_entre_workers(db_session):
+    fabrica = sessionmaker(bind=db_session.get_bind())
+    # Dois backends (um por worker) sobre a mesma tabela
+    worker_a = DatabaseRateLimitBackend(fabrica)
+    worker_b = DatabaseRateLimitBackend(fabrica, limpar_a_cada=1)
+
+    verificar_janela_deslizante(worker_a, worker_b)
+    assert db_session.query(RateLimitContador).count() == 1
+
+    # Limpeza remove linhas expiradas (sem acesso há duas janelas)
+    worker_a.consumir("5.6.7.8", 10, 60, INICIO + 180)
+    worker_b.consumir("9.9.9.9", 10, 60, INICIO + 400)
+    assert [c.chave for c in db_session.query(RateLimitContador)] == ["9.9.9.9"]
+
+
+def test_rate_limiter_nega_com_429_e_registra_metricas():
+    limiter = RateLimiter(max_requests=2, window_seconds=60, nome="teste", backend=MemoryRateLimitBackend())
+    antes = metrics_service.get_rate_limit_stats().get("teste", {"allowed": 0, "denied": 0})
+
+    limiter.check("ip")
+    limiter.check("ip")
+    with pytest.raises(HTTPException) as exc:
+        limiter.check("ip")
+    limiter.check("outro-ip")
+
+    assert exc.value.status_code == 429
+    depois = metrics_service.get_rate_limit_stats()["teste"]
+    assert (depois["allowed"] - antes["allowed"], depois["denied"] - antes["denied"]) == (3, 1)
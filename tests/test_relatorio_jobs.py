@@ -0,0 +1,177 @@
+import csv
+import gzip
+import io
+import json
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints import relatorio_jobs
+from app.api.v1.endpoints.relatorios import relatorio_diarias, relatorio_presencas
+from app.models.enums import StatusRelatorioJob
+from app.models.relatorio_job import RelatorioJob
+from app.schemas.relatorio_job import RelatorioJobCreate
+from app.services import relatorio_job_service
+from app.services.relatorio_job_service import (
+    ArmazenamentoLocal,
+    RelatorioJobService,
+    preparar_parametros,
+)
+
+# Diárias de seed_relatorios (conftest): 2026-10-18 é domingo; 2026-10-19 é segunda
+DOMINGO = date(2026, 10, 18)
+SEGUNDA = date(2026, 10, 19)
+
+
+@pytest.fixture()
+def job_service(db_session, tmp_path, monkeypatch):
+    servico = RelatorioJobService(
+        session_factory=sessionmaker(bind=db_session.get_bind()),
+        max_workers=1,
+        armazenamento=ArmazenamentoLocal(str(tmp_path)),
+    )
+    monkeypatch.setattr(relatorio_jobs, "relatorio_job_service", servico)
+    return servico
+
+
+def ler_resultado(servico, job) -> str:
+    return gzip.decompress(b"".join(servico.abrir_resultado(job))).decode("utf-8")
+
+
+def test_job_json_gera_mesmo_resultado_do_endpoint(db_session, seed_relatorios, job_service):
+    admin, _ = seed_relatorios(dias=2)
+    parametros = {"data_inicio": str(DOMINGO), "data_fim": str(SEGUNDA)}
+
+    job = relatorio_jobs.criar_job(
+        RelatorioJobCreate(tipo="diarias", parametros=parametros), db=db_session, current_user=admin
+    )
+    job_service.aguardar(job.id, timeout=10)
+    db_session.refresh(job)
+
+    assert job.status == StatusRelatorioJob.CONCLUIDO
+    assert job.progresso == 100
+    esperado = relatorio_diarias(
+        data_inicio=DOMINGO, data_fim=SEGUNDA, empresa_id=None, status=None,
+        db=db_session, current_user=admin,
+    )
+    assert json.loads(ler_resultado(job_service, job)) == jsonable_encoder(esperado)
+
+    response = relatorio_jobs.baixar_resultado(job.id, db=db_session, current_user=admin)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.media_type == "application/json"
+
+
+def test_job_json_de_presencas_nao_vira_exportacao(db_session, seed_relatorios, job_service):
+    admin, _ = seed_relatorios(dias=2)
+
+    job = relatorio_jobs.criar_job(RelatorioJobCreate(tipo="presencas"), db=db_session, current_user=admin)
+    job_service.aguardar(job.id, timeout=10)
+    db_session.refresh(job)
+
+    assert (job.status, job.erro) == (StatusRelatorioJob.CONCLUIDO, None)
+    esperado = relatorio_presencas(
+        data_inicio=None, data_fim=None, empresa_id=None, format=None, db=db_session, current_user=admin,
+    )
+    assert json.loads(ler_resultado(job_service, job)) == jsonable_encoder(esperado)
+
+
+def test_job_exportacao_csv(db_session, seed_relatorios, job_service):
+    admin, _ = seed_relatorios(dias=3)
+
+    job = relatorio_jobs.criar_job(
+        RelatorioJobCreate(tipo="presencas", formato="csv"), db=db_session, current_user=admin
+    )
+    job_service.aguardar(job.id, timeout=10)
+    db_session.refresh(job)
+
+    assert job.status == StatusRelatorioJob.CONCLUIDO
+    assert job.tamanho_bytes > 0
+    linhas = list(csv.DictReader(io.StringIO(ler_resultado(job_service, job))))
+    assert len(linhas) == 3
+
+
+def test_cancelar_job_pendente(db_session, seed_relatorios, job_service):
+    admin, _ = seed_relatorios(dias=1)
+    iniciou, liberar = threading.Event(), threading.Event()
+
+    def bloqueante(db, progresso, usuario):
+        iniciou.set()
+        liberar.wait(timeout=10)
+        return {"ok": True}
+
+    # Com um único worker, o segundo job fica pendente enquanto o primeiro executa
+    primeiro = job_service.submeter(db_session, "teste", {}, "json", admin.id, bloqueante)
+    assert iniciou.wait(timeout=10)
+    segundo = job_service.submeter(db_session, "teste", {}, "json", admin.id, bloqueante)
+
+    cancelado = relatorio_jobs.cancelar_job(segundo.id, db=db_session, current_user=admin)
+    liberar.set()
+    job_service.aguardar(primeiro.id, timeout=10)
+    job_service.aguardar(segundo.id, timeout=10)
+
+    assert cancelado.status == StatusRelatorioJob.CANCELADO
+    db_session.expire_all()
+    assert db_session.get(RelatorioJob, primeiro.id).status == StatusRelatorioJob.CONCLUIDO
+    assert db_session.get(RelatorioJob, segundo.id).status == StatusRelatorioJob.CANCELADO
+
+
+def test_preparar_parametros_valida_contra_o_endpoint():
+    kwargs = preparar_parametros(relatorio_diarias, {"data_inicio": "2026-10-18", "empresa_id": "3"})
+    assert kwargs == {"data_inicio": DOMINGO, "data_fim": None, "empresa_id": 3, "status": None}
+
+    with pytest.raises(ValueError, match="desconhecidos"):
+        preparar_parametros(relatorio_diarias, {"inexistente": 1})
+    with pytest.raises(ValueError, match="data_inicio"):
+        preparar_parametros(relatorio_diarias, {"data_inicio": "ontem"})
+
+
+def test_cancelar_job_json_em_execucao_antes_de_gravar(db_session, seed_relatorios, job_service, monkeypatch):
+    admin, _ = seed_relatorios(dias=1)
+    iniciou, liberar = threading.Event(), threading.Event()
+    gravados = []
+    monkeypatch.setattr(relatorio_job_service.json, "dump", lambda *args, **kwargs: gravados.append(args))
+
+    def sem_progresso(db, progresso, usuario):
+        iniciou.set()
+        liberar.wait(timeout=10)
+        return {"ok": True}
+
+    job = job_service.submeter(db_session, "teste", {}, "json", admin.id, sem_progresso)
+    assert iniciou.wait(timeout=10)
+    relatorio_jobs.cancelar_job(job.id, db=db_session, current_user=admin)
+    liberar.set()
+    job_service.aguardar(job.id, timeout=10)
+
+    db_session.expire_all()
+    job = db_session.get(RelatorioJob, job.id)
+    assert job.status == StatusRelatorioJob.CANCELADO
+    # Cancelado antes de serializar o resultado
+    assert gravados == []
+
+
+def test_jobs_abandonados_viram_erro(db_session, seed_relatorios, job_service):
+    admin, _ = seed_relatorios(dias=1)
+    antigo = datetime.utcnow() - timedelta(hours=2)
+    jobs = {
+        status: RelatorioJob(
+            id=str(status.value), tipo="teste", formato="json", status=status,
+            solicitado_por_id=admin.id, criado_em=antigo,
+        )
+        for status in (StatusRelatorioJob.PENDENTE, StatusRelatorioJob.EXECUTANDO, StatusRelatorioJob.CONCLUIDO)
+    }
+    recente = RelatorioJob(id="recente", tipo="teste", formato="json", solicitado_por_id=admin.id)
+    db_session.add_all([*jobs.values(), recente])
+    db_session.commit()
+
+    assert job_service.marcar_abandonados(db_session) == 2
+
+    db_session.expire_all()
+    assert {job.id: job.status for job in db_session.query(RelatorioJob)} == {
+        str(StatusRelatorioJob.PENDENTE.value): StatusRelatorioJob.ERRO,
+        str(StatusRelatorioJob.EXECUTANDO.value): StatusRelatorioJob.ERRO,
+        str(StatusRelatorioJob.CONCLUIDO.value): StatusRelatorioJob.CONCLUIDO,
+        "recente": StatusRelatorioJob.PENDENTE,
+    }
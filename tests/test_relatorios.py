@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+from fastapi.responses import StreamingResponse
+
+from app.api.v1.endpoints.relatorios import relatorio_diarias, relatorio_por_empresa, relatorio_presencas
+from app.services.relatorio_export_service import iter_presencas_csv, iter_presencas_ndjson
+
+# Diárias de seed_relatorios (conftest): 2026-10-18 é domingo (DSR); 2026-10-19 é segunda
+DOMINGO = date(2026, 10, 18)
+SEGUNDA = date(2026, 10, 19)
+
+
+def test_relatorio_diarias_calcula_totais_com_dsr(db_session, seed_relatorios):
+    admin, _ = seed_relatorios(dias=2)
+
+    resultado = relatorio_diarias(
+        data_inicio=DOMINGO, data_fim=SEGUNDA, empresa_id=None, status=None,
+        db=db_session, current_user=admin,
+    )
+
+    assert resultado["resumo"] == {
+        "total_diarias": 2,
+        "total_vagas": 4,
+        "total_inscricoes": 4,
+        "total_presencas": 2,
+        "total_valor": 300.0,
+        "taxa_presenca": 50.0,
+    }
+    segunda, domingo = resultado["diarias"]
+    assert domingo["eh_dsr"] is True
+    assert domingo["valor_total"] == 200.0
+    assert segunda["eh_dsr"] is False
+    assert segunda["valor_total"] == 100.0
+    assert segunda["empresa"] == "Empresa A"
+    assert segunda["supervisor"] == "Admin"
+
+
+def test_relatorio_por_empresa(db_session, seed_relatorios):
+    admin, empresa = seed_relatorios(dias=2)
+
+    resultado = relatorio_por_empresa(data_inicio=None, data_fim=None, db=db_session, current_user=admin)
+
+    assert resultado["empresas"] == [{
+        "empresa_id": empresa.id,
+        "nome": "Empresa A",
+        "total_diarias": 2,
+        "total_vagas": 4,
+        "total_inscricoes": 4,
+        "total_presencas": 2,
+        "valor_total": 300.0,
+        "taxa_presenca": 50.0,
+    }]
+
+
+def test_relatorios_numero_de_queries_independe_do_periodo(db_session, seed_relatorios, query_counter):
+    admin, _ = seed_relatorios(dias=30)
+    contagens = []
+
+    for dias in (1, 7, 30):
+        fim = DOMINGO + timedelta(days=dias - 1)
+        with query_counter:
+            relatorio_diarias(
+                data_inicio=DOMINGO, data_fim=fim, empresa_id=None, status=None,
+                db=db_session, current_user=admin,
+            )
+            relatorio_por_empresa(data_inicio=DOMINGO, data_fim=fim, db=db_session, current_user=admin)
+        contagens.append(query_counter.count)
+
+    assert contagens == [2, 2, 2]
+
+
+def test_relatorio_presencas_json_agrupa_por_colaborador(db_session, seed_relatorios):
+    admin, _ = seed_relatorios(dias=2)
+
+    resultado = relatorio_presencas(
+        data_inicio=None, data_fim=None, empresa_id=None, format=None,
+        db=db_session, current_user=admin,
+    )
+
+    assert resultado["total_pessoas"] == 1
+    assert resultado["total_presencas"] == 2
+    assert resultado["total_valor"] == 300.0
+    assert {d["empresa"] for d in resultado["colaboradores"][0]["diarias"]} == {"Empresa A"}
+
+
+def test_relatorio_presencas_format_retorna_streaming(db_session, seed_relatorios):
+    admin, _ = seed_relatorios(dias=1)
+
+    response = relatorio_presencas(
+        data_inicio=None, data_fim=None, empresa_id=None, format="csv",
+        db=db_session, current_user=admin,
+    )
+
+    assert isinstance(response, StreamingResponse)
+    assert response.media_type.startswith("text/csv")
+
+
+def test_exportacao_csv_e_ndjson(db_session, seed_relatorios):
+    seed_relatorios(dias=2)
+
+    linhas_csv = list(csv.DictReader(io.StringIO("".join(iter_presencas_csv(db_session)))))
+    linhas_ndjson = [json.loads(l) for l in "".join(iter_presencas_ndjson(db_session)).splitlines()]
+
+    assert len(linhas_csv) == len(linhas_ndjson) == 2
+    assert linhas_csv[0]["empresa"] == "Empresa A"
+    domingo = next(l for l in linhas_ndjson if l["data"] == str(DOMINGO))
+    assert domingo["eh_dsr"] is True
+    assert domingo["valor"] == 200.0
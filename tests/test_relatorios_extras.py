@@ -0,0 +1,182 @@
+from datetime import date, timedelta
+
+from app.api.v1.endpoints.relatorios_extras import (
+    relatorio_demanda_oferta,
+    relatorio_frequencia_colaborador,
+    relatorio_uso_fretado,
+)
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.models.rota import PontoParada, Rota
+
+INICIO = date(2026, 9, 1)
+
+
+def seed_frequencia(db_session, presencas_por_colaborador: dict, total_diarias: int = 10):
+    """Cria N diárias e, para cada colaborador, inscrições confirmadas com X presenças."""
+    admin = Pessoa(nome="Admin", email="admin@example.com", cpf="999", tipo_pessoa=TipoPessoa.ADMIN)
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    db_session.add_all([admin, empresa])
+    db_session.flush()
+
+    diarias = [
+        Diaria(titulo=f"D{i}", data=INICIO + timedelta(days=i), vagas=50, empresa_id=empresa.id)
+        for i in range(total_diarias)
+    ]
+    db_session.add_all(diarias)
+    db_session.flush()
+
+    for i, (nome, presencas) in enumerate(presencas_por_colaborador.items()):
+        pessoa = Pessoa(nome=nome, email=f"{i}@example.com", cpf=f"cpf-{i}", tipo_pessoa=TipoPessoa.COLABORADOR)
+        db_session.add(pessoa)
+        db_session.flush()
+        for n, diaria in enumerate(diarias):
+            inscricao = Inscricao(pessoa_id=pessoa.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+            db_session.add(inscricao)
+            db_session.flush()
+            if n < presencas:
+                db_session.add(RegistroPresenca(foto_url="f.jpg", inscricao_id=inscricao.id, registrado_por_id=admin.id))
+
+    db_session.commit()
+    return admin
+
+
+def chamar(db_session, admin, **kwargs):
+    params = {
+        "data_inicio": None,
+        "data_fim": None,
+        "classificacao": None,
+        "ordenar_por": "taxa",
+        "ordem": "desc",
+        "skip": 0,
+        "limit": None,
+    }
+    params.update(kwargs)
+    return relatorio_frequencia_colaborador(db=db_session, current_user=admin, **params)
+
+
+def test_frequencia_calcula_taxas_e_classificacao(db_session):
+    admin = seed_frequencia(db_session, {"Ana": 10, "Bruno": 7, "Carla": 5, "Diego": 2})
+
+    resultado = chamar(db_session, admin)
+
+    assert resultado["total_colaboradores"] == 4
+    assert resultado["media_taxa"] == 60.0
+    assert [(c["nome"], c["taxa_comparecimento"], c["classificacao"]) for c in resultado["colaboradores"]] == [
+        ("Ana", 100.0, "Excelente"),
+        ("Bruno", 70.0, "Bom"),
+        ("Carla", 50.0, "Regular"),
+        ("Diego", 20.0, "Crítico"),
+    ]
+    diego = resultado["colaboradores"][-1]
+    assert diego["total_confirmadas"] == 10
+    assert diego["total_presencas"] == 2
+    assert diego["total_faltas"] == 8
+
+
+def test_frequencia_nao_duplica_inscricao_com_mais_de_uma_presenca(db_session):
+    admin = seed_frequencia(db_session, {"Diego": 2})
+    registro = db_session.query(RegistroPresenca).first()
+    db_session.add(RegistroPresenca(foto_url="g.jpg", inscricao_id=registro.inscricao_id, registrado_por_id=admin.id))
+    db_session.commit()
+
+    (diego,) = chamar(db_session, admin)["colaboradores"]
+
+    assert diego["total_confirmadas"] == 10
+    assert diego["total_presencas"] == 3
+    assert diego["total_faltas"] == 7
+
+
+def test_frequencia_filtra_ordena_e_pagina(db_session):
+    admin = seed_frequencia(db_session, {"Ana": 10, "Bruno": 9, "Carla": 5, "Diego": 2})
+
+    excelentes = chamar(db_session, admin, classificacao="Excelente")
+    assert [c["nome"] for c in excelentes["colaboradores"]] == ["Ana", "Bruno"]
+    assert excelentes["total_colaboradores"] == 2
+
+    pagina = chamar(db_session, admin, ordenar_por="nome", ordem="asc", skip=1, limit=2)
+    assert [c["nome"] for c in pagina["colaboradores"]] == ["Bruno", "Carla"]
+    assert pagina["total_colaboradores"] == 4
+
+
+def test_frequencia_filtra_periodo(db_session):
+    admin = seed_frequencia(db_session, {"Ana": 10})
+
+    resultado = chamar(db_session, admin, data_inicio=INICIO, data_fim=INICIO + timedelta(days=4))
+
+    assert resultado["colaboradores"][0]["total_confirmadas"] == 5
+    assert resultado["colaboradores"][0]["total_presencas"] == 5
+
+
+def test_frequencia_numero_de_queries_independe_do_headcount(db_session, query_counter):
+    admin = seed_frequencia(db_session, {f"Colab {i}": i % 10 for i in range(30)})
+
+    with query_counter:
+        chamar(db_session, admin)
+
+    assert query_counter.count == 2
+
+
+def test_demanda_oferta_agrega_no_banco(db_session, query_counter):
+    # 2026-09-01 é terça-feira; 10 diárias de 50 vagas com 3 inscrições ativas cada
+    admin = seed_frequencia(db_session, {"Ana": 0, "Bruno": 0, "Carla": 0})
+    empresa_id = db_session.query(Empresa.id).scalar()
+    lotada = Diaria(titulo="Lotada", data=INICIO, vagas=1, empresa_id=empresa_id)
+    db_session.add(lotada)
+    db_session.flush()
+    pessoa_id = db_session.query(Pessoa.id).filter(Pessoa.nome == "Ana").scalar()
+    db_session.add(Inscricao(pessoa_id=pessoa_id, diaria_id=lotada.id, status=StatusInscricao.PENDENTE))
+    db_session.commit()
+
+    with query_counter:
+        resultado = relatorio_demanda_oferta(data_inicio=None, data_fim=None, db=db_session, current_user=admin)
+
+    assert query_counter.count == 4
+    assert resultado["resumo"] == {
+        "total_vagas": 501,
+        "total_inscricoes": 31,
+        "taxa_preenchimento": 6.2,
+        "vagas_nao_preenchidas": 470,
+        "diarias_lotadas": 1,
+        "total_diarias": 11,
+    }
+    assert resultado["por_empresa"] == [{"empresa": "Empresa A", "vagas": 501, "inscricoes": 31}]
+    terca = resultado["por_dia_semana"][1]
+    assert terca == {"dia": "Terça", "vagas": 101, "inscricoes": 7}
+    assert sum(d["vagas"] for d in resultado["por_dia_semana"]) == 501
+    assert len(resultado["diarias"]) == 11
+    assert next(d for d in resultado["diarias"] if d["titulo"] == "Lotada")["status"] == "🔴 Lotada"
+
+
+def test_uso_fretado_conta_colaboradores_por_ponto(db_session, query_counter):
+    admin = Pessoa(nome="Admin", email="admin@example.com", cpf="999", tipo_pessoa=TipoPessoa.ADMIN)
+    rota = Rota(nome="Rota 1")
+    inativa = Rota(nome="Rota inativa", ativo=False)
+    db_session.add_all([admin, rota, inativa])
+    db_session.flush()
+    pontos = [PontoParada(nome=f"P{i}", rota_id=rota.id) for i in range(3)]
+    db_session.add_all(pontos + [PontoParada(nome="Px", rota_id=inativa.id)])
+    db_session.flush()
+    for i in range(5):
+        db_session.add(Pessoa(
+            nome=f"C{i}", email=f"c{i}@example.com", cpf=f"c{i}",
+            tipo_pessoa=TipoPessoa.COLABORADOR, ponto_parada_id=pontos[i % 2].id,
+        ))
+    db_session.add(Pessoa(nome="Sem rota", email="s@example.com", cpf="s", tipo_pessoa=TipoPessoa.COLABORADOR))
+    db_session.commit()
+
+    with query_counter:
+        resultado = relatorio_uso_fretado(db=db_session, current_user=admin)
+
+    assert query_counter.count == 3
+    assert resultado["resumo"] == {
+        "total_rotas": 1,
+        "total_colaboradores_fretado": 5,
+        "colaboradores_sem_rota": 1,
+    }
+    rota_result = resultado["rotas"][0]
+    assert rota_result["total_pontos"] == 3
+    assert [p["colaboradores"] for p in rota_result["pontos"]] == [3, 2, 0]
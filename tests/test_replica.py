@@ -0,0 +1,77 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import deps
+from app.db.replica import ReplicaRouter
+
+
+def criar_banco(caminho, origem):
+    engine = create_engine(f"sqlite:///{caminho}")
+    with engine.begin() as conexao:
+        conexao.execute(text("create table origem (nome text)"))
+        conexao.execute(text("insert into origem values (:nome)"), {"nome": origem})
+    return engine
+
+
+def origem(router):
+    db = router.sessao()
+    try:
+        return db.execute(text("select nome from origem")).scalar()
+    finally:
+        db.close()
+
+
+def criar_router(tmp_path, **kwargs):
+    primaria = criar_banco(tmp_path / "primaria.db", "primaria")
+    replica = criar_banco(tmp_path / "replica.db", "replica")
+    kwargs.setdefault("intervalo_verificacao", 60)
+    return ReplicaRouter(sessionmaker(bind=primaria), replica, max_atraso_segundos=30, **kwargs)
+
+
+def test_leituras_vao_para_replica_saudavel(tmp_path):
+    router = criar_router(tmp_path)
+    medicoes = []
+    router.medir_atraso = lambda conexao: medicoes.append(1) or 2.0
+
+    assert [origem(router) for _ in range(3)] == ["replica"] * 3
+    # Atraso medido uma vez por intervalo
+    assert len(medicoes) == 1
+    estatisticas = router.estatisticas()
+    assert (estatisticas["leituras_replica"], estatisticas["atraso_segundos"]) == (3, 2.0)
+
+
+def test_atraso_acima_do_limite_volta_para_primaria(tmp_path):
+    router = criar_router(tmp_path, intervalo_verificacao=0)
+    atrasos = iter([45.0, 1.0])
+    router.medir_atraso = lambda conexao: next(atrasos)
+
+    assert origem(router) == "primaria"
+    # Réplica alcançou a primária: volta a receber leituras
+    assert origem(router) == "replica"
+    assert (router.estatisticas()["leituras_primaria"], router.estatisticas()["leituras_replica"]) == (1, 1)
+
+
+def test_replica_com_erro_ou_ausente_usa_primaria(tmp_path):
+    router = criar_router(tmp_path)
+
+    def falhar(conexao):
+        raise RuntimeError("réplica fora do ar")
+
+    router.medir_atraso = falhar
+    assert origem(router) == "primaria"
+    assert "fora do ar" in router.estatisticas()["ultimo_erro"]
+
+    sem_replica = ReplicaRouter(router.primaria, None)
+    assert origem(sem_replica) == "primaria"
+    assert sem_replica.estatisticas()["configurada"] is False
+
+
+def test_get_read_db_usa_router(tmp_path, monkeypatch):
+    router = criar_router(tmp_path)
+    monkeypatch.setattr(deps, "replica_router", router)
+
+    dependencia = deps.get_read_db(Request({"type": "http"}))
+    db = next(dependencia)
+    assert db.execute(text("select nome from origem")).scalar() == "replica"
+    dependencia.close()
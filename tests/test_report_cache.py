@@ -0,0 +1,120 @@
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+from app.api.v1.endpoints.relatorios import relatorio_por_empresa
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.repositories.relatorio_repository import RelatorioRepository
+from app.services.metrics_service import metrics_service
+from app.services.report_cache_service import ReportCacheService, chave_relatorio
+from app.services.rollup_service import RollupService
+
+
+def seed(db_session):
+    admin = Pessoa(nome="Admin", email="admin@example.com", cpf="999", tipo_pessoa=TipoPessoa.ADMIN)
+    colab = Pessoa(nome="Colab", email="colab@example.com", cpf="111", tipo_pessoa=TipoPessoa.COLABORADOR)
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    db_session.add_all([admin, colab, empresa])
+    db_session.flush()
+    diaria = Diaria(titulo="D", data=date(2026, 10, 19), vagas=2, valor=Decimal("100"), empresa_id=empresa.id)
+    db_session.add(diaria)
+    db_session.flush()
+    inscricao = Inscricao(pessoa_id=colab.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+    db_session.add(inscricao)
+    db_session.commit()
+    return admin, inscricao
+
+
+def empresas(db_session, admin):
+    return relatorio_por_empresa(data_inicio=None, data_fim=None, db=db_session, current_user=admin)
+
+
+def test_cache_reutiliza_resultado_ate_o_watermark_mudar(db_session, query_counter, report_cache):
+    report_cache.habilitado = True
+    admin, inscricao = seed(db_session)
+
+    primeiro = empresas(db_session, admin)
+    with query_counter:
+        segundo = empresas(db_session, admin)
+
+    assert segundo == primeiro
+    assert query_counter.count == 1  # apenas o watermark
+
+    db_session.add(RegistroPresenca(foto_url="f.jpg", inscricao_id=inscricao.id, registrado_por_id=admin.id))
+    db_session.commit()
+
+    terceiro = empresas(db_session, admin)
+    assert primeiro["empresas"][0]["total_presencas"] == 0
+    assert terceiro["empresas"][0]["total_presencas"] == 1
+
+
+def test_cache_registra_estatisticas(db_session, report_cache):
+    report_cache.habilitado = True
+    admin, _ = seed(db_session)
+
+    def contagens():
+        stats = metrics_service.get_report_cache_stats()["reports"]
+        return next(
+            ((r["hits"], r["misses"]) for r in stats if r["report"] == "relatorios.empresas"),
+            (0, 0),
+        )
+
+    hits, misses = contagens()
+    empresas(db_session, admin)
+    empresas(db_session, admin)
+
+    assert contagens() == (hits + 1, misses + 1)
+
+
+def test_chave_normaliza_parametros():
+    a = chave_relatorio("r", {"data_inicio": date(2026, 1, 1), "limit": None, "db": object()})
+    b = chave_relatorio("r", {"limit": None, "current_user": object(), "data_inicio": date(2026, 1, 1)})
+
+    assert a == b
+    assert a != chave_relatorio("r", {"data_inicio": date(2026, 1, 2), "limit": None})
+
+
+def test_requisicoes_simultaneas_calculam_uma_vez():
+    cache = ReportCacheService()
+    chamadas = []
+    resultados = []
+
+    def calcular():
+        chamadas.append(1)
+        time.sleep(0.2)
+        return {"valor": 42}
+
+    def requisicao():
+        resultados.append(cache.get_or_compute(("teste.single_flight",), "wm-1", calcular))
+
+    threads = [threading.Thread(target=requisicao) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(chamadas) == 1
+    assert resultados == [{"valor": 42}] * 5
+    assert cache.get_or_compute(("teste.single_flight",), "wm-2", calcular) == {"valor": 42}
+    assert len(chamadas) == 2
+
+
+def test_watermark_muda_com_empresa_e_com_o_rollup(db_session, report_cache):
+    report_cache.habilitado = True
+    admin, inscricao = seed(db_session)
+    assert empresas(db_session, admin)["empresas"][0]["nome"] == "Empresa A"
+
+    empresa = db_session.get(Empresa, inscricao.diaria.empresa_id)
+    empresa.nome = "Empresa B"
+    db_session.commit()
+    assert empresas(db_session, admin)["empresas"][0]["nome"] == "Empresa B"
+
+    # /relatorios/empresas lê fato_diaria_dia: uma nova carga invalida o cache
+    antes = RelatorioRepository(db_session).watermark()
+    RollupService(db_session).atualizar_fato_diaria_dia(hoje=date(2026, 10, 25))
+    assert RelatorioRepository(db_session).watermark() != antes
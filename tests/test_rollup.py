@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.api.v1.endpoints.relatorios import relatorio_por_empresa
+from app.models.diaria import Diaria, Inscricao
+from app.models.empresa import Empresa
+from app.models.enums import StatusInscricao, TipoPessoa
+from app.models.fato import FatoDiariaDia
+from app.models.pessoa import Pessoa
+from app.models.presenca import RegistroPresenca
+from app.repositories.fato_repository import FatoDiariaDiaRepository
+from app.repositories.relatorio_repository import RelatorioRepository
+from app.services.rollup_service import RollupService
+
+# 2026-10-04 é domingo (DSR)
+INICIO = date(2026, 10, 4)
+HOJE = INICIO + timedelta(days=10)
+
+
+def seed(db_session, dias: int = 10):
+    admin = Pessoa(nome="Admin", email="admin@example.com", cpf="999", tipo_pessoa=TipoPessoa.ADMIN)
+    colab = Pessoa(nome="Colab", email="colab@example.com", cpf="111", tipo_pessoa=TipoPessoa.COLABORADOR)
+    empresa = Empresa(nome="Empresa A", cnpj="11.111.111/0001-11")
+    db_session.add_all([admin, colab, empresa])
+    db_session.flush()
+
+    for n in range(dias):
+        diaria = Diaria(
+            titulo=f"Diaria {n}", data=INICIO + timedelta(days=n), vagas=3,
+            valor=Decimal("100.00"), empresa_id=empresa.id,
+        )
+        db_session.add(diaria)
+        db_session.flush()
+        inscricao = Inscricao(pessoa_id=colab.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+        db_session.add(inscricao)
+        db_session.flush()
+        db_session.add(RegistroPresenca(foto_url="f.jpg", inscricao_id=inscricao.id, registrado_por_id=admin.id))
+
+    db_session.commit()
+    return admin, empresa
+
+
+def adicionar_presenca(db_session, admin, dia: date):
+    diaria = db_session.query(Diaria).filter(Diaria.data == dia).first()
+    pessoa = Pessoa(nome=f"Extra {dia}", email=f"{dia}@example.com", cpf=str(dia), tipo_pessoa=TipoPessoa.COLABORADOR)
+    db_session.add(pessoa)
+    db_session.flush()
+    inscricao = Inscricao(pessoa_id=pessoa.id, diaria_id=diaria.id, status=StatusInscricao.CONFIRMADA)
+    db_session.add(inscricao)
+    db_session.flush()
+    db_session.add(RegistroPresenca(foto_url="f.jpg", inscricao_id=inscricao.id, registrado_por_id=admin.id))
+    db_session.commit()
+
+
+def presencas_consolidadas(db_session, dia: date) -> int:
+    fato = db_session.query(FatoDiariaDia).filter(FatoDiariaDia.data == dia).one()
+    db_session.refresh(fato)
+    return fato.total_presencas
+
+
+def test_rollup_mantem_os_mesmos_totais(db_session, query_counter):
+    admin, _ = seed(db_session)
+    repo = RelatorioRepository(db_session)
+    fim = HOJE + timedelta(days=5)
+
+    antes = (repo.totais_periodo(INICIO, fim), repo.serie_por_dia(INICIO, fim))
+    empresas_antes = relatorio_por_empresa(data_inicio=INICIO, data_fim=fim, db=db_session, current_user=admin)
+
+    resultado = RollupService(db_session).atualizar_fato_diaria_dia(hoje=HOJE)
+    assert resultado["dias_recalculados"] == 10
+    assert db_session.query(FatoDiariaDia).count() == 10
+
+    with query_counter:
+        depois = (repo.totais_periodo(INICIO, fim), repo.serie_por_dia(INICIO, fim))
+    assert query_counter.count == 2
+    assert depois == antes
+    assert antes[0]["valor_total"] == 1200.0  # 10 presenças, duas em domingo (DSR)
+    assert relatorio_por_empresa(data_inicio=INICIO, data_fim=fim, db=db_session, current_user=admin) == empresas_antes
+
+
+def test_rollup_calcula_ao_vivo_dias_nao_consolidados(db_session):
+    admin, _ = seed(db_session, dias=12)
+    RollupService(db_session).atualizar_fato_diaria_dia(hoje=HOJE)
+
+    # Hoje e dias futuros não estão no rollup, mas entram nos totais
+    assert db_session.query(FatoDiariaDia).filter(FatoDiariaDia.data >= HOJE).count() == 0
+    adicionar_presenca(db_session, admin, HOJE)
+
+    totais = RelatorioRepository(db_session).totais_periodo(INICIO, HOJE + timedelta(days=1))
+    assert totais["total_diarias"] == 12
+    assert totais["total_presencas"] == 13
+
+
+def test_rollup_incremental_congela_dias_fechados(db_session):
+    admin, _ = seed(db_session)
+    service = RollupService(db_session)
+    service.atualizar_fato_diaria_dia(hoje=HOJE)
+
+    ontem = HOJE - timedelta(days=1)
+    antigo = INICIO
+    adicionar_presenca(db_session, admin, ontem)
+    adicionar_presenca(db_session, admin, antigo)
+
+    resultado = service.atualizar_fato_diaria_dia(hoje=HOJE)
+
+    assert resultado["congelado_ate"] == HOJE - timedelta(days=4)
+    assert presencas_consolidadas(db_session, ontem) == 2
+    assert presencas_consolidadas(db_session, antigo) == 1  # congelado
+
+    # Reconstrução explícita recalcula inclusive dias congelados
+    service.atualizar_fato_diaria_dia(hoje=HOJE, reconstruir=True)
+    assert presencas_consolidadas(db_session, antigo) == 2
+
+
+def test_rollup_detecta_diaria_removida(db_session):
+    seed(db_session)
+    service = RollupService(db_session)
+    service.atualizar_fato_diaria_dia(hoje=HOJE)
+
+    ontem = HOJE - timedelta(days=1)
+    diaria = db_session.query(Diaria).filter(Diaria.data == ontem).one()
+    db_session.query(RegistroPresenca).delete()
+    db_session.delete(diaria)
+    db_session.commit()
+
+    service.atualizar_fato_diaria_dia(hoje=HOJE)
+
+    assert db_session.query(FatoDiariaDia).filter(FatoDiariaDia.data == ontem).count() == 0
+
+
+def test_rollup_detecta_presenca_removida(db_session):
+    seed(db_session)
+    service = RollupService(db_session)
+    service.atualizar_fato_diaria_dia(hoje=HOJE)
+
+    # Remoção não deixa rastro no watermark: só a comparação com os contadores a encontra
+    ontem = HOJE - timedelta(days=1)
+    presenca = (
+        db_session.query(RegistroPresenca)
+        .join(Inscricao, Inscricao.id == RegistroPresenca.inscricao_id)
+        .join(Diaria, Diaria.id == Inscricao.diaria_id)
+        .filter(Diaria.data == ontem)
+        .one()
+    )
+    db_session.delete(presenca)
+    db_session.commit()
+
+    assert FatoDiariaDiaRepository(db_session).dias_divergentes(None, ontem) == {ontem}
+    service.atualizar_fato_diaria_dia(hoje=HOJE)
+    assert presencas_consolidadas(db_session, ontem) == 0
+    assert FatoDiariaDiaRepository(db_session).dias_divergentes(None, ontem) == set()
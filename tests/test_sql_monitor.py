@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.deps import get_db
+from app.db import sql_monitor
+from app.models.pessoa import Pessoa
+from app.services.metrics_service import metrics_service
+
+
+def test_conta_consultas_e_detecta_n_mais_1(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_DETECTION", True)
+    sql_monitor.suspeitas_n_mais_1.clear()
+
+    with sql_monitor.monitorar_sql("GET /teste") as sql:
+        db_session.execute(text("select 1")).all()
+        for pessoa_id in range(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            db_session.get(Pessoa, pessoa_id + 1)
+
+    assert sql.consultas == settings.SQL_N_PLUS_ONE_THRESHOLD + 1
+    assert sql.tempo_ms > 0
+    suspeitas = sql_monitor.suspeitas_n_mais_1.listar()
+    assert len(suspeitas) == 1
+    assert suspeitas[0]["rota"] == "GET /teste"
+    assert suspeitas[0]["repeticoes"] == settings.SQL_N_PLUS_ONE_THRESHOLD
+    assert suspeitas[0]["statement"].startswith("SELECT pessoas.id")
+
+    # Fora de uma requisição nada é contabilizado
+    db_session.execute(text("select 1")).all()
+    assert sql.consultas == settings.SQL_N_PLUS_ONE_THRESHOLD + 1
+
+
+def test_registra_consultas_lentas(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    sql_monitor.consultas_lentas.clear()
+
+    with sql_monitor.monitorar_sql("GET /lenta"):
+        db_session.execute(text("select :valor"), {"valor": 42}).all()
+
+    lenta = sql_monitor.consultas_lentas.listar()[0]
+    assert (lenta["rota"], lenta["statement"], lenta["plano"]) == ("GET /lenta", "select ?", None)
+    assert "42" in lenta["parametros"]
+
+
+def test_middleware_atribui_sql_ao_endpoint(db_session):
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        resposta = TestClient(app).post("/api/v1/auth/esqueci-senha", json={"email": "ninguem@example.com"})
+    finally:
+        app.dependency_overrides.pop(get_db)
+
+    assert resposta.status_code == 200
+    ultima = metrics_service.get_recent_requests(limit=1)[0]
+    assert (ultima["path"], ultima["db_queries"]) == ("/api/v1/auth/esqueci-senha", 1)
+    stats = {e["endpoint"]: e for e in metrics_service.get_endpoint_stats()}
+    assert stats["POST /api/v1/auth/esqueci-senha"]["max_queries"] >= 1
+
+
+def test_explain_que_falha_desfaz_so_o_savepoint():
+    from types import SimpleNamespace
+
+    executados = []
+
+    class Cursor:
+        def execute(self, sql, parametros=None):
+            executados.append(sql)
+            if sql.startswith("EXPLAIN"):
+                raise RuntimeError("canceling statement due to statement timeout")
+
+        def close(self):
+            pass
+
+    conexao = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        connection=SimpleNamespace(dbapi_connection=SimpleNamespace(autocommit=False, cursor=Cursor)),
+    )
+
+    assert sql_monitor._explicar(conexao, "SELECT 1", {}) is None
+    assert executados == [
+        "SAVEPOINT sql_monitor_explain",
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT 1",
+        "ROLLBACK TO SAVEPOINT sql_monitor_explain",
+    ]